@@ -1,6 +1,11 @@
 from flask import Flask, render_template
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
+from backend.services.metrics import instrument_app, instrument_engine
+from backend.services import profiling
+from backend.middleware.auth import is_admin_request
+from backend.services.database import database, engine_options, ensure_indexes
+from backend.services.support_outbox import support_outbox
 import os
 
 # Initialize Flask app
@@ -8,40 +13,60 @@ app = Flask(__name__)
 
 # Configuration
 app.config['SECRET_KEY'] = 'your-secret-key-here'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///civiclink.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///civiclink.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+# Serve glossary list queries from the in-memory snapshot (backend/services/glossary_snapshot.py)
+app.config['GLOSSARY_SNAPSHOT'] = os.environ.get('GLOSSARY_SNAPSHOT', 'true').lower() == 'true'
 
 # Initialize extensions
 db = SQLAlchemy(app)
 CORS(app)
 
+# WAL + pragmas on the write engine, and a separate pooled read-only engine/session
+database.init_app(app, db)
+
+# Contact-support outbox (instance folder by default); its dispatcher starts with the first request
+support_outbox.init_app(app)
+
+# Request/DB latency histograms and the /metrics endpoint
+instrument_app(app, 'app')
+for engine in database.engines:
+    instrument_engine(engine)
+    profiling.instrument_engine(engine)
+
+# Opt-in per-request profiling for admins (X-CivicLink-Profile header)
+profiling.instrument_profiling(app, is_admin_request)
+
 # Import and register blueprints
-try:
-    from src.pages.TranslationAssistant import translation_assistant_bp
-    app.register_blueprint(translation_assistant_bp)
-except ImportError as e:
-    print(f"Warning: Could not import TranslationAssistant: {e}")
-
-try:
-    from src.pages.HelpAndLanguage import help_language_bp
-    app.register_blueprint(help_language_bp)
-except ImportError as e:
-    print(f"Warning: Could not import HelpAndLanguage: {e}")
-
-try:
-    from backend.routes.translations import translations_bp
-    app.register_blueprint(translations_bp)
-except ImportError as e:
-    print(f"Warning: Could not import translations routes: {e}")
-
-# Import models to ensure they're registered
-try:
+from src.pages.TranslationAssistant import translation_assistant_bp
+from src.pages.HelpAndLanguage import help_language_bp
+from backend.routes.translations import translations_bp
+from backend.routes.audio import audio_bp
+from backend.routes.sms import sms_bp
+from backend.routes.polling_places import polling_places_bp
+app.register_blueprint(translation_assistant_bp)
+app.register_blueprint(help_language_bp)
+app.register_blueprint(translations_bp)
+app.register_blueprint(audio_bp)
+app.register_blueprint(sms_bp)
+app.register_blueprint(polling_places_bp)
+
+def init_schema():
+    """Create missing tables and indexes, and build the tag index for databases that predate it"""
     from backend.models.Translation import Base
-    # Create database tables
+    from backend.services.tags import backfill_tags
     with app.app_context():
         Base.metadata.create_all(db.engine)
-except ImportError as e:
-    print(f"Warning: Could not import Translation model: {e}")
+        ensure_indexes(db.engine, Base.metadata)
+        backfill_tags(db.engine)
+
+# Schema changes are an explicit step (`flask --app app init-db`), not a side effect of importing the app
+@app.cli.command('init-db')
+def init_db_command():
+    """Create or upgrade the database schema"""
+    init_schema()
+    print(f"✓ Schema ready at {app.config['SQLALCHEMY_DATABASE_URI']}")
 
 @app.route('/')
 def index():
@@ -54,4 +79,6 @@ def health_check():
     return {'status': 'healthy', 'message': 'CivicLink Translation Service is running'}
 
 if __name__ == '__main__':
+    # The development server sets the schema up itself
+    init_schema()
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Asyncio (ASGI) variant of the simplified translation service.
+
+Serves the same API as simple_app.py (/api/translate-text,
+/api/translate-civic-term, /api/languages, /health, plus /metrics) but awaits
+provider calls instead of blocking a worker thread, so a single process can hold
+thousands of concurrent slow translations. Chunks of one request are translated
+concurrently.
+
+Run with the built-in server:  python async_app.py [--port 8000]
+or any ASGI server:             uvicorn async_app:app
+"""
+
+import argparse
+import logging
+import time
+
+from backend.services.async_http import serve_asgi
+from backend.services.async_translator import async_translator_pool
+from backend.services.metrics import REQUEST_LATENCY, CONTENT_TYPE as METRICS_CONTENT_TYPE, render_metrics
+from backend.services.languages import ALL_LANGUAGES, CIVIC_LANGUAGES, LANGUAGES_RESPONSE_BODY
+from backend.services.pipeline.engine import default_pipeline
+from backend.services.pipeline.markup import FORMATS as TEXT_FORMATS
+from backend.services.json_codec import (RequestBodyError, RequestBodyTooLarge, compact_result, dumps, load_json_body,
+                                         maybe_gzip, wants_compact)
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+
+class JSONResponse:
+    def __init__(self, payload, status: int = 200):
+        self.body = dumps(payload)
+        self.status = status
+        self.content_type = b'application/json'
+
+
+class RawResponse:
+    def __init__(self, body: bytes, content_type: str, status: int = 200):
+        self.body = body
+        self.status = status
+        self.content_type = content_type.encode('latin-1')
+
+
+async def translate_text_async(text: str, target_language: str, source_language: str = 'auto', format: str = 'text'):
+    """
+    Async counterpart of simple_app.translate_text_efficient: the same shared
+    pipeline, but provider calls are awaited and a request's chunks run concurrently.
+    """
+    return await default_pipeline.run_async(text, target_language, source_language, format)
+
+
+async def translate_text_api(data):
+    """API endpoint for translating text"""
+    if not data:
+        return JSONResponse({'error': 'No data provided'}, 400)
+
+    text = data.get('text', '').strip()
+    target_language = data.get('target_language', 'es')
+    source_language = data.get('source_language', 'auto')
+    text_format = data.get('format', 'text')
+
+    if not text:
+        return JSONResponse({'error': 'Text is required'}, 400)
+
+    if text_format not in TEXT_FORMATS:
+        return JSONResponse({'error': 'Invalid format'}, 400)
+
+    result = await translate_text_async(text, target_language, source_language, text_format)
+    if not result.get('success'):
+        return JSONResponse(result, 400)
+    return JSONResponse(compact_result(result) if wants_compact(data) else result)
+
+
+async def translate_civic_term(data):
+    """Translate a specific civic term to different languages"""
+    if not data:
+        return JSONResponse({'error': 'No data provided'}, 400)
+
+    term = data.get('term', '').strip()
+    target_language = data.get('target_language', 'spanish')
+
+    if not term:
+        return JSONResponse({'error': 'Term is required'}, 400)
+
+    result = await translate_text_async(term, target_language)
+    if not result.get('success'):
+        return JSONResponse(result, 400)
+
+    return JSONResponse({
+        'original_term': term,
+        'translated_term': result['translated_text'],
+        'target_language': target_language,
+        'quality_score': result['quality_score']
+    })
+
+
+async def get_languages(data):
+    """Get all supported languages (body is pre-serialized by the language registry)"""
+    return RawResponse(LANGUAGES_RESPONSE_BODY, 'application/json')
+
+
+async def health_check(data):
+    """Health check endpoint"""
+    return JSONResponse({
+        'status': 'healthy',
+        'message': 'CivicLink Translation Service is running',
+        'translation_service': 'deep-translator (Google), asyncio',
+        'total_languages': len(ALL_LANGUAGES),
+        'civic_languages': len(CIVIC_LANGUAGES)
+    })
+
+
+async def metrics(data):
+    return RawResponse(render_metrics().encode('utf-8'), METRICS_CONTENT_TYPE)
+
+
+# path -> (method, handler, parses JSON body)
+ROUTES = {
+    '/api/translate-text': ('POST', translate_text_api, True),
+    '/api/translate-civic-term': ('POST', translate_civic_term, True),
+    '/api/languages': ('GET', get_languages, False),
+    '/health': ('GET', health_check, False),
+    '/metrics': ('GET', metrics, False),
+}
+
+
+async def _read_body(receive) -> bytes:
+    parts = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:
+            raise RequestBodyTooLarge('Request body too large')
+        parts.append(chunk)
+        if not message.get('more_body'):
+            break
+    return b''.join(parts)
+
+
+async def app(scope, receive, send):
+    """ASGI entry point"""
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await async_translator_pool.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    start = time.perf_counter()
+    headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', ())}
+    route = ROUTES.get(scope['path'])
+    method = scope['method']
+    if route is None:
+        response, route_name = JSONResponse({'error': 'Not found'}, 404), 'unmatched'
+    elif method != route[0]:
+        response, route_name = JSONResponse({'error': 'Method not allowed'}, 405), scope['path']
+    else:
+        route_name = scope['path']
+        try:
+            data = response = None
+            if route[2]:
+                try:
+                    data = load_json_body(await _read_body(receive), headers.get('content-encoding'))
+                except RequestBodyTooLarge:
+                    response = JSONResponse({'error': 'Request body too large'}, 413)
+                except RequestBodyError:
+                    data = None
+            if response is None:
+                response = await route[1](data)
+        except Exception as e:
+            logger.error(f"Async API error on {route_name}: {str(e)}")
+            response = JSONResponse({'error': 'Translation failed'}, 500)
+
+    body, encoding = maybe_gzip(response.body, headers.get('accept-encoding'))
+    response_headers = [(b'content-type', response.content_type),
+                        (b'content-length', str(len(body)).encode('latin-1')),
+                        (b'vary', b'Accept-Encoding')]
+    if encoding:
+        response_headers.append((b'content-encoding', encoding.encode('latin-1')))
+    await send({'type': 'http.response.start', 'status': response.status, 'headers': response_headers})
+    await send({'type': 'http.response.body', 'body': body})
+    REQUEST_LATENCY.labels('async_app', method, route_name, response.status).observe(time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='CivicLink async translation service')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print("🌍 Starting CivicLink Translation Service (asyncio)...")
+    print(f"🌐 Total supported languages: {len(ALL_LANGUAGES)}")
+    print(f"🚀 Server starting at http://localhost:{args.port}")
+    serve_asgi(app, args.host, args.port, max_body_bytes=MAX_BODY_BYTES)
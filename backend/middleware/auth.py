@@ -0,0 +1,68 @@
+"""
+Authentication middleware for the Flask routes (Python port of auth.js)
+"""
+
+from functools import wraps
+from flask import request, jsonify
+import jwt
+from backend.models.User import User
+from backend.services.database import database
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+JWT_SECRET = os.environ.get('JWT_SECRET', 'fallback-secret')
+
+def get_current_user():
+    """Decode the Bearer token and load its user; returns None if missing or invalid"""
+    auth_header = request.headers.get('Authorization', '')
+    token = auth_header.replace('Bearer ', '', 1).strip()
+    if not token:
+        return None
+    
+    try:
+        decoded = jwt.decode(token, JWT_SECRET, algorithms=['HS256'])
+    except jwt.InvalidTokenError:
+        return None
+    
+    return database.read_session.get(User, decoded.get('userId'))
+
+def auth_required(f):
+    """Require a valid Bearer token; sets request.user and request.user_id"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        try:
+            user = get_current_user()
+        except Exception as e:
+            logger.error(f"Auth middleware error: {str(e)}")
+            user = None
+        
+        if not user:
+            return jsonify({'message': 'Token is not valid'}), 401
+        
+        request.user = user
+        request.user_id = user.id
+        return f(*args, **kwargs)
+    return decorated
+
+def authorize_roles(roles):
+    """Restrict a route to users whose role is in roles (use after auth_required)"""
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            user = getattr(request, 'user', None)
+            if not user:
+                return jsonify({'message': 'Authentication required'}), 401
+            
+            if user.role not in roles:
+                return jsonify({'message': 'Access denied. Insufficient permissions.'}), 403
+            
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+def is_admin_request():
+    """True if the request carries a valid token for an admin user"""
+    user = get_current_user()
+    return bool(user and user.role == 'admin')
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, JSON, Index, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -30,6 +30,12 @@ class DifficultyEnum(str, Enum):
 
 class Translation(Base):
     __tablename__ = 'translations'
+    __table_args__ = (
+        # Natural key: one glossary entry per English term and language (bulk import upserts on it)
+        Index('uq_translations_english_language', 'english', 'language', unique=True),
+        # Change feed for the in-memory glossary snapshot
+        Index('ix_translations_updated_at', 'updated_at'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     english = Column(String(500), nullable=False)
@@ -103,3 +109,42 @@ class Translation(Base):
         
         self.feedback.append(feedback_entry)
         return True
+
+class TranslationTag(Base):
+    """One row per (tag, translation): an index over Translation.tags, which stays the source of truth"""
+    __tablename__ = 'translation_tags'
+    __table_args__ = (
+        Index('ix_translation_tags_translation_id', 'translation_id'),
+    )
+    
+    # Leading tag (then language) so tag filters and per-language counts are index range scans
+    tag = Column(String(50), primary_key=True)
+    language = Column(String(2), primary_key=True)
+    translation_id = Column(Integer, ForeignKey('translations.id', ondelete='CASCADE'), primary_key=True)
+
+def normalize_tags(tags):
+    """Distinct lower-cased tags as stored in translation_tags"""
+    if not isinstance(tags, (list, tuple)):
+        return []
+    return sorted({tag.strip().lower()[:50] for tag in tags if isinstance(tag, str) and tag.strip()})
+
+def _write_tags(connection, translation):
+    table = TranslationTag.__table__
+    connection.execute(table.delete().where(table.c.translation_id == translation.id))
+    rows = [{'tag': tag, 'language': translation.language, 'translation_id': translation.id}
+            for tag in normalize_tags(translation.tags)]
+    if rows:
+        connection.execute(table.insert(), rows)
+
+@event.listens_for(Translation, 'after_insert')
+def _tags_after_insert(mapper, connection, translation):
+    _write_tags(connection, translation)
+
+@event.listens_for(Translation, 'after_update')
+def _tags_after_update(mapper, connection, translation):
+    state = inspect(translation)
+    if state.attrs.tags.history.has_changes() or state.attrs.language.history.has_changes():
+        _write_tags(connection, translation)
+
+# Register the User model so the verifier relationship can resolve
+import backend.models.User  # noqa: E402
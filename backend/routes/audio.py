@@ -0,0 +1,43 @@
+from flask import Blueprint, Response, request, jsonify, send_file
+from werkzeug.exceptions import HTTPException
+from backend.services.audio_files import IMMUTABLE_MAX_AGE, MAX_AGE, audio_library
+import logging
+
+logger = logging.getLogger(__name__)
+
+audio_bp = Blueprint('audio', __name__, url_prefix='/audio')
+
+@audio_bp.route('/<path:filename>', methods=['GET'])
+def serve_audio(filename):
+    """
+    Pronunciation clip with ETag/304, Range/206 and long-lived caching.
+    Add ?v=<etag> for an immutable URL.
+    """
+    try:
+        audio = audio_library.resolve(filename)
+        if audio is None:
+            return jsonify({'error': 'Audio not found'}), 404
+        
+        versioned = request.args.get('v') == audio.etag
+        max_age = IMMUTABLE_MAX_AGE if versioned else MAX_AGE
+        if audio.data is not None:
+            # Hot files are answered from memory
+            response = Response(audio.data, mimetype=audio.mimetype)
+            response.set_etag(audio.etag)
+            response.last_modified = audio.mtime
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+            response.make_conditional(request, accept_ranges=True, complete_length=audio.size)
+        else:
+            # The rest go out by path: wsgi.file_wrapper (sendfile) or X-Sendfile
+            response = send_file(audio.path, mimetype=audio.mimetype, conditional=True, etag=audio.etag,
+                                 last_modified=audio.mtime, max_age=max_age)
+        if versioned:
+            response.cache_control.immutable = True
+        return response
+        
+    except HTTPException:
+        raise  # 416 for unsatisfiable ranges
+    except Exception as e:
+        logger.error(f"Serve audio error: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
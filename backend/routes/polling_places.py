@@ -0,0 +1,66 @@
+from flask import Blueprint, request, jsonify
+from backend.services.polling_places import DEFAULT_K, MAX_K, polling_places
+import logging
+import math
+import re
+
+logger = logging.getLogger(__name__)
+
+polling_places_bp = Blueprint('polling_places', __name__, url_prefix='/api/polling-places')
+
+_ZIP = re.compile(r'^(\d{5})(?:-\d{4})?$')
+PLACE_TYPES = ('election_day', 'early')
+
+def _coordinate(name, low, high):
+    value = float(request.args[name])
+    if not (math.isfinite(value) and low <= value <= high):
+        raise ValueError(name)
+    return value
+
+@polling_places_bp.route('', methods=['GET'])
+def find_polling_places():
+    """
+    Nearest polling places to ?zip=12345 or ?lat=..&lon=.., nearest first.
+    Optional: k (1-50), type (election_day or early; 'both' locations match either), max_km.
+    """
+    try:
+        k = request.args.get('k', DEFAULT_K, type=int)
+        place_type = request.args.get('type') or None
+        max_km = request.args.get('max_km', type=float)
+        if k is None or not 1 <= k <= MAX_K:
+            return jsonify({'error': f'k must be between 1 and {MAX_K}'}), 400
+        if place_type is not None and place_type not in PLACE_TYPES:
+            return jsonify({'error': f"type must be one of {', '.join(PLACE_TYPES)}"}), 400
+        if max_km is not None and not max_km > 0:
+            return jsonify({'error': 'max_km must be positive'}), 400
+        
+        zip_code = None
+        if 'lat' in request.args or 'lon' in request.args:
+            try:
+                lat, lon = _coordinate('lat', -90, 90), _coordinate('lon', -180, 180)
+            except (KeyError, ValueError):
+                return jsonify({'error': 'lat and lon must be valid coordinates'}), 400
+        else:
+            match = _ZIP.match(request.args.get('zip', '').strip())
+            if match is None:
+                return jsonify({'error': 'Provide a 5-digit zip, or lat and lon'}), 400
+            zip_code = match.group(1)
+        
+        index = polling_places.get()
+        if index is None:
+            return jsonify({'error': 'Polling place data not available'}), 503
+        if zip_code is not None:
+            if zip_code not in index.zip_centroids:
+                return jsonify({'error': f'No polling places found for ZIP {zip_code}'}), 404
+            lat, lon = index.zip_centroids[zip_code]
+        
+        nearest = index.nearest(lat, lon, k=k, kind=place_type, max_km=max_km)
+        return jsonify({
+            'origin': {'zip': zip_code, 'lat': round(lat, 6), 'lon': round(lon, 6)},
+            'places': [{**place.to_dict(), 'distance_km': round(distance, 3)} for place, distance in nearest],
+            'count': len(nearest)
+        })
+        
+    except Exception as e:
+        logger.error(f"Polling place search error: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
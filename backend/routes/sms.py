@@ -0,0 +1,61 @@
+from flask import Blueprint, request, jsonify
+from backend.services.json_codec import get_request_json
+from backend.services.sms import MAX_BATCH, handle_message, outbound
+import hmac
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+sms_bp = Blueprint('sms', __name__, url_prefix='/api/sms')
+
+# Shared secret the gateway sends as X-SMS-Token; unset accepts any caller (local development)
+WEBHOOK_TOKEN = os.environ.get('SMS_WEBHOOK_TOKEN')
+
+def _inbound_messages():
+    """
+    ([(sender, body, language)], batched) from a form post (From/Body), one JSON
+    message ({from, body, language}) or a gateway batch ({'messages': [...]}); None if malformed
+    """
+    if request.form:
+        return [(request.form.get('From', ''), request.form.get('Body', ''), 'en')], False
+    data = get_request_json()
+    if not isinstance(data, dict):
+        return None
+    batched = isinstance(data.get('messages'), list)
+    messages = data['messages'] if batched else [data]
+    if not 0 < len(messages) <= MAX_BATCH or not all(isinstance(m, dict) for m in messages):
+        return None
+    return [(str(m.get('from', '')), str(m.get('body', '')), str(m.get('language', 'en'))) for m in messages], batched
+
+@sms_bp.route('/inbound', methods=['POST'])
+def inbound_sms():
+    """
+    Gateway webhook for shortcode messages (VOTE 12345, EARLY 12345, DEADLINE, REGISTER, ID).
+    Replies are queued for the batched gateway sender (202), or returned inline when none is configured.
+    """
+    try:
+        if WEBHOOK_TOKEN and not hmac.compare_digest(request.headers.get('X-SMS-Token', ''), WEBHOOK_TOKEN):
+            return jsonify({'error': 'Invalid webhook token'}), 401
+        
+        parsed = _inbound_messages()
+        if parsed is None:
+            return jsonify({'error': f'Expected From/Body, from/body or up to {MAX_BATCH} messages'}), 400
+        messages, batched = parsed
+        
+        batcher = outbound()
+        replies = []
+        for sender, body, language in messages:
+            message, reply = handle_message(sender, body, language)
+            replies.append({'to': sender, 'command': message.command, 'reply': reply})
+        
+        if batcher is not None:
+            # All or nothing: the gateway retries the whole batch after a 503, so none of it may have been sent
+            if not batcher.submit_many([{'to': item['to'], 'body': item['reply']} for item in replies]):
+                return jsonify({'error': 'Outbound queue full', 'queued': 0}), 503, {'Retry-After': '1'}
+            return jsonify({'queued': len(messages)}), 202
+        return jsonify({'replies': replies} if batched else replies[0])
+        
+    except Exception as e:
+        logger.error(f"Inbound SMS error: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
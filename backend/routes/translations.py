@@ -1,10 +1,21 @@
-from flask import Blueprint, request, jsonify, current_app
-from sqlalchemy import and_, or_, func, desc, asc
-from sqlalchemy.orm import sessionmaker
+from flask import Blueprint, Response, request, jsonify, current_app
+from sqlalchemy import Integer, and_, or_, func, desc, asc
+from sqlalchemy.exc import IntegrityError
 from backend.models.Translation import Translation, LanguageEnum, CategoryEnum, DifficultyEnum
 from backend.middleware.auth import auth_required, authorize_roles
-from deep_translator import GoogleTranslator, DeepLTranslator
-import re
+from backend.services.languages import GLOSSARY_LANGUAGES, GLOSSARY_CODES
+from backend.services.database import database
+from backend.services.glossary_export import EXPORT_FORMATS, export_chunks
+from backend.services.glossary_import import IMPORT_FORMATS, detect_format, import_stream
+from backend.services.pipeline.engine import default_pipeline
+from backend.services.pipeline.markup import FORMATS as TEXT_FORMATS
+from backend.services.related_terms import MAX_DEPTH, expand_related, load_summaries, parse_expand, related_index
+from backend.services.compiled_glossary import compiled_glossary, entry_key, schedule_compile
+from backend.services.facets import facet_counts
+from backend.services.glossary_snapshot import glossary_snapshot
+from backend.services.tags import MAX_FILTER_TAGS, TAG_MATCH_MODES, parse_tags, tag_counts, tag_filter
+from backend.services.json_codec import accepts_gzip, get_request_json, json_response, wants_compact
+from backend.services.pipeline.text import chunk_text, calculate_quality_score  # noqa: F401 (re-exported)
 import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -15,150 +26,76 @@ logger = logging.getLogger(__name__)
 
 translations_bp = Blueprint('translations', __name__, url_prefix='/api/translations')
 
-# Translation service configuration
-TRANSLATION_SERVICES = {
-    'google': GoogleTranslator,
-    'deepl': DeepLTranslator
-}
+# Language mapping for deep-translator (glossary code -> provider code)
+LANGUAGE_MAPPING = {lang.code: lang.google_code for lang in GLOSSARY_LANGUAGES}
 
-# Language mapping for deep-translator
-LANGUAGE_MAPPING = {
-    'es': 'spanish',
-    'zh': 'zh-CN',  # Chinese Simplified
-    'ar': 'arabic',
-    'hi': 'hindi',
-    'ko': 'korean',
-    'vi': 'vietnamese',
-    'tl': 'filipino'
-}
+# Precomputed validation sets
+CATEGORY_VALUES = frozenset(cat.value for cat in CategoryEnum)
 
 def get_db_session():
-    """Get database session"""
-    from app import db
-    return db.session
+    """Get the database session for requests that write"""
+    return database.session
 
-def chunk_text(text: str, max_chunk_size: int = 5000) -> List[str]:
+def get_read_session():
+    """Get the read-only database session (never waits on writers)"""
+    return database.read_session
+
+def translate_text_efficient(text: str, target_language: str, source_language: str = 'auto',
+                             format: str = 'text') -> Dict:
     """
-    Split large text into chunks for efficient translation.
-    Tries to break at sentence boundaries when possible.
+    Translate text through the shared staged pipeline
+    (normalize -> segment -> cache -> provider -> postprocess -> score).
+    ``format='html'``/``'markdown'`` translates only the text nodes and keeps the markup.
+    Returns translation result with quality indicators.
     """
-    if len(text) <= max_chunk_size:
-        return [text]
+    return default_pipeline.run(text, target_language, source_language, format)
+
+def query_translations(db, language, category, verified, tags, tag_match, search, page, limit, with_facets):
+    """(page of Translation rows, total, facets or None) from SQL"""
+    query = db.query(Translation)
     
-    chunks = []
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    current_chunk = ""
+    # Apply filters
+    if language:
+        query = query.filter(Translation.language == language)
     
-    for sentence in sentences:
-        if len(current_chunk + sentence) <= max_chunk_size:
-            current_chunk += sentence + " "
-        else:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = sentence + " "
+    if category:
+        query = query.filter(Translation.category == category)
     
-    if current_chunk:
-        chunks.append(current_chunk.strip())
+    if verified is not None:
+        query = query.filter(Translation.verified == verified)
     
-    return chunks
-
-def translate_text_efficient(text: str, target_language: str, source_language: str = 'auto') -> Dict:
-    """
-    Efficiently translate large text using deep-translator with chunking.
-    Returns translation result with quality indicators.
-    """
-    try:
-        # Clean and validate input
-        text = text.strip()
-        if not text:
-            return {'error': 'Empty text provided'}
-        
-        # Map language codes
-        target_lang = LANGUAGE_MAPPING.get(target_language, target_language)
-        
-        # Chunk large text for better performance
-        chunks = chunk_text(text)
-        translated_chunks = []
-        total_chars = len(text)
-        
-        logger.info(f"Translating {total_chars} characters in {len(chunks)} chunks to {target_lang}")
-        
-        # Use Google Translator for better free tier performance
-        translator = GoogleTranslator(source=source_language, target=target_lang)
-        
-        for i, chunk in enumerate(chunks):
-            try:
-                translated_chunk = translator.translate(chunk)
-                translated_chunks.append(translated_chunk)
-                logger.info(f"Translated chunk {i+1}/{len(chunks)}")
-            except Exception as e:
-                logger.error(f"Error translating chunk {i+1}: {str(e)}")
-                # Fallback: return original chunk if translation fails
-                translated_chunks.append(chunk)
-        
-        # Combine translated chunks
-        translated_text = " ".join(translated_chunks)
-        
-        # Calculate quality indicators
-        quality_score = calculate_quality_score(text, translated_text, target_language)
-        
-        return {
-            'original_text': text,
-            'translated_text': translated_text,
-            'source_language': source_language,
-            'target_language': target_language,
-            'chunks_processed': len(chunks),
-            'total_characters': total_chars,
-            'quality_score': quality_score,
-            'translation_service': 'google',
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"Translation error: {str(e)}")
-        return {'error': f'Translation failed: {str(e)}'}
-
-def calculate_quality_score(original: str, translated: str, target_lang: str) -> float:
-    """
-    Calculate a simple quality score based on text characteristics.
-    Higher score indicates better translation quality.
-    """
-    try:
-        # Basic quality indicators
-        length_ratio = len(translated) / len(original) if len(original) > 0 else 0
-        
-        # Penalize extremely short or long translations
-        if length_ratio < 0.1 or length_ratio > 3.0:
-            length_score = 0.3
-        elif 0.5 <= length_ratio <= 2.0:
-            length_score = 1.0
-        else:
-            length_score = 0.7
-        
-        # Check for common translation artifacts
-        artifact_penalty = 0
-        artifacts = ['[', ']', '...', '??', '!!']
-        for artifact in artifacts:
-            if artifact in translated:
-                artifact_penalty += 0.1
-        
-        # Check for proper sentence structure
-        sentence_score = 1.0
-        if not translated.endswith(('.', '!', '?')):
-            sentence_score = 0.8
-        
-        # Combine scores
-        quality_score = (length_score + sentence_score - artifact_penalty) / 2
-        return max(0.0, min(1.0, quality_score))
-        
-    except Exception:
-        return 0.5  # Default moderate score
+    # Tag filter through the translation_tags index (all = AND, any = OR)
+    if tags:
+        query = query.filter(tag_filter(tags, tag_match, language))
+    
+    # Text search
+    if search:
+        search_filter = or_(
+            Translation.english.ilike(f'%{search}%'),
+            Translation.translated.ilike(f'%{search}%'),
+            Translation.explanation.ilike(f'%{search}%')
+        )
+        query = query.filter(search_filter)
+    
+    # Get total count (facets include it, from the same aggregate query)
+    facets = None
+    if with_facets:
+        total, facets = facet_counts(query)
+    else:
+        total = query.count()
+    
+    # Apply pagination and ordering
+    translations = query.order_by(desc(Translation.usage_count), desc(Translation.created_at))\
+                      .offset((page - 1) * limit)\
+                      .limit(limit)\
+                      .all()
+    return translations, total, facets
 
 @translations_bp.route('/', methods=['GET'])
 def get_translations():
     """Get translations with filtering and search"""
     try:
-        db = get_db_session()
+        db = get_read_session()
         
         # Parse query parameters
         page = int(request.args.get('page', 1))
@@ -167,48 +104,55 @@ def get_translations():
         category = request.args.get('category')
         search = request.args.get('search', '').strip()
         verified = request.args.get('verified')
-        
-        # Build query
-        query = db.query(Translation)
-        
-        # Apply filters
-        if language and language in [lang.value for lang in LanguageEnum]:
-            query = query.filter(Translation.language == language)
-        
-        if category and category in [cat.value for cat in CategoryEnum]:
-            query = query.filter(Translation.category == category)
-        
+        with_facets = request.args.get('facets', '').lower() == 'true'
+        tags = parse_tags(request.args.getlist('tag'))
+        tag_match = request.args.get('tag_match', 'all')
+        try:
+            expand = parse_expand(request.args.get('expand'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if tag_match not in TAG_MATCH_MODES:
+            return jsonify({'error': 'tag_match must be all or any'}), 400
+        
+        if len(tags) > MAX_FILTER_TAGS:
+            return jsonify({'error': f'At most {MAX_FILTER_TAGS} tags'}), 400
+        
+        language = language if language in GLOSSARY_CODES else None
+        category = category if category in CATEGORY_VALUES else None
         if verified is not None:
-            verified_bool = verified.lower() == 'true'
-            query = query.filter(Translation.verified == verified_bool)
-        
-        # Text search
-        if search:
-            search_filter = or_(
-                Translation.english.ilike(f'%{search}%'),
-                Translation.translated.ilike(f'%{search}%'),
-                Translation.explanation.ilike(f'%{search}%')
-            )
-            query = query.filter(search_filter)
-        
-        # Get total count
-        total = query.count()
+            verified = verified.lower() == 'true'
+        
+        if current_app.config.get('GLOSSARY_SNAPSHOT'):
+            # Answered from the in-memory snapshot (bitset filters, presorted order)
+            glossary_snapshot.refresh(database.read_engine)
+            translations, total, facets = glossary_snapshot.query(
+                language=language, category=category, verified=verified, tags=tags, tag_match=tag_match,
+                search=search, page=page, limit=limit, facets=with_facets)
+            summaries = glossary_snapshot.summaries
+        else:
+            translations, total, facets = query_translations(
+                db, language, category, verified, tags, tag_match, search, page, limit, with_facets)
+            summaries = None
         
-        # Apply pagination and ordering
-        translations = query.order_by(desc(Translation.usage_count), desc(Translation.created_at))\
-                          .offset((page - 1) * limit)\
-                          .limit(limit)\
-                          .all()
+        if 'related_terms' in expand:
+            items = expand_related(db, translations, summaries)
+        else:
+            items = [t.to_dict() for t in translations]
         
-        return jsonify({
-            'translations': [t.to_dict() for t in translations],
+        response = {
+            'translations': items,
             'pagination': {
                 'page': page,
                 'limit': limit,
                 'total': total,
                 'pages': (total + limit - 1) // limit
             }
-        })
+        }
+        if facets is not None:
+            response['facets'] = facets
+        
+        return jsonify(response)
         
     except Exception as e:
         logger.error(f"Get translations error: {str(e)}")
@@ -218,7 +162,7 @@ def get_translations():
 def get_categories():
     """Get translation categories and counts"""
     try:
-        db = get_db_session()
+        db = get_read_session()
         
         # Get category statistics
         categories = db.query(
@@ -253,10 +197,78 @@ def get_categories():
         logger.error(f"Get categories error: {str(e)}")
         return jsonify({'error': 'Server error'}), 500
 
+@translations_bp.route('/tags', methods=['GET'])
+def get_tags():
+    """Get tag counts per language (optionally for one ?language=)"""
+    try:
+        language = request.args.get('language')
+        if language and language not in GLOSSARY_CODES:
+            return jsonify({'error': 'Invalid language'}), 400
+        
+        db = get_read_session()
+        
+        tag_stats = {}
+        for tag, lang, count in tag_counts(db, language):
+            if tag not in tag_stats:
+                tag_stats[tag] = {'tag': tag, 'languages': [], 'total_count': 0}
+            tag_stats[tag]['languages'].append({'language': lang, 'count': count})
+            tag_stats[tag]['total_count'] += count
+        
+        tags = sorted(tag_stats.values(), key=lambda stats: (-stats['total_count'], stats['tag']))
+        return jsonify({'tags': tags})
+        
+    except Exception as e:
+        logger.error(f"Get tags error: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
+
+@translations_bp.route('/lookup', methods=['GET'])
+def lookup_translation():
+    """
+    Exact verified translation of ?term= in ?language= (case- and spacing-insensitive).
+    Served from the memory-mapped compiled glossary when one exists; does not count as usage.
+    """
+    try:
+        term = (request.args.get('term') or '').strip()
+        language = request.args.get('language')
+        if not term:
+            return jsonify({'error': 'term is required'}), 400
+        if language not in GLOSSARY_CODES:
+            return jsonify({'error': 'Invalid language'}), 400
+        
+        if compiled_glossary.available:
+            entry = compiled_glossary.lookup(term, language)
+            source = 'compiled'
+        else:
+            # Same key as the compiled file: SQL lower() is ASCII-only and keeps spacing, so compare in Python
+            session = get_read_session()
+            key = entry_key(term, language)
+            candidates = session.query(Translation.id, Translation.english).filter(
+                Translation.language == language,
+                Translation.verified == True
+            ).order_by(Translation.id)
+            translation_id = next((row.id for row in candidates if entry_key(row.english, language) == key), None)
+            translation = translation_id and session.get(Translation, translation_id)
+            entry = translation and {field: getattr(translation, field) for field in (
+                'id', 'english', 'translated', 'explanation', 'category', 'audio_url', 'language')}
+            source = 'database'
+        
+        if entry is None:
+            return jsonify({'error': 'Translation not found'}), 404
+        return jsonify({'translation': entry, 'source': source})
+        
+    except Exception as e:
+        logger.error(f"Lookup translation error: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
+
 @translations_bp.route('/<int:translation_id>', methods=['GET'])
 def get_translation(translation_id):
     """Get single translation by ID"""
     try:
+        try:
+            expand = parse_expand(request.args.get('expand'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         db = get_db_session()
         
         translation = db.query(Translation).filter(Translation.id == translation_id).first()
@@ -267,18 +279,48 @@ def get_translation(translation_id):
         # Increment usage count
         translation.increment_usage()
         db.commit()
+        glossary_snapshot.apply(translation)
         
+        if 'related_terms' in expand:
+            return jsonify({'translation': expand_related(db, [translation])[0]})
         return jsonify({'translation': translation.to_dict()})
         
     except Exception as e:
         logger.error(f"Get translation error: {str(e)}")
         return jsonify({'error': 'Server error'}), 500
 
+@translations_bp.route('/<int:translation_id>/related', methods=['GET'])
+def get_related_translations(translation_id):
+    """Terms within ?depth= hops (default 1, max 3) through related_terms; does not count as usage"""
+    try:
+        try:
+            depth = int(request.args.get('depth', 1))
+        except ValueError:
+            return jsonify({'error': 'depth must be an integer'}), 400
+        if not 1 <= depth <= MAX_DEPTH:
+            return jsonify({'error': f'depth must be between 1 and {MAX_DEPTH}'}), 400
+        
+        db = get_read_session()
+        
+        if db.query(Translation.id).filter(Translation.id == translation_id).first() is None:
+            return jsonify({'error': 'Translation not found'}), 404
+        
+        hops = related_index.neighbors(db, translation_id, depth)
+        summaries = load_summaries(db, hops)
+        related = [{**summaries[term_id], 'hops': hops[term_id]}
+                   for term_id in sorted(summaries, key=lambda term_id: (hops[term_id], term_id))]
+        
+        return jsonify({'id': translation_id, 'depth': depth, 'related': related})
+        
+    except Exception as e:
+        logger.error(f"Get related translations error: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
+
 @translations_bp.route('/translate', methods=['POST'])
 def translate_text():
     """Translate text using deep-translator"""
     try:
-        data = request.get_json()
+        data = get_request_json()
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
@@ -286,20 +328,24 @@ def translate_text():
         text = data.get('text', '').strip()
         target_language = data.get('target_language', 'es')
         source_language = data.get('source_language', 'auto')
+        text_format = data.get('format', 'text')
         
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        if target_language not in [lang.value for lang in LanguageEnum]:
+        if text_format not in TEXT_FORMATS:
+            return jsonify({'error': 'Invalid format'}), 400
+        
+        if target_language not in GLOSSARY_CODES:
             return jsonify({'error': 'Invalid target language'}), 400
         
         # Perform translation
-        result = translate_text_efficient(text, target_language, source_language)
+        result = translate_text_efficient(text, target_language, source_language, text_format)
         
         if 'error' in result:
             return jsonify(result), 400
         
-        return jsonify(result)
+        return json_response(result, compact=wants_compact(data))
         
     except Exception as e:
         logger.error(f"Translation error: {str(e)}")
@@ -323,14 +369,22 @@ def create_translation():
                 return jsonify({'error': f'{field} is required'}), 400
         
         # Validate language and category
-        if data['language'] not in [lang.value for lang in LanguageEnum]:
+        if data['language'] not in GLOSSARY_CODES:
             return jsonify({'error': 'Invalid language'}), 400
         
-        if data['category'] not in [cat.value for cat in CategoryEnum]:
+        if data['category'] not in CATEGORY_VALUES:
             return jsonify({'error': 'Invalid category'}), 400
         
         db = get_db_session()
         
+        # One entry per (english, language): point at the existing one instead
+        existing = db.query(Translation.id).filter(
+            Translation.english == data['english'],
+            Translation.language == data['language']
+        ).scalar()
+        if existing is not None:
+            return jsonify({'error': 'Translation already exists', 'id': existing}), 409
+        
         # Create translation
         translation = Translation(
             english=data['english'],
@@ -348,8 +402,15 @@ def create_translation():
         )
         
         db.add(translation)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # Created concurrently since the check above
+            db.rollback()
+            return jsonify({'error': 'Translation already exists'}), 409
         db.refresh(translation)
+        glossary_snapshot.apply(translation)
+        schedule_compile(database.write_engine)
         
         return jsonify({
             'message': 'Translation created successfully',
@@ -360,6 +421,74 @@ def create_translation():
         logger.error(f"Create translation error: {str(e)}")
         return jsonify({'error': 'Server error'}), 500
 
+@translations_bp.route('/bulk', methods=['POST'])
+@auth_required
+@authorize_roles(['organizer', 'admin'])
+def bulk_import_translations():
+    """
+    Bulk upsert translations from a streamed NDJSON or CSV body (organizers only).
+    Format comes from ?format= or the Content-Type; gzip bodies are accepted.
+    """
+    try:
+        import_format = request.args.get('format') or detect_format(request.content_type)
+        if import_format not in IMPORT_FORMATS:
+            return jsonify({'error': 'Body must be NDJSON (application/x-ndjson) or CSV (text/csv)'}), 400
+        
+        content_encoding = request.headers.get('Content-Encoding', 'identity').strip().lower()
+        if content_encoding not in ('identity', 'gzip'):
+            return jsonify({'error': 'Unsupported Content-Encoding'}), 400
+        
+        report = import_stream(database.write_engine, request.stream, import_format,
+                               user_id=request.user_id, compressed=content_encoding == 'gzip')
+        glossary_snapshot.expire()
+        if report.upserted:
+            schedule_compile(database.write_engine)
+        
+        return jsonify(report.to_dict()), 200 if report.upserted or not report.failed else 400
+        
+    except Exception as e:
+        logger.error(f"Bulk import error: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
+
+@translations_bp.route('/export', methods=['GET'])
+@auth_required
+@authorize_roles(['organizer', 'admin'])
+def export_translations():
+    """
+    Stream the glossary as NDJSON or CSV (organizers only).
+    Filters: language, category, verified; gzipped when the client accepts it.
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': 'format must be ndjson or csv'}), 400
+        
+        language = request.args.get('language')
+        if language and language not in GLOSSARY_CODES:
+            return jsonify({'error': 'Invalid language'}), 400
+        
+        category = request.args.get('category')
+        if category and category not in CATEGORY_VALUES:
+            return jsonify({'error': 'Invalid category'}), 400
+        
+        verified = request.args.get('verified')
+        if verified is not None:
+            verified = verified.lower() == 'true'
+        
+        compress = accepts_gzip(request.headers.get('Accept-Encoding'))
+        chunks = export_chunks(database.read_engine, export_format, language=language, category=category,
+                               verified=verified, compress=compress)
+        
+        headers = {'Content-Disposition': f'attachment; filename=translations.{export_format}',
+                   'Vary': 'Accept-Encoding'}
+        if compress:
+            headers['Content-Encoding'] = 'gzip'
+        return Response(chunks, mimetype=EXPORT_FORMATS[export_format], headers=headers)
+        
+    except Exception as e:
+        logger.error(f"Export translations error: {str(e)}")
+        return jsonify({'error': 'Server error'}), 500
+
 @translations_bp.route('/<int:translation_id>/verify', methods=['PUT'])
 @auth_required
 @authorize_roles(['organizer', 'admin'])
@@ -383,6 +512,8 @@ def verify_translation(translation_id):
         translation.verified_at = datetime.utcnow()
         
         db.commit()
+        glossary_snapshot.apply(translation)
+        schedule_compile(database.write_engine)
         
         return jsonify({
             'message': f"Translation {'verified' if data['verified'] else 'unverified'} successfully",
@@ -421,6 +552,7 @@ def submit_feedback(translation_id):
             return jsonify({'error': 'Feedback already submitted'}), 400
         
         db.commit()
+        glossary_snapshot.apply(translation)
         
         return jsonify({'message': 'Feedback submitted successfully'})
         
@@ -432,7 +564,7 @@ def submit_feedback(translation_id):
 def get_translation_stats():
     """Get translation statistics overview"""
     try:
-        db = get_db_session()
+        db = get_read_session()
         
         # Get basic statistics
         total_translations = db.query(Translation).count()
@@ -0,0 +1,306 @@
+"""
+Minimal asyncio HTTP/1.1 plumbing for the async translation service.
+
+- ``AsyncHTTPClient``: keep-alive client with a per-host connection pool,
+  used for non-blocking provider calls (no aiohttp/httpx dependency).
+- ``serve_asgi``: a small HTTP/1.1 server that runs an ASGI application, so
+  ``async_app.py`` works with nothing but the standard library. Any ASGI server
+  (uvicorn, hypercorn) can host the same app in production.
+
+Both sides support Content-Length and chunked bodies and keep connections
+alive between requests. The server answers 413 for bodies over
+``max_body_bytes`` before reading them in full, and closes connections that
+idle longer than ``KEEPALIVE_TIMEOUT`` or take longer than ``READ_TIMEOUT``
+to send a request.
+"""
+
+import asyncio
+import logging
+import ssl
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote, urlencode, urlsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100  # concurrent connections per host
+DEFAULT_TIMEOUT = 30.0
+MAX_HEADER_LINES = 100
+DEFAULT_MAX_BODY_BYTES = 10 * 1024 * 1024  # server-side request body limit
+KEEPALIVE_TIMEOUT = 75.0  # server: seconds to wait for the next request line
+READ_TIMEOUT = 30.0  # server: seconds to receive the headers and body once a request has started
+
+_REASONS = {
+    200: 'OK', 204: 'No Content', 206: 'Partial Content', 304: 'Not Modified', 400: 'Bad Request',
+    401: 'Unauthorized', 403: 'Forbidden', 404: 'Not Found', 405: 'Method Not Allowed', 408: 'Request Timeout',
+    413: 'Payload Too Large', 416: 'Range Not Satisfiable', 429: 'Too Many Requests',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+
+
+class BodyTooLargeError(ValueError):
+    """Request body exceeds the server's limit"""
+
+
+class HTTPResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]  # lower-cased names
+    body: bytes
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='replace')
+
+
+async def _read_headers(reader: asyncio.StreamReader) -> List[Tuple[str, str]]:
+    headers = []
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers.append((name.strip().lower(), value.strip()))
+    raise ValueError('Too many header lines')
+
+
+async def _read_chunked(reader: asyncio.StreamReader, max_bytes: Optional[int]) -> bytes:
+    parts = []
+    total = 0
+    while True:
+        size = int((await reader.readline()).split(b';', 1)[0].strip() or b'0', 16)
+        if size == 0:
+            await _read_headers(reader)  # trailers
+            return b''.join(parts)
+        total += size
+        if max_bytes is not None and total > max_bytes:
+            raise BodyTooLargeError(f'Chunked body exceeds {max_bytes} bytes')
+        parts.append(await reader.readexactly(size))
+        await reader.readline()
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str], until_eof: bool,
+                     max_bytes: Optional[int] = None) -> Tuple[bytes, bool]:
+    """Read a message body; returns (body, connection_reusable)"""
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        return await _read_chunked(reader, max_bytes), True
+    if 'content-length' in headers:
+        length = int(headers['content-length'])
+        if max_bytes is not None and length > max_bytes:
+            raise BodyTooLargeError(f'Content-Length {length} exceeds {max_bytes} bytes')
+        return (await reader.readexactly(length) if length else b''), True
+    if until_eof:
+        return await reader.read(), False
+    return b'', True
+
+
+class AsyncHTTPClient:
+    """
+    Keep-alive HTTP/1.1 client. Idle connections are pooled per
+    (scheme, host, port) and at most ``max_connections`` are open to one host.
+    An instance belongs to the event loop it is first used on.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS, ssl_context: Optional[ssl.SSLContext] = None,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self.max_connections = max_connections
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+        self.stats = {'connections_opened': 0, 'requests': 0}
+
+    async def _connect(self, key):
+        scheme, host, port = key
+        context = None
+        if scheme == 'https':
+            context = self.ssl_context or ssl.create_default_context()
+        self.stats['connections_opened'] += 1
+        return await asyncio.open_connection(host, port, ssl=context)
+
+    async def request(self, method: str, url: str, params: Optional[Dict] = None, body: bytes = b'',
+                      headers: Optional[Dict[str, str]] = None) -> HTTPResponse:
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        key = (scheme, parts.hostname, parts.port or (443 if scheme == 'https' else 80))
+        target = parts.path or '/'
+        query = '&'.join(q for q in (parts.query, urlencode(params) if params else '') if q)
+        if query:
+            target = f'{target}?{query}'
+
+        lines = [f'{method} {target} HTTP/1.1', f'Host: {parts.netloc}', f'Content-Length: {len(body)}']
+        lines.extend(f'{name}: {value}' for name, value in (headers or {}).items())
+        payload = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+        limit = self._limits.setdefault(key, asyncio.Semaphore(self.max_connections))
+        async with limit:
+            self.stats['requests'] += 1
+            idle = self._idle.setdefault(key, [])
+            # A pooled connection may have been closed by the server; retry once on a fresh one
+            for attempt in range(2):
+                reused = bool(idle)
+                reader, writer = idle.pop() if reused else await asyncio.wait_for(self._connect(key), self.timeout)
+                try:
+                    response, reusable = await asyncio.wait_for(
+                        self._exchange(reader, writer, payload, method), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+                    writer.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if reusable and response.headers.get('connection', '').lower() != 'close':
+                    idle.append((reader, writer))
+                else:
+                    writer.close()
+                return response
+
+    async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, payload: bytes,
+                        method: str) -> Tuple[HTTPResponse, bool]:
+        writer.write(payload)
+        await writer.drain()
+        return await self._read_response(reader, method)
+
+    async def _read_response(self, reader: asyncio.StreamReader, method: str) -> Tuple[HTTPResponse, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError('Connection closed before response')
+        status = int(status_line.split(None, 2)[1])
+        headers = dict(await _read_headers(reader))
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            return HTTPResponse(status, headers, b''), True
+        body, reusable = await _read_body(reader, headers, until_eof=True)
+        return HTTPResponse(status, headers, body), reusable
+
+    async def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> HTTPResponse:
+        return await self.request('GET', url, params=params, **kwargs)
+
+    async def post(self, url: str, body: bytes = b'', **kwargs) -> HTTPResponse:
+        return await self.request('POST', url, body=body, **kwargs)
+
+    async def close(self):
+        connections = [conn for idle in self._idle.values() for conn in idle]
+        self._idle.clear()
+        for _, writer in connections:
+            writer.close()
+        for _, writer in connections:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+def _error_response(status: int) -> bytes:
+    return (f'HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'
+            .encode('latin-1'))
+
+
+async def _read_request(reader: asyncio.StreamReader, request_line: bytes,
+                        max_body_bytes: int) -> Tuple[str, str, str, List[Tuple[str, str]], bytes]:
+    method, target, version = request_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+    headers = await _read_headers(reader)
+    body, _ = await _read_body(reader, dict(headers), until_eof=False, max_bytes=max_body_bytes)
+    return method, target, version, headers, body
+
+
+async def _handle_connection(app, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                             max_body_bytes: int = DEFAULT_MAX_BODY_BYTES):
+    """Serve HTTP/1.1 requests on one connection until it closes"""
+    server = writer.get_extra_info('sockname')
+    client = writer.get_extra_info('peername')
+    try:
+        while True:
+            try:
+                request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+            except asyncio.TimeoutError:
+                break
+            if not request_line:
+                break
+            try:
+                method, target, version, headers, body = await asyncio.wait_for(
+                    _read_request(reader, request_line, max_body_bytes), READ_TIMEOUT)
+            except BodyTooLargeError:
+                # The rest of the body is never read, so the connection cannot be reused
+                writer.write(_error_response(413))
+                break
+            except asyncio.TimeoutError:
+                writer.write(_error_response(408))
+                break
+            except (ValueError, asyncio.IncompleteReadError):
+                writer.write(_error_response(400))
+                break
+
+            path, _, query = target.partition('?')
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': version[5:] or '1.1',
+                'method': method, 'scheme': 'http', 'path': unquote(path), 'raw_path': path.encode('latin-1'),
+                'query_string': query.encode('latin-1'), 'root_path': '',
+                'headers': [(name.encode('latin-1'), value.encode('latin-1')) for name, value in headers],
+                'server': server[:2] if server else None, 'client': client[:2] if client else None,
+            }
+            request_headers = dict(headers)
+            keep_alive = (version == 'HTTP/1.1' and request_headers.get('connection', '').lower() != 'close')
+
+            received = False
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {'type': 'http.request', 'body': body, 'more_body': False}
+                await asyncio.Event().wait()  # no disconnect detection; the request is fully read
+
+            response = {'status': 500, 'headers': [], 'body': []}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    response['status'] = message['status']
+                    response['headers'] = list(message.get('headers', []))
+                elif message['type'] == 'http.response.body':
+                    response['body'].append(message.get('body', b''))
+
+            try:
+                await app(scope, receive, send)
+            except Exception as e:
+                logger.error(f"ASGI application error: {str(e)}")
+                response = {'status': 500, 'headers': [(b'content-type', b'text/plain')], 'body': [b'Internal Server Error']}
+
+            payload = b''.join(response['body'])
+            status = response['status']
+            head = [f'HTTP/1.1 {status} {_REASONS.get(status, "Unknown")}'.encode('latin-1')]
+            names = set()
+            for name, value in response['headers']:
+                names.add(name.lower())
+                head.append(name + b': ' + value)
+            if b'content-length' not in names:
+                head.append(f'Content-Length: {len(payload)}'.encode('latin-1'))
+            if not keep_alive:
+                head.append(b'Connection: close')
+            writer.write(b'\r\n'.join(head) + b'\r\n\r\n' + (b'' if method == 'HEAD' else payload))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_asgi_server(app, host: str = '127.0.0.1', port: int = 8000, backlog: int = 4096,
+                            max_body_bytes: int = DEFAULT_MAX_BODY_BYTES) -> asyncio.AbstractServer:
+    """Start serving an ASGI app; returns the asyncio server (port 0 picks a free port)"""
+    return await asyncio.start_server(lambda r, w: _handle_connection(app, r, w, max_body_bytes), host, port,
+                                      backlog=backlog)
+
+
+def serve_asgi(app, host: str = '127.0.0.1', port: int = 8000, max_body_bytes: int = DEFAULT_MAX_BODY_BYTES):
+    """Run an ASGI app until interrupted"""
+    async def main():
+        server = await start_asgi_server(app, host, port, max_body_bytes=max_body_bytes)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,174 @@
+"""
+Non-blocking translation provider clients for the asyncio service.
+
+``AsyncGoogleTranslator`` runs deep-translator's own
+``GoogleTranslator.translate`` (the same code path as the pooled sync
+client), but its HTTP round-trips are awaited on a shared
+``AsyncHTTPClient`` instead of blocking a thread, so one process can keep
+thousands of slow provider calls in flight. Upstream's translate is
+synchronous, so it is replayed: each run that reaches a request not fetched
+yet stops, the request is awaited, and the next run gets the responses so far.
+A call costs one run per request (two when upstream retries without ``hl``).
+
+Each run works on a copy of the client's URL params, so ``AsyncTranslatorPool``
+keeps one instance per (provider, source, target) and shares it between
+coroutines. Providers without an async client are run in the default thread
+pool on an instance checked out of the sync ``TranslatorPool`` for each call.
+"""
+
+import asyncio
+import copy
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from deep_translator import GoogleTranslator
+
+from backend.services.async_http import AsyncHTTPClient, DEFAULT_MAX_CONNECTIONS
+from backend.services.metrics import record_cache
+from backend.services.translator_pool import _current_session, _upstream_translate, translator_pool
+
+
+class _PendingRequest(Exception):
+    """Raised out of upstream's translate at a request that has not been fetched yet"""
+
+    def __init__(self, url: str, params: Dict):
+        super().__init__(url)
+        self.url = url
+        self.params = params
+
+
+class _FetchedResponse(NamedTuple):
+    """The parts of a ``requests.Response`` upstream's translate reads"""
+    status_code: int
+    text: str
+
+    def close(self):
+        pass
+
+
+class _Replay:
+    """Session stand-in for one run: ``get`` returns the responses fetched so far, in order"""
+
+    def __init__(self, responses: List[_FetchedResponse]):
+        self._responses = iter(responses)
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs):
+        response = next(self._responses, None)
+        if response is None:
+            raise _PendingRequest(url, dict(params or {}))
+        return response
+
+
+class AsyncGoogleTranslator(GoogleTranslator):
+    """GoogleTranslator whose requests go through an AsyncHTTPClient"""
+
+    def __init__(self, source: str = 'auto', target: str = 'en', client: Optional[AsyncHTTPClient] = None,
+                 base_url: Optional[str] = None, **kwargs):
+        super().__init__(source=source, target=target, **kwargs)
+        self.client = client or AsyncHTTPClient()
+        if base_url:
+            self._base_url = base_url
+
+    def translate(self, text: str, **kwargs) -> str:
+        """GoogleTranslator.translate; inside ``translate_async`` its requests are replayed"""
+        return _upstream_translate(self, text, **kwargs)
+
+    async def translate_async(self, text: str, **kwargs) -> str:
+        """Translate text with upstream's translate, awaiting its requests instead of blocking the loop"""
+        responses: List[_FetchedResponse] = []
+        while True:
+            # Upstream mutates the URL params: every run starts from a private copy
+            call = copy.copy(self)
+            call._url_params = dict(self._url_params)
+            token = _current_session.set(_Replay(responses))
+            try:
+                return call.translate(text, **kwargs)
+            except _PendingRequest as pending:
+                request = pending
+            finally:
+                _current_session.reset(token)
+            response = await self.client.get(request.url, params=request.params)
+            responses.append(_FetchedResponse(response.status, response.text))
+
+
+# Provider name -> async client class
+ASYNC_PROVIDERS = {
+    'google': AsyncGoogleTranslator,
+}
+
+
+class AsyncTranslatorPool:
+    """
+    Per-event-loop cache of async translator clients keyed by
+    (provider, source, target), all sharing one AsyncHTTPClient.
+    The pool rebinds itself if it is used from a different event loop.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS, providers: Optional[Dict] = None,
+                 base_urls: Optional[Dict[str, str]] = None, ssl_context=None, sync_pool=None):
+        self.max_connections = max_connections
+        self.providers = dict(providers or ASYNC_PROVIDERS)
+        self.sync_pool = sync_pool or translator_pool
+        self.base_urls = dict(base_urls or {})
+        self.ssl_context = ssl_context
+        self._loop = None
+        self._client: Optional[AsyncHTTPClient] = None
+        self._translators: Dict[Tuple[str, str, str], object] = {}
+
+    @property
+    def client(self) -> AsyncHTTPClient:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Connections belong to the loop that opened them
+            self._loop = loop
+            self._client = AsyncHTTPClient(self.max_connections, self.ssl_context)
+            self._translators.clear()
+        return self._client
+
+    def get(self, source: str, target: str, provider: str = 'google'):
+        """Get the shared client for a language pair (created on first use)"""
+        if provider not in self.providers:
+            raise ValueError(f'Unsupported translation provider: {provider}')
+        client = self.client
+        key = (provider, source, target)
+        translator = self._translators.get(key)
+        record_cache('async_translator_pool', translator is not None)
+        if translator is None:
+            options = {'base_url': self.base_urls[provider]} if provider in self.base_urls else {}
+            translator = self.providers[provider](source=source, target=target, client=client, **options)
+            self._translators[key] = translator
+        return translator
+
+    async def translate(self, text: str, source: str, target: str, provider: str = 'google') -> str:
+        """Translate one chunk without blocking the event loop"""
+        if provider not in self.providers:
+            return await asyncio.to_thread(self._translate_sync, text, source, target, provider)
+        return await self.get(source, target, provider).translate_async(text)
+
+    def _translate_sync(self, text: str, source: str, target: str, provider: str) -> str:
+        # Sync clients keep per-call state: each call gets its own checked-out instance
+        with self.sync_pool.translator(source, target, provider) as translator:
+            return translator.translate(text)
+
+    def register_provider(self, provider: str, factory):
+        """
+        Register (or replace) the client factory for a provider; ``None``
+        unregisters it, so the provider is served by the sync pool. Returns the
+        previous factory so callers can restore it.
+        """
+        previous = self.providers.pop(provider, None)
+        if factory is not None:
+            self.providers[provider] = factory
+        for key in [key for key in self._translators if key[0] == provider]:
+            del self._translators[key]
+        return previous
+
+    async def close(self):
+        """Close pooled connections (call from the owning event loop)"""
+        client, self._client, self._loop = self._client, None, None
+        self._translators.clear()
+        if client is not None:
+            await client.close()
+
+
+# Process-wide pool shared by the async service
+async_translator_pool = AsyncTranslatorPool()
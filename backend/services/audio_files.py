@@ -0,0 +1,139 @@
+"""
+Pronunciation audio files for glossary terms (``/audio/<name>.mp3``).
+
+Most clips are small and requested over and over, often by phones on
+flaky connections that resume and seek. So each response:
+- carries a content-hash ETag and is cacheable for a long time. A URL with
+  ``?v=<etag>`` is marked immutable for a year, and plain URLs get a day
+  before they must revalidate.
+- answers ``If-None-Match`` with 304, and ``Range``/``If-Range`` with 206
+  (through werkzeug's conditional responses).
+- for files on disk, goes out through ``wsgi.file_wrapper``, i.e.
+  ``sendfile(2)`` under gunicorn. ``USE_X_SENDFILE`` hands it to the
+  proxy instead.
+
+The ETag is a BLAKE2b digest computed over an ``mmap`` of the file, so
+hashing a clip never copies it into the Python heap. Digests are cached per
+(inode, mtime, size) and recomputed when a file is replaced. Clips up to
+``HOT_FILE_MAX_BYTES`` are also kept in a byte-bounded LRU, so hot
+files are served from memory without a filesystem round trip.
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from werkzeug.security import safe_join
+
+from backend.services.metrics import record_cache
+
+AUDIO_DIR = os.environ.get('AUDIO_DIR') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'public', 'audio')
+AUDIO_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.m4a': 'audio/mp4',
+    '.ogg': 'audio/ogg',
+    '.opus': 'audio/ogg',
+    '.wav': 'audio/wav',
+}
+HOT_CACHE_BYTES = 16 * 1024 * 1024
+HOT_FILE_MAX_BYTES = 512 * 1024
+MAX_AGE = 24 * 60 * 60  # plain URLs: revalidate daily
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60  # ?v=<etag> URLs never change
+
+
+class AudioFile(NamedTuple):
+    path: str
+    mimetype: str
+    size: int
+    mtime: float
+    etag: str
+    data: Optional[bytes]  # contents for hot-cached files, else None
+
+
+def content_etag(path: str, size: int) -> str:
+    if size == 0:
+        return hashlib.blake2b(digest_size=12).hexdigest()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        return hashlib.blake2b(mapped, digest_size=12).hexdigest()
+
+
+class AudioLibrary:
+    """Resolves audio names to files, with cached ETags and a hot-file cache"""
+
+    def __init__(self, directory: str = AUDIO_DIR, hot_cache_bytes: int = HOT_CACHE_BYTES,
+                 hot_file_max_bytes: int = HOT_FILE_MAX_BYTES):
+        self.directory = directory
+        self.hot_cache_bytes = hot_cache_bytes
+        self.hot_file_max_bytes = hot_file_max_bytes
+        self._lock = threading.Lock()
+        # path -> (identity, value); identity is (inode, mtime_ns, size), so a replaced file misses
+        self._etags: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._hot: 'OrderedDict[str, Tuple[Tuple[int, int, int], bytes]]' = OrderedDict()
+        self._hot_bytes = 0
+
+    def resolve(self, name: str) -> Optional[AudioFile]:
+        """The audio file for a URL name, or None when it is missing, unsafe or not audio"""
+        mimetype = AUDIO_TYPES.get(os.path.splitext(name)[1].lower())
+        path = safe_join(self.directory, name) if mimetype else None
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not os.path.isfile(path):
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            etag = self._etags.get(path)
+            hot = self._hot.get(path)
+            if hot is not None and hot[0] == identity:
+                self._hot.move_to_end(path)
+        etag = etag[1] if etag is not None and etag[0] == identity else None
+        data = hot[1] if hot is not None and hot[0] == identity else None
+        if stat.st_size <= self.hot_file_max_bytes:
+            record_cache('audio_hot_files', data is not None)
+            if data is None:
+                data = self._remember(path, identity)
+        if etag is None:
+            if data is not None:
+                etag = hashlib.blake2b(data, digest_size=12).hexdigest()
+            else:
+                etag = content_etag(path, stat.st_size)
+            with self._lock:
+                self._etags[path] = (identity, etag)
+        return AudioFile(path, mimetype, stat.st_size, stat.st_mtime, etag, data)
+
+    def _remember(self, path: str, identity: Tuple[int, int, int]) -> Optional[bytes]:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) != identity[2]:  # replaced while reading; serve from disk this time
+            return None
+        with self._lock:
+            previous = self._hot.pop(path, None)
+            if previous is not None:
+                self._hot_bytes -= len(previous[1])
+            self._hot[path] = (identity, data)
+            self._hot_bytes += len(data)
+            while self._hot_bytes > self.hot_cache_bytes:
+                _, (_, evicted) = self._hot.popitem(last=False)
+                self._hot_bytes -= len(evicted)
+        return data
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hot_files': len(self._hot), 'hot_bytes': self._hot_bytes, 'etags': len(self._etags)}
+
+    def clear(self):
+        with self._lock:
+            self._etags.clear()
+            self._hot.clear()
+            self._hot_bytes = 0
+
+
+audio_library = AudioLibrary()
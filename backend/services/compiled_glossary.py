@@ -0,0 +1,236 @@
+"""
+Memory-mapped compiled glossary.
+
+An in-process copy of the glossary is duplicated in every worker process.
+``python compile_glossary.py`` instead writes the verified translations to
+one read-only binary file. Every worker ``mmap``s that file, so lookups
+read the OS page cache directly: one physical copy, shared by all
+processes, and nothing is deserialized up front.
+
+Layout (little-endian)::
+
+    header   magic 'CLGLOSS1', schema, entry count, entries offset, pool offset, built_at
+    entries  fixed-size records sorted by key: key (offset, length), id, then
+             (offset, length) for english, translated, explanation, category, audio_url
+    pool     UTF-8 strings; repeated values (categories, explanations) are stored once
+
+A key is ``language + NUL + case-folded, whitespace-collapsed English``.
+An exact lookup is a binary search over the entries (O(log n)
+``struct.unpack_from`` calls), followed by decoding the matching record.
+
+The compiler writes a temporary file in the same directory and
+``os.replace``s it over the old one. Readers notice the new inode
+(checked at most once a second) and map the new file. Lookups already in
+progress keep reading the old mapping. The API schedules a debounced
+recompile after writes that change verified content, but only once a
+compiled file exists, i.e. the deployment opted in.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+
+from backend.services.glossary_export import export_query, iter_rows
+
+logger = logging.getLogger(__name__)
+
+GLOSSARY_PATH = os.environ.get('GLOSSARY_BINARY_PATH') or os.path.join(
+    os.path.dirname(os.path.dirname(__file__)), 'data', 'glossary.bin')
+MAGIC = b'CLGLOSS1'
+SCHEMA = 1
+HEADER = struct.Struct('<8sIIIIQ')  # magic, schema, count, entries offset, pool offset, built_at
+ENTRY = struct.Struct('<13I')  # key, id, english, translated, explanation, category, audio_url
+VALUE_FIELDS = ('english', 'translated', 'explanation', 'category', 'audio_url')
+CHECK_INTERVAL = 1.0  # seconds between checks for a swapped file
+RECOMPILE_DELAY = 2.0  # seconds to coalesce writes before recompiling
+
+
+def entry_key(english: str, language: str) -> bytes:
+    return f"{language}\0{' '.join(english.split()).casefold()}".encode('utf-8')
+
+
+class CompileResult(NamedTuple):
+    entries: int
+    bytes: int
+    seconds: float
+
+
+def compile_glossary(engine: Engine, path: str = GLOSSARY_PATH) -> CompileResult:
+    """Write verified translations to ``path`` and atomically replace the previous file"""
+    start = time.perf_counter()
+    records: Dict[bytes, Tuple] = {}
+    for row in iter_rows(engine, export_query(verified=True)):
+        key = entry_key(row['english'], row['language'])
+        if key not in records:  # terms differing only in case or spacing: the oldest wins
+            records[key] = (row['id'],) + tuple(row[field] or '' for field in VALUE_FIELDS)
+
+    pool = bytearray()
+    interned: Dict[bytes, Tuple[int, int]] = {}
+
+    def intern(data: bytes) -> Tuple[int, int]:
+        if data not in interned:
+            interned[data] = (len(pool), len(data))
+            pool.extend(data)
+        return interned[data]
+
+    entries = bytearray()
+    for key in sorted(records):
+        term_id, *values = records[key]
+        refs = [*intern(key), term_id]
+        for value in values:
+            refs.extend(intern(value.encode('utf-8')))
+        entries.extend(ENTRY.pack(*refs))
+
+    entries_offset = HEADER.size
+    pool_offset = entries_offset + len(entries)
+    header = HEADER.pack(MAGIC, SCHEMA, len(records), entries_offset, pool_offset, int(time.time()))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.glossary-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(entries)
+            f.write(pool)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    size = HEADER.size + len(entries) + len(pool)
+    return CompileResult(len(records), size, time.perf_counter() - start)
+
+
+class _Mapping(NamedTuple):
+    map: mmap.mmap
+    count: int
+    entries_offset: int
+    pool_offset: int
+    built_at: int
+    identity: Tuple[int, int, int]  # (inode, mtime_ns, size) of the mapped file
+
+
+class CompiledGlossary:
+    """Zero-copy exact lookups in a compiled glossary file"""
+
+    def __init__(self, path: str = GLOSSARY_PATH, check_interval: float = CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mapping: Optional[_Mapping] = None
+        self._checked_at: Optional[float] = None
+
+    def _open(self, identity: Tuple[int, int, int]) -> Optional[_Mapping]:
+        with open(self.path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, schema, count, entries_offset, pool_offset, built_at = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC or schema != SCHEMA:
+            mapped.close()
+            logger.warning(f"Ignoring {self.path}: not a schema {SCHEMA} compiled glossary")
+            return None
+        return _Mapping(mapped, count, entries_offset, pool_offset, built_at, identity)
+
+    def _current(self) -> Optional[_Mapping]:
+        """The current mapping, remapped when the file has been swapped"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self._mapping
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._mapping = None
+                return None
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if self._mapping is None or self._mapping.identity != identity:
+                # The old mapping is left to the GC: lookups in flight may still hold it
+                self._mapping = self._open(identity)
+            return self._mapping
+
+    @property
+    def available(self) -> bool:
+        return self._current() is not None
+
+    def __len__(self) -> int:
+        mapping = self._current()
+        return mapping.count if mapping else 0
+
+    def info(self) -> Dict:
+        mapping = self._current()
+        if mapping is None:
+            return {'available': False, 'path': self.path}
+        return {'available': True, 'path': self.path, 'entries': mapping.count, 'bytes': mapping.identity[2],
+                'built_at': mapping.built_at}
+
+    def lookup(self, english: str, language: str) -> Optional[Dict]:
+        """The verified translation of ``english`` in ``language`` (case- and spacing-insensitive), or None"""
+        mapping = self._current()
+        if mapping is None:
+            return None
+        mapped, pool = mapping.map, mapping.pool_offset
+        key = entry_key(english, language)
+        low, high = 0, mapping.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = mapping.entries_offset + middle * ENTRY.size
+            key_offset, key_length = struct.unpack_from('<II', mapped, offset)
+            candidate = mapped[pool + key_offset:pool + key_offset + key_length]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                refs = ENTRY.unpack_from(mapped, offset)
+                entry = {'id': refs[2], 'language': language}
+                for index, field in enumerate(VALUE_FIELDS):
+                    start, length = pool + refs[3 + 2 * index], refs[4 + 2 * index]
+                    entry[field] = mapped[start:start + length].decode('utf-8') or None
+                return entry
+        return None
+
+
+compiled_glossary = CompiledGlossary()
+
+_schedule_lock = threading.Lock()
+_scheduled: Optional[threading.Timer] = None
+
+
+def schedule_compile(engine: Engine, path: Optional[str] = None, delay: float = RECOMPILE_DELAY) -> bool:
+    """Recompile in the background after ``delay`` seconds (calls in the meantime coalesce).
+
+    ``path`` defaults to the file ``compiled_glossary`` serves. Does nothing until a
+    compiled file exists. Returns whether a compile is pending.
+    """
+    global _scheduled
+    path = path or compiled_glossary.path
+    if not os.path.exists(path):
+        return False
+
+    def run():
+        global _scheduled
+        with _schedule_lock:
+            _scheduled = None
+        try:
+            result = compile_glossary(engine, path)
+            logger.info(f"Compiled glossary: {result.entries} entries, {result.bytes} bytes "
+                        f"in {result.seconds:.2f}s")
+        except Exception as e:
+            logger.error(f"Glossary compile failed: {str(e)}")
+
+    with _schedule_lock:
+        if _scheduled is None:
+            _scheduled = threading.Timer(delay, run)
+            _scheduled.daemon = True
+            _scheduled.start()
+    return True
@@ -0,0 +1,169 @@
+"""
+Database engines, pragmas and the read/write session split.
+
+Under concurrent readers and writers, SQLite's defaults (rollback journal,
+deferred transactions) give ``database is locked`` errors. This module sets
+up SQLite as follows:
+
+- WAL journal mode: readers never wait on the writer.
+- ``synchronous=NORMAL``, a larger page cache, mmap I/O and a
+  ``busy_timeout``, so a writer waits for the lock instead of failing.
+- Write transactions start with ``BEGIN IMMEDIATE``. A deferred transaction
+  that reads and then writes cannot wait for the lock: SQLite fails it at
+  once. Taking the write lock up front avoids that.
+
+Reads go through a separate, explicitly pooled engine in ``query_only``
+mode, with its own session (``database.read_session``). Writes keep the
+Flask-SQLAlchemy session. ``DATABASE_READ_URL`` can point reads at a
+replica on other backends. In-memory SQLite databases are private to their
+connection, so they share one engine and one session.
+
+Routes get sessions from the module-level ``database``. They no longer
+import the app on every call.
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',  # safe with WAL; fsync at checkpoints only
+    'busy_timeout': 5000,  # ms a writer waits for the lock before failing
+    'foreign_keys': 'ON',
+    'temp_store': 'MEMORY',
+    'cache_size': -20000,  # KiB (negative) => ~20 MB page cache per connection
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# Writers serialize on SQLite's single write lock, so a small pool is enough;
+# readers run in parallel under WAL
+WRITE_POOL = {'pool_size': 5, 'max_overflow': 5, 'pool_timeout': 30}
+READ_POOL = {'pool_size': 10, 'max_overflow': 20, 'pool_timeout': 30}
+
+
+def is_sqlite(url) -> bool:
+    return make_url(url).get_backend_name() == 'sqlite'
+
+
+def is_memory_sqlite(url) -> bool:
+    url = make_url(url)
+    return is_sqlite(url) and url.database in (None, '', ':memory:')
+
+
+def engine_options(url, read_only: bool = False) -> Dict:
+    """Explicit pool settings for an engine (``SQLALCHEMY_ENGINE_OPTIONS`` for the write engine)"""
+    if is_memory_sqlite(url):
+        return {}  # Flask-SQLAlchemy uses a StaticPool: one shared connection
+    options = dict(READ_POOL if read_only else WRITE_POOL)
+    if is_sqlite(url):
+        options['connect_args'] = {'check_same_thread': False, 'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000}
+    else:
+        options.update(pool_pre_ping=True, pool_recycle=1800)
+    return options
+
+
+def configure_sqlite(engine: Engine, read_only: bool = False) -> Engine:
+    """Apply the pragmas on every new connection and take over transaction begin"""
+
+    @event.listens_for(engine, 'connect')
+    def _connect(dbapi_connection, connection_record):
+        # Autocommit at the driver level; the 'begin' hook below emits BEGIN itself
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        if read_only:
+            cursor.execute('PRAGMA query_only=ON')
+        cursor.close()
+
+    begin = 'BEGIN' if read_only else 'BEGIN IMMEDIATE'
+
+    @event.listens_for(engine, 'begin')
+    def _begin(connection):
+        connection.exec_driver_sql(begin)
+
+    return engine
+
+
+def create_configured_engine(url, read_only: bool = False) -> Engine:
+    """Standalone engine with the same pool and pragma profile (CLI tools, benchmarks)"""
+    engine = create_engine(url, **engine_options(url, read_only))
+    if is_sqlite(url) and not is_memory_sqlite(url):
+        configure_sqlite(engine, read_only)
+    return engine
+
+
+def ensure_indexes(engine: Engine, metadata) -> List[str]:
+    """Create indexes that ``create_all`` skips because their table already exists; returns the names created"""
+    inspector = inspect(engine)
+    created = []
+    for table in metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            try:
+                index.create(engine)
+                created.append(index.name)
+            except Exception as e:  # e.g. duplicate rows blocking a unique index
+                logger.warning(f"Could not create index {index.name}: {str(e)}")
+    return created
+
+
+class Database:
+    """Write session (Flask-SQLAlchemy's) plus a read-only session on its own engine"""
+
+    def __init__(self):
+        self._db = None
+        self.write_engine: Optional[Engine] = None
+        self.read_engine: Optional[Engine] = None
+        self.read_session: Optional[scoped_session] = None
+
+    def init_app(self, app, db, read_url: Optional[str] = None):
+        """Configure ``db``'s engine and create the read engine; call once after ``SQLAlchemy(app)``"""
+        self._db = db
+        with app.app_context():
+            self.write_engine = db.engine
+        url = self.write_engine.url
+        read_url = read_url or os.environ.get('DATABASE_READ_URL')
+
+        if is_memory_sqlite(url):
+            self.read_engine = self.write_engine
+            self.read_session = db.session
+            return self
+
+        if is_sqlite(url):
+            configure_sqlite(self.write_engine)
+        self.read_engine = create_configured_engine(read_url or url, read_only=True)
+        self.read_session = scoped_session(sessionmaker(bind=self.read_engine, autoflush=False,
+                                                        expire_on_commit=False))
+
+        @app.teardown_appcontext
+        def _remove_read_session(exception=None):
+            self.read_session.remove()
+
+        return self
+
+    @property
+    def engines(self) -> List[Engine]:
+        return [engine for engine in {self.write_engine: None, self.read_engine: None} if engine is not None]
+
+    @property
+    def session(self):
+        """Session for requests that write"""
+        if self._db is None:
+            raise RuntimeError('Database is not initialized; call database.init_app(app, db)')
+        return self._db.session
+
+
+# Initialized by app.py
+database = Database()
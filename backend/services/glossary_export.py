@@ -0,0 +1,125 @@
+"""
+Streaming glossary export.
+
+Rows are read with a server-side cursor (``stream_results`` +
+``yield_per``) through Core, without the ORM identity map. Each row is
+encoded as soon as it arrives, and the output is flushed in ~64 KB chunks
+(optionally through an incremental gzip compressor). Memory stays flat
+however large the ``translations`` table is.
+
+The output uses the ``Translation.to_dict()`` fields. CSV joins tags with
+``|`` and JSON-encodes the list columns, so ``import_glossary.py`` can
+load an export back in.
+
+Used by ``GET /api/translations/export`` and ``python export_glossary.py``.
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from backend.models.Translation import Translation
+from backend.services.glossary_import import CSV_TAG_SEPARATOR
+
+EXPORT_FORMATS = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+EXPORT_BATCH_SIZE = 1000  # rows fetched per cursor round trip
+CHUNK_BYTES = 64 * 1024
+EXPORT_COLUMNS = ('id', 'english', 'translated', 'language', 'explanation', 'category', 'audio_url', 'verified',
+                  'verified_by', 'verified_at', 'usage_count', 'tags', 'difficulty', 'context', 'related_terms',
+                  'feedback', 'created_at', 'updated_at')
+LIST_COLUMNS = ('tags', 'related_terms', 'feedback')
+
+
+def export_query(language: Optional[str] = None, category: Optional[str] = None, verified: Optional[bool] = None):
+    table = Translation.__table__
+    query = select(*(table.c[name] for name in EXPORT_COLUMNS)).order_by(table.c.id)
+    if language:
+        query = query.where(table.c.language == language)
+    if category:
+        query = query.where(table.c.category == category)
+    if verified is not None:
+        query = query.where(table.c.verified == verified)
+    return query
+
+
+def iter_rows(engine: Engine, query, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict]:
+    """Row dicts shaped like ``Translation.to_dict()``, streamed from a server-side cursor"""
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+        for row in result.mappings():
+            record = dict(row)
+            for name in LIST_COLUMNS:
+                record[name] = record[name] or []
+            for name in ('verified_at', 'created_at', 'updated_at'):
+                if isinstance(record[name], datetime):
+                    record[name] = record[name].isoformat()
+            yield record
+
+
+def _buffered(pieces: Iterable[str]) -> Iterator[bytes]:
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= CHUNK_BYTES:
+            yield ''.join(buffer).encode('utf-8')
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def ndjson_chunks(rows: Iterable[Dict]) -> Iterator[bytes]:
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    return _buffered(encoder.encode(row) + '\n' for row in rows)
+
+
+def _csv_lines(rows: Iterable[Dict]) -> Iterator[str]:
+    line = io.StringIO()
+    writer = csv.writer(line, lineterminator='\n')
+
+    def take(values) -> str:
+        writer.writerow(values)
+        text = line.getvalue()
+        line.seek(0)
+        line.truncate()
+        return text
+
+    yield take(EXPORT_COLUMNS)
+    for row in rows:
+        row['tags'] = CSV_TAG_SEPARATOR.join(row['tags'])
+        row['related_terms'] = json.dumps(row['related_terms'])
+        row['feedback'] = json.dumps(row['feedback'], ensure_ascii=False)
+        yield take([row[name] for name in EXPORT_COLUMNS])
+
+
+def csv_chunks(rows: Iterable[Dict]) -> Iterator[bytes]:
+    return _buffered(_csv_lines(rows))
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Incrementally gzip a chunk stream"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+WRITERS = {'ndjson': ndjson_chunks, 'csv': csv_chunks}
+
+
+def export_chunks(engine: Engine, format: str, language: Optional[str] = None, category: Optional[str] = None,
+                  verified: Optional[bool] = None, compress: bool = False,
+                  batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    """Byte chunks of the filtered export"""
+    if format not in WRITERS:
+        raise ValueError(f'Unsupported export format: {format}')
+    chunks = WRITERS[format](iter_rows(engine, export_query(language, category, verified), batch_size))
+    return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,251 @@
+"""
+Bulk glossary import.
+
+Reads NDJSON or CSV one row at a time and validates each row against the
+model enums with set lookups. Valid rows are upserted in batches: one
+``INSERT ... ON CONFLICT (english, language) DO UPDATE`` executemany per
+batch, each batch in its own transaction. A 50k-term glossary therefore
+takes a few dozen statements instead of 50k round trips. Rows that fail
+validation, or whose batch fails to write, are reported by input line
+number; the other rows are still imported. Each batch also rewrites its
+rows' entries in the ``translation_tags`` index, in the same transaction.
+
+Used by ``POST /api/translations/bulk`` and ``python import_glossary.py``.
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+from backend.models.Translation import Translation, LanguageEnum, CategoryEnum, DifficultyEnum
+from backend.services.tags import sync_batch_tags
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = frozenset({'ndjson', 'csv'})
+IMPORT_BATCH_SIZE = 5000  # rows per executemany / transaction
+MAX_REPORTED_ERRORS = 1000
+
+REQUIRED_FIELDS = ('english', 'translated', 'language', 'explanation', 'category')
+OPTIONAL_TEXT_FIELDS = ('audio_url', 'context')
+MAX_LENGTHS = {'english': 500, 'translated': 500, 'audio_url': 500}
+LANGUAGE_VALUES = frozenset(lang.value for lang in LanguageEnum)
+CATEGORY_VALUES = frozenset(cat.value for cat in CategoryEnum)
+DIFFICULTY_VALUES = frozenset(level.value for level in DifficultyEnum)
+# Columns replaced when a row already exists (usage counts and feedback are kept)
+UPSERT_COLUMNS = ('translated', 'explanation', 'category', 'audio_url', 'context', 'difficulty', 'tags',
+                  'verified', 'verified_by', 'verified_at', 'updated_at')
+CSV_TAG_SEPARATOR = '|'
+
+_DIALECT_INSERTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+_NATURAL_KEY = next(index for index in Translation.__table__.indexes
+                    if index.name == 'uq_translations_english_language')
+
+
+class RowError(ValueError):
+    """A row that cannot be imported"""
+
+
+def detect_format(content_type: Optional[str] = None, filename: Optional[str] = None) -> Optional[str]:
+    """'ndjson' or 'csv' from a Content-Type or file name; None if unknown"""
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonl', 'application/json'):
+        return 'ndjson'
+    if content_type in ('text/csv', 'application/csv'):
+        return 'csv'
+    name = (filename or '').lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    if name.endswith('.csv'):
+        return 'csv'
+    return None
+
+
+def open_text(stream: IO[bytes], compressed: bool = False) -> IO[str]:
+    """Wrap a binary stream for line-by-line text reading (optionally gunzipping)"""
+    if compressed:
+        stream = gzip.GzipFile(fileobj=stream, mode='rb')
+    return io.TextIOWrapper(stream, encoding='utf-8', newline='')
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+    """(line number, object or RowError) per non-blank line"""
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, RowError(f'Invalid JSON: {str(e)}')
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Tuple[int, object]]:
+    """(line number, row dict) per CSV record; the first line is the header, tags are '|'-separated"""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        if None in row:
+            yield reader.line_num, RowError('Too many columns')
+            continue
+        if row.get('tags') is not None:
+            row['tags'] = [tag.strip() for tag in row['tags'].split(CSV_TAG_SEPARATOR) if tag.strip()]
+        yield reader.line_num, row
+
+
+READERS = {'ndjson': read_ndjson, 'csv': read_csv}
+
+
+def _bool(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in ('1', 'true', 'yes', 'y')
+    return bool(value)
+
+
+def validate_row(row) -> Dict:
+    """Column values for one input row; raises RowError"""
+    if isinstance(row, RowError):
+        raise row
+    if not isinstance(row, dict):
+        raise RowError('Row must be an object')
+    values = {}
+    for field in REQUIRED_FIELDS:
+        value = row.get(field)
+        if not isinstance(value, str) or not value.strip():
+            raise RowError(f'{field} is required')
+        values[field] = value.strip()
+    for field in OPTIONAL_TEXT_FIELDS:
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            raise RowError(f'{field} must be text')
+        values[field] = (value.strip() or None) if value is not None else None
+    for field, limit in MAX_LENGTHS.items():
+        if values[field] and len(values[field]) > limit:
+            raise RowError(f'{field} is longer than {limit} characters')
+    if values['language'] not in LANGUAGE_VALUES:
+        raise RowError('Invalid language')
+    if values['category'] not in CATEGORY_VALUES:
+        raise RowError('Invalid category')
+    difficulty = row.get('difficulty')
+    if difficulty is None or difficulty == '':
+        difficulty = 'beginner'
+    if not isinstance(difficulty, str) or difficulty not in DIFFICULTY_VALUES:
+        raise RowError('Invalid difficulty')
+    values['difficulty'] = difficulty
+    tags = row.get('tags') or []
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise RowError('tags must be a list of strings')
+    values['tags'] = tags
+    if 'verified' in row and row['verified'] not in (None, ''):
+        values['verified'] = _bool(row['verified'])
+    return values
+
+
+def ensure_natural_key(engine: Engine):
+    """Create the (english, language) unique index on databases created before it existed"""
+    _NATURAL_KEY.create(engine, checkfirst=True)
+
+
+def upsert_statement(engine: Engine):
+    dialect_insert = _DIALECT_INSERTS.get(engine.dialect.name)
+    if dialect_insert is None:
+        raise NotImplementedError(f'Bulk upserts are not supported on {engine.dialect.name}')
+    # Timestamps come from the database clock, so they are not bound and converted for every row
+    stmt = dialect_insert(Translation.__table__).values(created_at=func.current_timestamp(),
+                                                        updated_at=func.current_timestamp())
+    stmt = stmt.on_conflict_do_update(index_elements=[Translation.english, Translation.language],
+                                      set_={column: stmt.excluded[column] for column in UPSERT_COLUMNS})
+    # Row ids come back with the upsert, so the tag index needs no lookup query
+    return stmt.returning(Translation.id, Translation.english, Translation.language)
+
+
+class ImportReport:
+    def __init__(self):
+        self.received = 0
+        self.upserted = 0
+        self.duplicates = 0  # rows superseded by a later row with the same key in their batch
+        self.failed = 0
+        self.errors: List[Dict] = []
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'error': message})
+
+    def to_dict(self) -> Dict:
+        return {
+            'received': self.received,
+            'upserted': self.upserted,
+            'duplicates': self.duplicates,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.upserted / self.seconds, 1) if self.seconds else None,
+        }
+
+
+def import_rows(engine: Engine, rows: Iterable[Tuple[int, object]], user_id: Optional[int] = None,
+                batch_size: int = IMPORT_BATCH_SIZE) -> ImportReport:
+    """Validate and upsert ``(line number, row)`` pairs in batched transactions"""
+    report = ImportReport()
+    stmt = upsert_statement(engine)
+    ensure_natural_key(engine)
+    batch: Dict[Tuple[str, str], Dict] = {}  # natural key -> values; a later duplicate wins
+    lines: Dict[Tuple[str, str], int] = {}
+    verified_at = datetime.utcnow()
+
+    def flush():
+        if not batch:
+            return
+        try:
+            with engine.begin() as conn:
+                upserted = conn.execute(stmt, list(batch.values())).all()
+                sync_batch_tags(conn, upserted, batch)
+            report.upserted += len(batch)
+        except Exception as e:
+            logger.error(f"Bulk import batch failed: {str(e)}")
+            for line in lines.values():
+                report.error(line, f'Database error: {str(e)}')
+        batch.clear()
+        lines.clear()
+
+    for line, row in rows:
+        report.received += 1
+        try:
+            values = validate_row(row)
+        except RowError as e:
+            report.error(line, str(e))
+            continue
+        verified = values.pop('verified', True)
+        values.update(verified=verified, verified_by=user_id if verified else None,
+                      verified_at=verified_at if verified else None)
+        key = (values['english'], values['language'])
+        if key in batch:
+            report.duplicates += 1
+        batch[key] = values
+        lines[key] = line
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    report.seconds = time.perf_counter() - report.started
+    return report
+
+
+def import_stream(engine: Engine, stream: IO[bytes], format: str, user_id: Optional[int] = None,
+                  compressed: bool = False, batch_size: int = IMPORT_BATCH_SIZE) -> ImportReport:
+    """Import an NDJSON or CSV byte stream"""
+    if format not in IMPORT_FORMATS:
+        raise ValueError(f'Unsupported import format: {format}')
+    return import_rows(engine, READERS[format](open_text(stream, compressed)), user_id, batch_size)
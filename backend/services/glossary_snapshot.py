@@ -0,0 +1,402 @@
+"""
+In-memory columnar snapshot of the glossary.
+
+The glossary is read-mostly, so list queries (filters, facets, default
+ordering, paging) can be answered from memory instead of SQLite:
+
+- Rows: one ``SnapshotRow`` (``__slots__``, values already in
+  ``to_dict()`` form) per translation, at a fixed position.
+- Sort columns: usage counts (``array('q')``) and created_at timestamps
+  (``array('d')``). ``order`` keeps the ``(-usage, -created, id,
+  position)`` keys sorted, so the default order is a slice and a usage
+  bump is a bisect plus an insort.
+- Bitsets: one Python int per column value (language, category, verified,
+  difficulty and each tag), with bit *i* set for the row at position *i*.
+  Filters are ``&``/``|`` of ints, and counts are ``int.bit_count()``.
+
+Freshness:
+
+- The snapshot is loaded on first use.
+- Writes made by this process are applied with ``apply()`` after commit.
+- Rows changed elsewhere (bulk imports, other workers) are picked up every
+  ``REFRESH_SECONDS`` by a delta query on the indexed ``updated_at``.
+- Rows in the delta whose ``updated_at`` is unchanged are skipped.
+- When the delta is empty, a row-count mismatch (deletes) triggers a
+  full reload.
+
+Writers build a new version of these columns and publish it when done;
+readers never take the lock, so a reload does not hold up list queries.
+
+Row count and approximate memory footprint are exported as the
+``civiclink_glossary_snapshot`` gauge.
+"""
+
+import heapq
+import logging
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from functools import reduce
+from operator import and_, or_
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from backend.models.Translation import Translation, normalize_tags
+from backend.services.facets import FACET_FIELDS, facet_key, sorted_bucket
+from backend.services.glossary_export import EXPORT_COLUMNS, export_query, iter_rows
+from backend.services.metrics import GLOSSARY_SNAPSHOT_SIZE
+from backend.services.related_terms import SUMMARY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+BITSET_FIELDS = FACET_FIELDS
+REFRESH_SECONDS = 5.0
+# Delta queries look back this far past the newest updated_at seen, for commits that land out of order
+CLOCK_SKEW = timedelta(seconds=2)
+SEARCH_FIELDS = ('english', 'translated', 'explanation')
+
+
+# Low-cardinality strings share one object per value instead of one per row
+INTERNED_FIELDS = ('language', 'category', 'difficulty')
+
+
+class SnapshotRow:
+    """One translation in ``Translation.to_dict()`` form; list columns are kept as tuples"""
+    __slots__ = EXPORT_COLUMNS
+
+    def __init__(self, values: Dict):
+        for name in EXPORT_COLUMNS:
+            value = values[name]
+            if isinstance(value, (list, tuple)):
+                value = tuple(sys.intern(item) if isinstance(item, str) else item for item in value) if value else ()
+            elif name in INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(self, name, value)
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in EXPORT_COLUMNS}
+
+
+def _timestamp(value: Optional[str]) -> float:
+    return datetime.fromisoformat(value).timestamp() if value else 0.0
+
+
+def _positions(mask: int) -> List[int]:
+    """Set bit positions, lowest first"""
+    bits = bin(mask)[:1:-1]
+    positions = []
+    position = bits.find('1')
+    while position != -1:
+        positions.append(position)
+        position = bits.find('1', position + 1)
+    return positions
+
+
+def _mask(positions: Iterable[int], size: int) -> int:
+    bitmap = bytearray((size + 7) // 8)
+    for position in positions:
+        bitmap[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bitmap, 'little')
+
+
+class _Columns:
+    """
+    One version of the snapshot's rows, sort keys and bitsets. A published
+    version is never modified: writers change a ``copy()`` and publish that.
+    """
+    __slots__ = ('rows', 'positions', 'usage', 'created', 'order', 'bits', 'tag_bits', 'all')
+
+    def __init__(self):
+        self.rows: List[SnapshotRow] = []
+        self.positions: Dict[int, int] = {}
+        self.usage = array('q')
+        self.created = array('d')
+        self.order: List[Tuple] = []
+        self.bits: Dict[str, Dict[object, int]] = {field: {} for field in BITSET_FIELDS}
+        self.tag_bits: Dict[str, int] = {}
+        self.all = 0
+
+    def copy(self) -> '_Columns':
+        """Copy of the containers; rows, keys and bitset ints are immutable and shared"""
+        columns = _Columns()
+        columns.rows = list(self.rows)
+        columns.positions = dict(self.positions)
+        columns.usage = array('q', self.usage)
+        columns.created = array('d', self.created)
+        columns.order = list(self.order)
+        columns.bits = {field: dict(bitsets) for field, bitsets in self.bits.items()}
+        columns.tag_bits = dict(self.tag_bits)
+        columns.all = self.all
+        return columns
+
+    def key(self, position: int) -> Tuple:
+        return (-self.usage[position], -self.created[position], self.rows[position].id, position)
+
+    def set_bits(self, position: int, row: SnapshotRow, on: bool):
+        bit = 1 << position
+        groups = [(self.bits[field], getattr(row, field)) for field in BITSET_FIELDS]
+        groups.extend((self.tag_bits, tag) for tag in normalize_tags(row.tags))
+        for bitsets, value in groups:
+            if on:
+                bitsets[value] = bitsets.get(value, 0) | bit
+            else:
+                remaining = bitsets.get(value, 0) & ~bit
+                if remaining:
+                    bitsets[value] = remaining
+                else:
+                    bitsets.pop(value, None)
+
+    def upsert(self, row: SnapshotRow):
+        """Add or replace one row in place (incremental updates on an unpublished copy)"""
+        position = self.positions.get(row.id)
+        if position is None:
+            position = len(self.rows)
+            self.rows.append(row)
+            self.positions[row.id] = position
+            self.usage.append(row.usage_count or 0)
+            self.created.append(_timestamp(row.created_at))
+            self.all |= 1 << position
+        else:
+            del self.order[bisect_left(self.order, self.key(position))]
+            self.set_bits(position, self.rows[position], on=False)
+            self.rows[position] = row
+            self.usage[position] = row.usage_count or 0
+            self.created[position] = _timestamp(row.created_at)
+        self.set_bits(position, row, on=True)
+        insort(self.order, self.key(position))
+
+    def search(self, mask: int, search: str) -> int:
+        needle = search.lower()
+        rows = self.rows
+        matches = [position for position in _positions(mask)
+                   if any(needle in (getattr(rows[position], field) or '').lower() for field in SEARCH_FIELDS)]
+        return _mask(matches, len(rows))
+
+    def page(self, mask: int, total: int, offset: int, limit: int) -> List[SnapshotRow]:
+        wanted = offset + limit
+        if offset >= total:
+            return []
+        if mask == self.all:
+            keys = self.order[offset:wanted]
+        elif total <= len(self.rows) // 16:
+            # Sparse: rank only the matching rows
+            keys = heapq.nsmallest(wanted, (self.key(position) for position in _positions(mask)))[offset:]
+        else:
+            # Dense: walk the global order and keep matches
+            bitmap = mask.to_bytes((len(self.rows) + 7) // 8, 'little')
+            keys = []
+            for key in self.order:
+                position = key[-1]
+                if bitmap[position >> 3] >> (position & 7) & 1:
+                    keys.append(key)
+                    if len(keys) == wanted:
+                        break
+            keys = keys[offset:]
+        return [self.rows[key[-1]] for key in keys]
+
+
+class GlossarySnapshot:
+    """
+    Array- and bitset-backed copy of the translations table.
+
+    Writers (load, refresh, apply) are serialized by ``_lock`` and publish a
+    new ``_Columns`` version when done. Readers take the published version
+    with one attribute read and work on it without the lock, so list queries
+    run in parallel and never wait for a reload.
+    """
+
+    def __init__(self, refresh_seconds: float = REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._reset(None)
+
+    def _reset(self, engine: Optional[Engine]):
+        self._engine = engine
+        self._columns = _Columns()
+        self._watermark: Optional[datetime] = None
+        self._checked_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._engine is not None
+
+    @property
+    def rows(self) -> List[SnapshotRow]:
+        return self._columns.rows
+
+    # -- maintenance --
+
+    def _advance_watermark(self, updated_at: Optional[str]):
+        if updated_at:
+            updated_at = datetime.fromisoformat(updated_at)
+            if self._watermark is None or updated_at > self._watermark:
+                self._watermark = updated_at
+
+    def _upsert(self, columns: _Columns, values: Dict):
+        """Add or replace one row of an unpublished copy; caller holds the lock"""
+        row = SnapshotRow(values)
+        columns.upsert(row)
+        self._advance_watermark(row.updated_at)
+
+    def load(self, engine: Engine):
+        """Full (re)load from ``engine``; sort keys and bitsets are built in bulk, then published"""
+        with self._lock:
+            start = time.perf_counter()
+            self._watermark = None
+            columns = _Columns()
+            rows = columns.rows
+            groups: Dict[str, Dict[object, List[int]]] = {field: {} for field in BITSET_FIELDS}
+            tag_groups: Dict[str, List[int]] = {}
+            for position, values in enumerate(iter_rows(engine, export_query())):
+                row = SnapshotRow(values)
+                rows.append(row)
+                columns.positions[row.id] = position
+                columns.usage.append(row.usage_count or 0)
+                columns.created.append(_timestamp(row.created_at))
+                for field in BITSET_FIELDS:
+                    groups[field].setdefault(getattr(row, field), []).append(position)
+                for tag in normalize_tags(row.tags):
+                    tag_groups.setdefault(tag, []).append(position)
+                self._advance_watermark(row.updated_at)
+            size = len(rows)
+            columns.order = sorted(columns.key(position) for position in range(size))
+            columns.bits = {field: {value: _mask(positions, size) for value, positions in values.items()}
+                            for field, values in groups.items()}
+            columns.tag_bits = {tag: _mask(positions, size) for tag, positions in tag_groups.items()}
+            columns.all = (1 << size) - 1
+            self._engine, self._columns = engine, columns
+            self._checked_at = time.monotonic()
+            stats = self.stats()
+        logger.info(f"Glossary snapshot loaded: {stats['rows']} rows, {stats['bytes'] / 1e6:.1f} MB "
+                    f"in {time.perf_counter() - start:.2f}s")
+
+    def refresh(self, engine: Engine):
+        """Load on first use, then apply rows changed since the last check (at most every ``refresh_seconds``)"""
+        # Another thread is already loading or refreshing: serve the published version meanwhile
+        if not self._lock.acquire(blocking=not self.loaded):
+            return
+        try:
+            if self._engine is not engine:
+                self.load(engine)
+                return
+            now = time.monotonic()
+            if self._checked_at is not None and now - self._checked_at < self.refresh_seconds:
+                return
+            self._checked_at = now
+            query = export_query()
+            if self._watermark is not None:
+                query = query.where(Translation.updated_at >= self._watermark - CLOCK_SKEW)
+            current, columns = self._columns, None
+            for values in iter_rows(engine, query):
+                # The skew window returns the latest writes on every check; skip the ones already applied
+                position = current.positions.get(values['id'])
+                if position is not None and current.rows[position].updated_at == values['updated_at']:
+                    continue
+                if columns is None:
+                    columns = current.copy()
+                self._upsert(columns, values)
+            if columns is None:
+                with engine.connect() as conn:
+                    count = conn.execute(select(func.count(Translation.id))).scalar()
+                if count != len(current.rows):  # rows were deleted
+                    self.load(engine)
+                    return
+            else:
+                self._columns = columns
+            GLOSSARY_SNAPSHOT_SIZE.labels('rows').set(len(self._columns.rows))
+        finally:
+            self._lock.release()
+
+    def apply(self, translation: Translation):
+        """Apply a committed write from this process"""
+        with self._lock:
+            if self.loaded:
+                columns = self._columns.copy()
+                self._upsert(columns, translation.to_dict())
+                self._columns = columns
+
+    def expire(self):
+        """Check for changed rows on the next ``refresh()``"""
+        with self._lock:
+            self._checked_at = None
+
+    # -- queries --
+
+    def query(self, language: Optional[str] = None, category: Optional[str] = None,
+              verified: Optional[bool] = None, tags: Iterable[str] = (), tag_match: str = 'all',
+              search: str = '', page: int = 1, limit: int = 20,
+              facets: bool = False) -> Tuple[List[SnapshotRow], int, Optional[Dict]]:
+        """(page of rows in usage/created order, total, facet counts or None) for the list filters"""
+        columns = self._columns  # published versions are immutable: no lock needed
+        mask = columns.all
+        for field, value in (('language', language), ('category', category), ('verified', verified)):
+            if value is not None:
+                mask &= columns.bits[field].get(value, 0)
+        tags = list(tags)
+        if tags:
+            mask &= reduce(and_ if tag_match == 'all' else or_, (columns.tag_bits.get(tag, 0) for tag in tags))
+        if search and mask:
+            mask = columns.search(mask, search)
+        total = mask.bit_count()
+        rows = columns.page(mask, total, max(0, (page - 1) * limit), limit)
+        counts = None
+        if facets:
+            counts = {}
+            for field in FACET_FIELDS:
+                bucket = {}
+                for value, bits in columns.bits[field].items():
+                    count = (mask & bits).bit_count()
+                    if value is not None and count:
+                        bucket[facet_key(value)] = count
+                counts[field] = sorted_bucket(bucket)
+        return rows, total, counts
+
+    def summaries(self, ids: Iterable[int]) -> Dict[int, Dict]:
+        """id -> related-term summary (see ``related_terms.load_summaries``)"""
+        columns = self._columns
+        return {term_id: {field: getattr(columns.rows[columns.positions[term_id]], field) for field in SUMMARY_FIELDS}
+                for term_id in set(ids) if term_id in columns.positions}
+
+    def stats(self) -> Dict:
+        """Writers build a new version of these columns and publish it when done;
+readers never take the lock, so a reload does not hold up list queries.
+
+Row count and approximate memory footprint (also exported as a gauge)"""
+        columns = self._columns
+        seen = set()
+        size = 0
+
+        def sizeof(value):
+            nonlocal size
+            if id(value) not in seen:
+                seen.add(id(value))
+                size += sys.getsizeof(value)
+
+        for container in (columns.rows, columns.positions, columns.usage, columns.created, columns.order,
+                          columns.tag_bits, *columns.bits.values()):
+            sizeof(container)
+        for key in columns.order:
+            sizeof(key)
+        for row in columns.rows:
+            sizeof(row)
+            for name in EXPORT_COLUMNS:
+                value = getattr(row, name)
+                sizeof(value)
+                if isinstance(value, (list, tuple)):
+                    for item in value:
+                        sizeof(item)
+        for bitsets in (columns.tag_bits, *columns.bits.values()):
+            for bits in bitsets.values():
+                sizeof(bits)
+        stats = {'rows': len(columns.rows), 'bytes': size}
+        GLOSSARY_SNAPSHOT_SIZE.labels('rows').set(stats['rows'])
+        GLOSSARY_SNAPSHOT_SIZE.labels('bytes').set(stats['bytes'])
+        return stats
+
+
+glossary_snapshot = GlossarySnapshot()
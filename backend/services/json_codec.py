@@ -0,0 +1,136 @@
+"""
+Compact JSON responses and gzip bodies for the translation APIs.
+
+A translation result echoes ``original_text``, which roughly doubles the
+payload for a large document. A client that sends ``"compact": true`` gets
+the result without the echoed input, serialized with ``orjson`` when it is
+installed (stdlib ``json`` with compact separators otherwise).
+
+Responses of at least ``GZIP_MIN_BYTES`` are gzip-compressed when the client
+sends ``Accept-Encoding: gzip``. Request bodies sent with
+``Content-Encoding: gzip`` are decompressed, up to ``MAX_REQUEST_BYTES``.
+"""
+
+import gzip
+import json
+import zlib
+from typing import Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+GZIP_MIN_BYTES = 1024  # smaller bodies are not worth compressing
+GZIP_LEVEL = 6
+MAX_REQUEST_BYTES = 10 * 1024 * 1024  # decompressed request body limit
+ECHOED_FIELDS = ('original_text',)
+JSON_CONTENT_TYPE = 'application/json'
+
+
+class RequestBodyError(ValueError):
+    """Request body could not be decoded (bad gzip, too large, invalid JSON)"""
+
+
+class RequestBodyTooLarge(RequestBodyError):
+    """Request body (or its decompressed form) is over the size limit"""
+
+
+def dumps(payload) -> bytes:
+    """Serialize to compact UTF-8 JSON with the fastest available encoder"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compact_result(result: Dict) -> Dict:
+    """A translation result without the fields that echo the request back"""
+    return {key: value for key, value in result.items() if key not in ECHOED_FIELDS}
+
+
+def wants_compact(data: Optional[Dict]) -> bool:
+    return bool(data) and data.get('compact') is True
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Parse an Accept-Encoding header value (``gzip;q=0`` refuses)"""
+    for item in (accept_encoding or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        if coding.strip().lower() in ('gzip', '*'):
+            quality = params.strip()
+            if quality.startswith('q='):
+                try:
+                    return float(quality[2:]) > 0
+                except ValueError:
+                    return False
+            return True
+    return False
+
+
+def maybe_gzip(body: bytes, accept_encoding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """(body, Content-Encoding) for a response, gzipped if accepted and large enough"""
+    if len(body) >= GZIP_MIN_BYTES and accepts_gzip(accept_encoding):
+        return gzip.compress(body, compresslevel=GZIP_LEVEL), 'gzip'
+    return body, None
+
+
+def decode_body(body: bytes, content_encoding: Optional[str]) -> bytes:
+    """Undo a request's Content-Encoding (identity or gzip), capped at MAX_REQUEST_BYTES"""
+    encoding = (content_encoding or 'identity').strip().lower()
+    if encoding == 'identity':
+        return body
+    if encoding != 'gzip':
+        raise RequestBodyError(f'Unsupported Content-Encoding: {encoding}')
+    decompressor = zlib.decompressobj(wbits=31)
+    try:
+        data = decompressor.decompress(body, MAX_REQUEST_BYTES)
+    except zlib.error as e:
+        raise RequestBodyError(f'Invalid gzip body: {str(e)}')
+    if decompressor.unconsumed_tail:
+        raise RequestBodyTooLarge('Request body too large')
+    if not decompressor.eof:
+        # Cut off before the gzip trailer: the CRC and length were never checked
+        raise RequestBodyError('Truncated gzip body')
+    return data
+
+
+def load_json_body(body: bytes, content_encoding: Optional[str] = None):
+    """Decode and parse a JSON request body; None when empty"""
+    data = decode_body(body, content_encoding)
+    if not data:
+        return None
+    try:
+        return json.loads(data)
+    except ValueError as e:
+        raise RequestBodyError(f'Invalid JSON: {str(e)}')
+
+
+def get_request_json():
+    """Flask: ``request.get_json()`` that also accepts gzip-compressed bodies; None if unparseable"""
+    from flask import request
+
+    if not request.headers.get('Content-Encoding'):
+        return request.get_json(silent=True)
+    try:
+        return load_json_body(request.get_data(cache=False), request.headers['Content-Encoding'])
+    except RequestBodyError:
+        return None
+
+
+def json_response(payload, status: int = 200, compact: bool = False):
+    """
+    Flask JSON response. ``compact`` drops echoed input and uses the fast
+    encoder; either way the body is gzipped when the client accepts it.
+    """
+    from flask import current_app, request
+
+    if compact:
+        body = dumps(compact_result(payload))
+    else:
+        body = current_app.json.dumps(payload).encode('utf-8')
+    body, encoding = maybe_gzip(body, request.headers.get('Accept-Encoding'))
+    response = current_app.response_class(body, status=status, mimetype=JSON_CONTENT_TYPE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
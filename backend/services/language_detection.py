@@ -0,0 +1,367 @@
+"""
+Offline source-language detection.
+
+Resolves the source language locally so translation calls can pass an explicit
+source instead of ``'auto'`` and skip the provider entirely when the text is
+already in the target language. Detection is two-step:
+
+1. Unicode-script classification. Most scripts map to a single supported
+   language (Hangul -> ko, Thai -> th, ...), with marker letters used to split
+   shared scripts (Han + kana -> ja, Arabic letters specific to Persian/Urdu).
+2. For Latin script, cosine similarity of character trigram profiles built
+   from the small civic corpora below. The best profile must match in absolute
+   terms (``MIN_SIMILARITY``) and beat the runner-up by ``MIN_MARGIN``.
+   Otherwise the language is left undetermined, as is Latin text with fewer
+   than ``MIN_LATIN_LETTERS`` letters: a single word such as "Vote" is
+   spelled the same in several languages. Profiles of Latin-script
+   languages outside the registry (``_UNSUPPORTED_LATIN_SAMPLES``) catch
+   close relatives such as Catalan: if one of them wins, the result is
+   undetermined instead of the nearest supported language.
+
+Results are cached per text hash, so repeated texts cost one dict lookup.
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from backend.services.metrics import record_cache
+
+# Only the head of long documents is inspected; it is plenty for a verdict
+SAMPLE_CHARS = 2000
+# Below this confidence callers should fall back to provider auto-detection
+MIN_CONFIDENCE = 0.6
+# Skipping the provider (text already in the target language) needs more: a wrong
+# verdict there returns the input untranslated
+SKIP_CONFIDENCE = 0.9
+SKIP_SIMILARITY = 0.4
+# Latin script: minimum cosine similarity to the best profile, and its minimum
+# relative lead over the second best. Profiles include short civic questions, so a
+# five-word question scores around 0.3
+MIN_SIMILARITY = 0.15
+MIN_MARGIN = 0.1
+# Shorter Latin text is left undetermined
+MIN_LATIN_LETTERS = 10
+CACHE_SIZE = 4096
+
+
+class Detection(NamedTuple):
+    language: Optional[str]  # ISO code, or None if undetermined
+    confidence: float  # 0.0 - 1.0
+    script: str
+    elapsed_ms: float
+    cached: bool = False
+    similarity: float = 1.0  # Latin script: cosine similarity to the best profile
+
+    @property
+    def skips_provider(self) -> bool:
+        """Sure enough to return the text untranslated when it matches the target language"""
+        return self.language is not None and self.confidence >= SKIP_CONFIDENCE and \
+            self.similarity >= SKIP_SIMILARITY
+
+
+# Unicode block ranges -> script name
+_SCRIPT_RANGES = [
+    (0x0041, 0x024F, 'latin'),
+    (0x1E00, 0x1EFF, 'latin'),  # Latin Extended Additional (Vietnamese)
+    (0x0370, 0x03FF, 'greek'),
+    (0x0400, 0x04FF, 'cyrillic'),
+    (0x0590, 0x05FF, 'hebrew'),
+    (0x0600, 0x06FF, 'arabic'),
+    (0x0750, 0x077F, 'arabic'),
+    (0x0900, 0x097F, 'devanagari'),
+    (0x0980, 0x09FF, 'bengali'),
+    (0x0A00, 0x0A7F, 'gurmukhi'),
+    (0x0A80, 0x0AFF, 'gujarati'),
+    (0x0B80, 0x0BFF, 'tamil'),
+    (0x0C00, 0x0C7F, 'telugu'),
+    (0x0E00, 0x0E7F, 'thai'),
+    (0x1200, 0x137F, 'ethiopic'),
+    (0x1100, 0x11FF, 'hangul'),
+    (0x3040, 0x309F, 'kana'),
+    (0x30A0, 0x30FF, 'kana'),
+    (0x3400, 0x4DBF, 'han'),
+    (0x4E00, 0x9FFF, 'han'),
+    (0xAC00, 0xD7AF, 'hangul'),
+]
+
+# Scripts used by exactly one supported language
+_SCRIPT_LANGUAGES = {
+    'greek': 'el',
+    'hebrew': 'he',
+    'devanagari': 'hi',
+    'bengali': 'bn',
+    'gurmukhi': 'pa',
+    'gujarati': 'gu',
+    'tamil': 'ta',
+    'telugu': 'te',
+    'thai': 'th',
+    'ethiopic': 'am',
+    'hangul': 'ko',
+    'kana': 'ja',
+}
+
+_PERSIAN_MARKERS = frozenset('پچژگکی')
+_URDU_MARKERS = frozenset('ٹڈڑںےھ')
+_BULGARIAN_MARKERS = frozenset('ъщ')
+_RUSSIAN_MARKERS = frozenset('ыэё')
+
+# Small civic-domain corpora used to build Latin-script trigram profiles
+_LATIN_SAMPLES = {
+    'en': (
+        "Voter registration is the process of signing up to vote in elections. You must register "
+        "before you can cast a ballot. The requirements vary by state, but most states accept a "
+        "driver's license, state ID, or passport as identification. Early voting allows you to vote "
+        "before Election Day at designated locations. Absentee ballots let you vote by mail if you "
+        "cannot go to a polling place. Check the deadlines and find where you can vote with the "
+        "information on this page and what documents you need to bring with you. "
+        "Where can I find my polling place? When is the deadline to register to vote? How do I "
+        "check my registration status? Can I vote by mail? What do I need to bring with me?"
+    ),
+    'es': (
+        "El registro de votantes es el proceso de inscribirse para votar en las elecciones. Usted "
+        "debe registrarse antes de poder emitir su voto. Los requisitos varían según el estado, "
+        "pero la mayoría de los estados aceptan una licencia de conducir, una identificación estatal "
+        "o un pasaporte. La votación anticipada le permite votar antes del día de las elecciones en "
+        "lugares designados. Las boletas por correo le permiten votar si no puede ir a un lugar de "
+        "votación. Consulte las fechas límite y encuentre dónde puede votar con la información de esta página. "
+        "¿Dónde está mi lugar de votación? ¿Cuál es la fecha límite para inscribirse? ¿Cómo puedo "
+        "verificar si estoy registrado? ¿Puedo votar por correo? ¿Qué necesito llevar?"
+    ),
+    'vi': (
+        "Đăng ký cử tri là quá trình đăng ký để bỏ phiếu trong các cuộc bầu cử. Bạn phải đăng ký "
+        "trước khi có thể bỏ phiếu. Các yêu cầu khác nhau tùy theo tiểu bang, nhưng hầu hết các tiểu "
+        "bang chấp nhận bằng lái xe, thẻ căn cước của tiểu bang hoặc hộ chiếu. Bỏ phiếu sớm cho phép "
+        "bạn bỏ phiếu trước Ngày Bầu Cử tại các địa điểm được chỉ định. Phiếu bầu vắng mặt cho phép "
+        "bạn bỏ phiếu qua thư nếu bạn không thể đến địa điểm bỏ phiếu. "
+        "Địa điểm bỏ phiếu của tôi ở đâu? Hạn chót đăng ký là khi nào? Làm thế nào để kiểm tra "
+        "đăng ký của tôi? Tôi có thể bỏ phiếu qua thư không? Tôi cần mang theo gì?"
+    ),
+    'tl': (
+        "Ang pagpaparehistro ng botante ay ang proseso ng pag-sign up upang bumoto sa mga halalan. "
+        "Kailangan mong magparehistro bago ka makaboto. Ang mga kinakailangan ay nag-iiba ayon sa "
+        "estado, ngunit karamihan sa mga estado ay tumatanggap ng lisensya sa pagmamaneho, ID ng "
+        "estado, o pasaporte bilang pagkakakilanlan. Ang maagang pagboto ay nagpapahintulot sa iyo na "
+        "bumoto bago ang Araw ng Halalan sa mga itinalagang lugar. Ang mga balota sa koreo ay "
+        "nagbibigay-daan sa iyo na bumoto kung hindi ka makakapunta sa lugar ng botohan. "
+        "Saan ang aking lugar ng botohan? Kailan ang huling araw ng pagpaparehistro? Paano ko "
+        "susuriin ang aking pagpaparehistro? Maaari ba akong bumoto sa koreo? Ano ang kailangan "
+        "kong dalhin?"
+    ),
+    'fr': (
+        "L'inscription sur les listes électorales est la démarche qui permet de voter aux élections. "
+        "Vous devez vous inscrire avant de pouvoir voter. Les conditions varient selon les États, mais "
+        "la plupart acceptent un permis de conduire, une carte d'identité ou un passeport. Le vote "
+        "anticipé vous permet de voter avant le jour du scrutin dans des bureaux désignés. Le vote par "
+        "correspondance vous permet de voter si vous ne pouvez pas vous rendre au bureau de vote. "
+        "Où se trouve mon bureau de vote ? Quelle est la date limite pour s'inscrire ? Comment "
+        "vérifier mon inscription ? Puis-je voter par correspondance ? Que dois-je apporter ?"
+    ),
+    'de': (
+        "Die Wählerregistrierung ist der Vorgang, mit dem Sie sich für die Teilnahme an Wahlen "
+        "anmelden. Sie müssen sich registrieren, bevor Sie Ihre Stimme abgeben können. Die "
+        "Anforderungen unterscheiden sich je nach Bundesstaat, aber die meisten akzeptieren einen "
+        "Führerschein, einen Ausweis oder einen Reisepass. Bei der vorzeitigen Stimmabgabe können Sie "
+        "vor dem Wahltag in bestimmten Wahllokalen wählen. Mit der Briefwahl können Sie per Post wählen. "
+        "Wo ist mein Wahllokal? Bis wann muss ich mich registrieren? Wie prüfe ich meinen "
+        "Registrierungsstatus? Kann ich per Brief wählen? Was muss ich mitbringen?"
+    ),
+    'pt': (
+        "O registro de eleitores é o processo de inscrição para votar nas eleições. Você precisa se "
+        "registrar antes de poder votar. Os requisitos variam de acordo com o estado, mas a maioria "
+        "dos estados aceita carteira de motorista, documento de identidade estadual ou passaporte. A "
+        "votação antecipada permite que você vote antes do dia da eleição em locais designados. As "
+        "cédulas pelo correio permitem que você vote se não puder ir a um local de votação. "
+        "Onde fica o meu local de votação? Qual é o prazo para se registrar? Como verifico a "
+        "situação do meu registro? Posso votar pelo correio? O que preciso levar?"
+    ),
+    'it': (
+        "La registrazione degli elettori è la procedura con cui ci si iscrive per votare alle "
+        "elezioni. Devi registrarti prima di poter esprimere il tuo voto. I requisiti variano da "
+        "stato a stato, ma la maggior parte degli stati accetta la patente di guida, la carta "
+        "d'identità o il passaporto. Il voto anticipato ti permette di votare prima del giorno delle "
+        "elezioni in luoghi designati. Il voto per posta ti permette di votare se non puoi recarti al seggio. "
+        "Dov'è il mio seggio elettorale? Qual è la scadenza per iscriversi? Come posso "
+        "controllare la mia registrazione? Posso votare per posta? Cosa devo portare con me?"
+    ),
+    'nl': (
+        "Kiezersregistratie is het proces waarmee u zich aanmeldt om te stemmen bij verkiezingen. U "
+        "moet zich registreren voordat u een stem kunt uitbrengen. De vereisten verschillen per staat, "
+        "maar de meeste staten accepteren een rijbewijs, een identiteitskaart of een paspoort. Met "
+        "vervroegd stemmen kunt u voor de verkiezingsdag op aangewezen locaties stemmen. Met een "
+        "briefstembiljet kunt u per post stemmen als u niet naar het stembureau kunt gaan. "
+        "Waar is mijn stembureau? Wanneer moet ik me uiterlijk registreren? Hoe controleer ik "
+        "mijn registratie? Kan ik per post stemmen? Wat moet ik meenemen?"
+    ),
+    'pl': (
+        "Rejestracja wyborców to proces zgłoszenia się do udziału w wyborach. Musisz się "
+        "zarejestrować, zanim będziesz mógł oddać głos. Wymagania różnią się w zależności od stanu, "
+        "ale większość stanów akceptuje prawo jazdy, dowód osobisty lub paszport. Głosowanie "
+        "przedterminowe pozwala oddać głos przed dniem wyborów w wyznaczonych miejscach. Głosowanie "
+        "korespondencyjne pozwala głosować pocztą, jeśli nie możesz pójść do lokalu wyborczego. "
+        "Gdzie jest mój lokal wyborczy? Do kiedy muszę się zarejestrować? Jak sprawdzić moją "
+        "rejestrację? Czy mogę głosować korespondencyjnie? Co muszę ze sobą zabrać?"
+    ),
+}
+
+# Latin-script languages outside the registry: a text closest to one of these is undetermined
+_UNSUPPORTED_LATIN_SAMPLES = {
+    'ca': (
+        "El registre de votants és el procés per inscriure's per votar a les eleccions. Us heu de "
+        "registrar abans de poder emetre el vostre vot. Els requisits varien segons l'estat, però la "
+        "majoria dels estats accepten el permís de conduir, el document d'identitat o el passaport. "
+        "El vot anticipat us permet votar abans del dia de les eleccions en llocs designats. El vot "
+        "per correu us permet votar si no podeu anar al col·legi electoral. "
+        "On és el meu col·legi electoral? Quan acaba el termini per inscriure's? Com puc "
+        "comprovar la meva inscripció? Puc votar per correu? Què he de portar?"
+    ),
+}
+
+
+def _script_of(char: str) -> Optional[str]:
+    """Classify a single character into a script name (None for non-letters)"""
+    code = ord(char)
+    for start, end, script in _SCRIPT_RANGES:
+        if start <= code <= end:
+            return script if char.isalpha() else None
+    return 'other' if char.isalpha() else None
+
+
+def _trigrams(text: str) -> Counter:
+    """Character trigrams over lower-cased, whitespace-padded words"""
+    grams = Counter()
+    for word in re.findall(r"[^\W\d_]+", text.lower()):
+        padded = f' {word} '
+        for i in range(len(padded) - 2):
+            grams[padded[i:i + 3]] += 1
+    return grams
+
+
+def _normalized_profile(text: str) -> Dict[str, float]:
+    grams = _trigrams(text)
+    norm = math.sqrt(sum(count * count for count in grams.values())) or 1.0
+    return {gram: count / norm for gram, count in grams.items()}
+
+
+_LATIN_PROFILES = {code: _normalized_profile(unicodedata.normalize('NFC', sample))
+                   for code, sample in {**_LATIN_SAMPLES, **_UNSUPPORTED_LATIN_SAMPLES}.items()}
+
+
+def _detect_latin(text: str):
+    """
+    Rank Latin-script languages by trigram cosine similarity; returns
+    (code, similarity, margin), with code None unless a supported language
+    matches by at least MIN_SIMILARITY and leads by at least MIN_MARGIN
+    """
+    grams = _trigrams(text)
+    norm = math.sqrt(sum(count * count for count in grams.values()))
+    if not norm:
+        return None, 0.0, 0.0
+
+    scores = sorted(
+        ((sum(count * profile.get(gram, 0.0) for gram, count in grams.items()) / norm, code)
+         for code, profile in _LATIN_PROFILES.items()),
+        reverse=True
+    )
+    (best, best_code), (second, _) = scores[0], scores[1]
+    if best <= 0:
+        return None, 0.0, 0.0
+    margin = (best - second) / best
+    if best < MIN_SIMILARITY or margin < MIN_MARGIN or best_code in _UNSUPPORTED_LATIN_SAMPLES:
+        return None, best, margin
+    return best_code, best, margin
+
+
+def _detect_uncached(text: str) -> Detection:
+    start = time.perf_counter()
+    sample = unicodedata.normalize('NFC', text[:SAMPLE_CHARS])
+
+    script_counts = Counter()
+    for char in sample:
+        script = _script_of(char)
+        if script:
+            script_counts[script] += 1
+    letters = sum(script_counts.values())
+    if not letters:
+        return Detection(None, 0.0, 'none', (time.perf_counter() - start) * 1000)
+
+    # Kana anywhere means Japanese even though Han characters dominate
+    if script_counts['kana'] and script_counts['han']:
+        script_counts['kana'] += script_counts.pop('han')
+    script, count = script_counts.most_common(1)[0]
+    share = count / letters
+    chars = set(sample)
+
+    similarity = 1.0
+    if script == 'latin' and count < MIN_LATIN_LETTERS:
+        language, confidence = None, 0.0
+    elif script == 'latin':
+        language, similarity, margin = _detect_latin(sample)
+        # Short snippets get less trust: few trigrams to go on
+        length_factor = min(1.0, count / 40)
+        confidence = share * (0.5 + 0.5 * min(1.0, margin * 4)) * (0.5 + 0.5 * length_factor) if language else 0.0
+    elif script == 'han':
+        language, confidence = 'zh', share
+    elif script == 'arabic':
+        if chars & _URDU_MARKERS:
+            language = 'ur'
+        elif chars & _PERSIAN_MARKERS:
+            language = 'fa'
+        else:
+            language = 'ar'
+        confidence = share * 0.9
+    elif script == 'cyrillic':
+        is_bulgarian = bool(chars & _BULGARIAN_MARKERS) and not chars & _RUSSIAN_MARKERS
+        language, confidence = ('bg' if is_bulgarian else 'ru'), share * 0.9
+    else:
+        language, confidence = _SCRIPT_LANGUAGES.get(script), share
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return Detection(language, round(min(1.0, confidence), 3), script, elapsed_ms,
+                     similarity=round(similarity, 3))
+
+
+class LanguageDetector:
+    """Thread-safe detector with a bounded LRU cache keyed by text hash"""
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[bytes, Detection]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def detect(self, text: str) -> Detection:
+        """Detect the language of text, reusing a cached verdict for identical text"""
+        start = time.perf_counter()
+        key = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+        record_cache('language_detection', cached is not None)
+        if cached is not None:
+            return cached._replace(elapsed_ms=(time.perf_counter() - start) * 1000, cached=True)
+
+        detection = _detect_uncached(text)
+        with self._lock:
+            self._cache[key] = detection
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return detection._replace(elapsed_ms=(time.perf_counter() - start) * 1000)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+# Process-wide detector shared by the translation routes
+detector = LanguageDetector()
+
+
+def detect_language(text: str) -> Detection:
+    """Detect the language of text with the shared detector"""
+    return detector.detect(text)
@@ -0,0 +1,200 @@
+"""
+Unified language registry.
+
+Single source of truth for the languages CivicLink knows about: ISO codes,
+English and native names, flags, and provider-specific aliases. Every lookup
+is a dict or frozenset probe built once at import time, and the
+``/api/languages`` response body is serialized once up front.
+
+Provider-supported languages come from an on-disk snapshot
+(``backend/data/provider_languages.json``) so listing them never touches the
+network; refresh it with ``python get_languages.py --refresh``.
+"""
+
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional
+
+SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'provider_languages.json')
+
+
+class Language(NamedTuple):
+    code: str  # ISO 639-1 code used across the app
+    name: str  # English display name
+    native: str  # Name in the language itself
+    flag: str
+    provider_name: str  # deep-translator language name
+    glossary: bool = False  # Part of the curated civic glossary (LanguageEnum)
+    google_code: Optional[str] = None  # Filled from the provider snapshot
+
+
+# (code, name, native, flag, deep-translator name, glossary)
+_CIVIC_LANGUAGE_TABLE = [
+    ('en', 'English', 'English', '🇺🇸', 'english', False),
+    ('es', 'Spanish', 'Español', '🇪🇸', 'spanish', True),
+    ('zh', 'Chinese', '中文', '🇨🇳', 'chinese (simplified)', True),
+    ('ar', 'Arabic', 'العربية', '🇸🇦', 'arabic', True),
+    ('hi', 'Hindi', 'हिन्दी', '🇮🇳', 'hindi', True),
+    ('ko', 'Korean', '한국어', '🇰🇷', 'korean', True),
+    ('vi', 'Vietnamese', 'Tiếng Việt', '🇻🇳', 'vietnamese', True),
+    ('tl', 'Tagalog', 'Tagalog', '🇵🇭', 'filipino', True),
+    ('fr', 'French', 'Français', '🇫🇷', 'french', False),
+    ('de', 'German', 'Deutsch', '🇩🇪', 'german', False),
+    ('pt', 'Portuguese', 'Português', '🇵🇹', 'portuguese', False),
+    ('ja', 'Japanese', '日本語', '🇯🇵', 'japanese', False),
+    ('ru', 'Russian', 'Русский', '🇷🇺', 'russian', False),
+    ('it', 'Italian', 'Italiano', '🇮🇹', 'italian', False),
+    ('nl', 'Dutch', 'Nederlands', '🇳🇱', 'dutch', False),
+    ('sv', 'Swedish', 'Svenska', '🇸🇪', 'swedish', False),
+    ('no', 'Norwegian', 'Norsk', '🇳🇴', 'norwegian', False),
+    ('da', 'Danish', 'Dansk', '🇩🇰', 'danish', False),
+    ('fi', 'Finnish', 'Suomi', '🇫🇮', 'finnish', False),
+    ('pl', 'Polish', 'Polski', '🇵🇱', 'polish', False),
+    ('cs', 'Czech', 'Čeština', '🇨🇿', 'czech', False),
+    ('hu', 'Hungarian', 'Magyar', '🇭🇺', 'hungarian', False),
+    ('ro', 'Romanian', 'Română', '🇷🇴', 'romanian', False),
+    ('bg', 'Bulgarian', 'Български', '🇧🇬', 'bulgarian', False),
+    ('el', 'Greek', 'Ελληνικά', '🇬🇷', 'greek', False),
+    ('tr', 'Turkish', 'Türkçe', '🇹🇷', 'turkish', False),
+    ('he', 'Hebrew', 'עברית', '🇮🇱', 'hebrew', False),
+    ('fa', 'Persian', 'فارسی', '🇮🇷', 'persian', False),
+    ('ur', 'Urdu', 'اردو', '🇵🇰', 'urdu', False),
+    ('bn', 'Bengali', 'বাংলা', '🇧🇩', 'bengali', False),
+    ('ta', 'Tamil', 'தமிழ்', '🇮🇳', 'tamil', False),
+    ('te', 'Telugu', 'తెలుగు', '🇮🇳', 'telugu', False),
+    ('mr', 'Marathi', 'मराठी', '🇮🇳', 'marathi', False),
+    ('gu', 'Gujarati', 'ગુજરાતી', '🇮🇳', 'gujarati', False),
+    ('pa', 'Punjabi', 'ਪੰਜਾਬੀ', '🇮🇳', 'punjabi', False),
+    ('th', 'Thai', 'ไทย', '🇹🇭', 'thai', False),
+    ('id', 'Indonesian', 'Bahasa Indonesia', '🇮🇩', 'indonesian', False),
+    ('ms', 'Malay', 'Bahasa Melayu', '🇲🇾', 'malay', False),
+    ('sw', 'Swahili', 'Kiswahili', '🇰🇪', 'swahili', False),
+    ('am', 'Amharic', 'አማርኛ', '🇪🇹', 'amharic', False),
+    ('ha', 'Hausa', 'Hausa', '🇳🇬', 'hausa', False),
+    ('yo', 'Yoruba', 'Yorùbá', '🇳🇬', 'yoruba', False),
+    ('ig', 'Igbo', 'Igbo', '🇳🇬', 'igbo', False),
+    ('zu', 'Zulu', 'isiZulu', '🇿🇦', 'zulu', False),
+    ('xh', 'Xhosa', 'isiXhosa', '🇿🇦', 'xhosa', False),
+    ('af', 'Afrikaans', 'Afrikaans', '🇿🇦', 'afrikaans', False),
+]
+
+
+def load_provider_snapshot(path: str = SNAPSHOT_PATH) -> Dict[str, Dict[str, str]]:
+    """Load the cached provider language snapshot ({provider: {name: code}})"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)['providers']
+    except (OSError, ValueError, KeyError):
+        # Fall back to the table bundled with deep-translator (no network either)
+        from deep_translator.constants import GOOGLE_LANGUAGES_TO_CODES
+        return {'google': dict(GOOGLE_LANGUAGES_TO_CODES)}
+
+
+def refresh_provider_snapshot(path: str = SNAPSHOT_PATH) -> Dict[str, Dict[str, str]]:
+    """Ask the providers for their supported languages and rewrite the snapshot"""
+    from importlib.metadata import version
+    from deep_translator import GoogleTranslator
+
+    providers = {'google': dict(sorted(GoogleTranslator().get_supported_languages(as_dict=True).items()))}
+    snapshot = {'version': 1, 'source': f"deep-translator {version('deep-translator')}", 'providers': providers}
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+    return providers
+
+
+PROVIDER_LANGUAGES = load_provider_snapshot()
+_GOOGLE_CODES = PROVIDER_LANGUAGES.get('google', {})
+
+# Provider language names, in provider order (e.g. 'spanish', 'chinese (simplified)')
+ALL_LANGUAGES: List[str] = list(_GOOGLE_CODES)
+
+CIVIC_LANGUAGES: List[Language] = [
+    Language(code, name, native, flag, provider_name, glossary, _GOOGLE_CODES.get(provider_name, code))
+    for code, name, native, flag, provider_name, glossary in _CIVIC_LANGUAGE_TABLE
+]
+GLOSSARY_LANGUAGES: List[Language] = [lang for lang in CIVIC_LANGUAGES if lang.glossary]
+
+LANGUAGES_BY_CODE: Dict[str, Language] = {lang.code: lang for lang in CIVIC_LANGUAGES}
+CIVIC_CODES = frozenset(LANGUAGES_BY_CODE)
+GLOSSARY_CODES = frozenset(lang.code for lang in GLOSSARY_LANGUAGES)
+
+
+def _build_alias_index() -> Dict[str, str]:
+    """Map every known spelling (lower-cased) to a Google language code"""
+    index = {}
+    # Provider names and codes first, so civic entries win on collisions
+    for provider_name, google_code in _GOOGLE_CODES.items():
+        index[provider_name.lower()] = google_code
+        index.setdefault(google_code.lower(), google_code)
+    for lang in CIVIC_LANGUAGES:
+        for alias in (lang.code, lang.name, lang.native, lang.provider_name, lang.google_code):
+            index[alias.lower()] = lang.google_code
+    return index
+
+
+_PROVIDER_ALIASES = _build_alias_index()
+_CIVIC_ALIASES = {
+    alias.lower(): lang
+    for lang in CIVIC_LANGUAGES
+    for alias in (lang.code, lang.name, lang.native, lang.provider_name, lang.google_code)
+}
+
+
+def resolve(language: str) -> Optional[Language]:
+    """Resolve an ISO code, English/native name or provider alias to a civic Language"""
+    if not language:
+        return None
+    return _CIVIC_ALIASES.get(language.strip().lower())
+
+
+def to_provider_code(language: str, provider: str = 'google') -> str:
+    """
+    Map any known spelling of a language to the code the provider expects.
+    Unknown values (and 'auto') are passed through unchanged.
+    """
+    if not language:
+        return language
+    return _PROVIDER_ALIASES.get(language.strip().lower(), language)
+
+
+def is_supported(language: str) -> bool:
+    """Check whether the provider can translate into this language"""
+    return bool(language) and language.strip().lower() in _PROVIDER_ALIASES
+
+
+def metric_label(language: str) -> str:
+    """
+    Metric label for a language: its provider code when registered, 'auto'
+    for detection, and 'other' for anything else. Keeps client-supplied
+    values from creating unbounded label sets.
+    """
+    if language == 'auto':
+        return language
+    return _PROVIDER_ALIASES.get(language.strip().lower(), 'other') if language else 'other'
+
+
+def _civic_languages_payload() -> Dict[str, Dict[str, str]]:
+    """Shape used by /api/languages: provider name -> flag, native name and code"""
+    return {
+        lang.provider_name: {'flag': lang.flag, 'native': lang.native, 'code': lang.code}
+        for lang in CIVIC_LANGUAGES
+    }
+
+
+# Pre-serialized /api/languages body; the route serves these bytes as-is
+LANGUAGES_RESPONSE_BODY: bytes = json.dumps({
+    'all_languages': ALL_LANGUAGES,
+    'civic_languages': _civic_languages_payload(),
+    'total_count': len(ALL_LANGUAGES),
+}, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def same_language(first: str, second: str) -> bool:
+    """Check whether two spellings refer to the same language ('auto' never matches)"""
+    if not first or not second or 'auto' in (first, second):
+        return False
+    return to_provider_code(first).lower() == to_provider_code(second).lower()
@@ -0,0 +1,275 @@
+"""
+In-process metrics with a Prometheus text-format exporter.
+
+A deliberately small subset of the Prometheus client model: counters, gauges
+and histograms with labels, rendered by ``render_metrics()`` for the ``/metrics``
+endpoint. Recording a sample takes no locks: label children are created with
+``dict.setdefault`` and values are bumped with plain increments, which rely on
+the GIL and can, very rarely, drop an update under heavy contention. That is an
+acceptable trade for keeping the hot path to a dict lookup and an add.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; covers cache hits through slow provider round-trips
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+CHUNK_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """Get the child for a label-value tuple (created on first use)"""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def clear(self):
+        self._children.clear()
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def render(self) -> List[str]:
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}'
+                for key, child in list(self._children.items())]
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    render = Counter.render
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            counts = list(child.counts)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(child.sum)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+
+class Registry:
+    """Holds metrics in registration order and renders them"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.setdefault(metric.name, metric)
+        return self._metrics[metric.name]
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+registry = Registry()
+
+REQUEST_LATENCY = registry.histogram(
+    'civiclink_http_request_duration_seconds', 'HTTP request latency by route',
+    ('app', 'method', 'route', 'status'))
+PROVIDER_LATENCY = registry.histogram(
+    'civiclink_provider_call_duration_seconds', 'Translation provider call latency by language pair',
+    ('provider', 'source', 'target'))
+PROVIDER_ERRORS = registry.counter(
+    'civiclink_provider_errors_total', 'Failed translation provider calls by language pair',
+    ('provider', 'source', 'target'))
+CHUNKS_PER_REQUEST = registry.histogram(
+    'civiclink_translation_chunks', 'Chunks per translation request', (), CHUNK_BUCKETS)
+CHARACTERS_TRANSLATED = registry.counter(
+    'civiclink_characters_translated_total', 'Characters sent for translation by target language',
+    ('target',))
+PIPELINE_STAGE_LATENCY = registry.histogram(
+    'civiclink_pipeline_stage_duration_seconds', 'Translation pipeline stage latency',
+    ('pipeline', 'stage'))
+DB_QUERY_LATENCY = registry.histogram(
+    'civiclink_db_query_duration_seconds', 'Database statement latency by statement type',
+    ('operation',), DB_BUCKETS)
+CACHE_REQUESTS = registry.counter(
+    'civiclink_cache_requests_total', 'Cache and coalescing lookups by result (hit ratio = hit / total)',
+    ('cache', 'result'))
+SMS_MESSAGES = registry.counter(
+    'civiclink_sms_messages_total', 'Inbound SMS by shortcode command and reply language', ('command', 'language'))
+SMS_OUTBOUND = registry.counter(
+    'civiclink_sms_outbound_total', 'Outbound SMS replies by result (sent, failed, dropped)', ('result',))
+SUPPORT_OUTBOX = registry.counter(
+    'civiclink_support_outbox_total', 'Support requests by outbox event (queued, delivered, retried, parked)',
+    ('event',))
+GLOSSARY_SNAPSHOT_SIZE = registry.gauge(
+    'civiclink_glossary_snapshot', 'In-memory glossary snapshot size by unit (rows, bytes)', ('unit',))
+
+
+def record_cache(cache: str, hit: bool):
+    """Count a cache (or request-coalescing) lookup"""
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def render_metrics() -> str:
+    return registry.render()
+
+
+def metrics_response():
+    """Flask view returning the Prometheus exposition"""
+    from flask import Response
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
+
+
+def instrument_app(app, app_name: str):
+    """
+    Time every request of a Flask app by route template and expose /metrics.
+    """
+    from flask import g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _record_request_latency(response):
+        start = g.pop('_metrics_start', None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            REQUEST_LATENCY.labels(app_name, request.method, route, response.status_code).observe(
+                time.perf_counter() - start)
+        return response
+
+    app.add_url_rule('/metrics', 'metrics', metrics_response)
+    return app
+
+
+def instrument_engine(engine):
+    """Time every statement executed on a SQLAlchemy engine"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_metrics_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('_metrics_query_start')
+        if starts:
+            operation = statement.lstrip().split(None, 1)[0].upper() if statement else 'UNKNOWN'
+            DB_QUERY_LATENCY.labels(operation).observe(time.perf_counter() - starts.pop())
+
+    return engine
@@ -0,0 +1,122 @@
+"""
+Rendered page cache with precompressed bodies.
+
+The server-rendered pages (translation assistant, help & language) depend
+only on a few request inputs: search term, language and accessibility flags.
+``PageCache`` keys the rendered HTML by those inputs. It stores the HTML
+together with gzip and, when the ``brotli`` package is installed, brotli
+variants, so a hit costs a dict lookup and no template or compression work.
+The variant is picked from ``Accept-Encoding``, and ``If-None-Match`` is
+answered with 304.
+
+The cache is a bounded LRU. The page content is fixed at import apart from
+the static translations artifact, and callers include its version in the
+key, so new content never hits old entries. ``invalidate()`` clears
+everything (tests, or data changed in place).
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, NamedTuple, Optional
+
+from flask import Response, request
+
+from backend.services.metrics import record_cache
+
+try:
+    import brotli
+except ImportError:  # optional: gzip is always available
+    brotli = None
+
+PAGE_CACHE_SIZE = 256  # rendered pages kept per cache
+# Pages are compressed on a cache miss, and keys include user input (search terms), so misses are
+# unbounded: use mid levels, within a few percent of the maximum size at a fraction of the CPU
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+HTML_CONTENT_TYPE = 'text/html; charset=utf-8'
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    gzip: bytes
+    br: Optional[bytes]
+    etag: str
+
+
+def compress_page(html: str) -> CachedPage:
+    """Encode and precompress a rendered page (done once per cache entry)"""
+    body = html.encode('utf-8')
+    return CachedPage(
+        body,
+        gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+        brotli.compress(body, quality=BROTLI_QUALITY) if brotli is not None else None,
+        hashlib.blake2b(body, digest_size=12).hexdigest(),
+    )
+
+
+def choose_encoding(page: CachedPage) -> Optional[str]:
+    """Best stored encoding the client accepts: br, then gzip, then identity (None)"""
+    accepted = request.accept_encodings
+    if page.br is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def page_response(page: CachedPage, cache_status: str = 'hit') -> Response:
+    encoding = choose_encoding(page)
+    etag = f'{page.etag}-{encoding}' if encoding else page.etag
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(getattr(page, encoding) if encoding else page.body, content_type=HTML_CONTENT_TYPE)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.headers['X-Page-Cache'] = cache_status
+    return response
+
+
+class PageCache:
+    """Bounded LRU of rendered pages keyed by the inputs they depend on"""
+
+    def __init__(self, name: str, max_entries: int = PAGE_CACHE_SIZE):
+        self.name = name
+        self.max_entries = max_entries
+        self._pages: 'OrderedDict[Hashable, CachedPage]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def get(self, key: Hashable) -> Optional[CachedPage]:
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+        record_cache(self.name, page is not None)
+        return page
+
+    def put(self, key: Hashable, page: CachedPage):
+        with self._lock:
+            self._pages[key] = page
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+    def invalidate(self):
+        with self._lock:
+            self._pages.clear()
+
+    def response(self, key: Hashable, render: Callable[[], str]) -> Response:
+        """Serve the page for ``key``, rendering and compressing it on a miss"""
+        page = self.get(key)
+        if page is not None:
+            return page_response(page, 'hit')
+        page = compress_page(render())
+        self.put(key, page)
+        return page_response(page, 'miss')
@@ -0,0 +1,125 @@
+"""
+Staged translation pipeline shared by every entry point.
+
+``Pipeline`` runs its stages in order over one ``TranslationJob`` and records
+each stage's wall time. The timing goes into the job
+(``stage_timings_ms`` in the result), the
+``civiclink_pipeline_stage_duration_seconds`` histogram and a trace span.
+``run`` is for the Flask apps and the CLI; ``run_async`` is for the asyncio
+service. ``prepare`` produces the job state just before a given stage, so a
+single stage can be benchmarked on its own.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Sequence
+
+from backend.services.metrics import PIPELINE_STAGE_LATENCY
+from backend.services.pipeline.stages import (CacheLookupStage, NormalizeStage, PostprocessStage, ProviderStage,
+                                              ScoreStage, SegmentStage, Stage, TranslationCache, TranslationJob,
+                                              MAX_CHUNK_SIZE)
+from backend.services.profiling import span
+
+logger = logging.getLogger(__name__)
+
+
+class Pipeline:
+    """An ordered list of stages with per-stage timing"""
+
+    def __init__(self, stages: Sequence[Stage], name: str = 'default'):
+        self.stages: List[Stage] = list(stages)
+        self.name = name
+
+    def stage(self, name: str) -> Stage:
+        for stage in self.stages:
+            if stage.name == name:
+                return stage
+        raise KeyError(name)
+
+    def _finish_stage(self, stage: Stage, job: TranslationJob, start: float):
+        elapsed = time.perf_counter() - start
+        job.timings[stage.name] = elapsed * 1000
+        PIPELINE_STAGE_LATENCY.labels(self.name, stage.name).observe(elapsed)
+
+    def run_stage(self, stage: Stage, job: TranslationJob):
+        start = time.perf_counter()
+        with span(f'translate.{stage.name}'):
+            stage.run(job)
+        self._finish_stage(stage, job, start)
+
+    async def run_stage_async(self, stage: Stage, job: TranslationJob):
+        start = time.perf_counter()
+        with span(f'translate.{stage.name}'):
+            await stage.run_async(job)
+        self._finish_stage(stage, job, start)
+
+    def run(self, text: str, target_language: str, source_language: str = 'auto', format: str = 'text') -> Dict:
+        """Translate text (``format``: text, html or markdown); returns the result payload or ``{'error': ...}``"""
+        try:
+            job = TranslationJob(text, target_language, source_language, format)
+            for stage in self.stages:
+                self.run_stage(stage, job)
+                if job.error:
+                    return {'error': job.error, 'success': False}
+            return job.result()
+        except Exception as e:
+            logger.error(f"Translation error: {str(e)}")
+            return {'error': f'Translation failed: {str(e)}', 'success': False}
+
+    async def run_async(self, text: str, target_language: str, source_language: str = 'auto',
+                        format: str = 'text') -> Dict:
+        """Async ``run``: provider calls are awaited instead of blocking a thread"""
+        try:
+            job = TranslationJob(text, target_language, source_language, format)
+            for stage in self.stages:
+                await self.run_stage_async(stage, job)
+                if job.error:
+                    return {'error': job.error, 'success': False}
+            return job.result()
+        except Exception as e:
+            logger.error(f"Translation error: {str(e)}")
+            return {'error': f'Translation failed: {str(e)}', 'success': False}
+
+    def prepare(self, text: str, target_language: str, source_language: str = 'auto',
+                until: Optional[str] = None, format: str = 'text') -> TranslationJob:
+        """Run the stages before ``until`` (all stages if None) and return the job"""
+        job = TranslationJob(text, target_language, source_language, format)
+        for stage in self.stages:
+            if stage.name == until:
+                break
+            self.run_stage(stage, job)
+        return job
+
+
+# Segments translated by any pipeline in this process
+translation_cache = TranslationCache()
+
+
+def build_pipeline(name: str = 'default', cache: Optional[TranslationCache] = translation_cache,
+                   provider_concurrency: int = 1, async_concurrency: int = 16, pool=None, async_pool=None,
+                   max_chunk_size: int = MAX_CHUNK_SIZE) -> Pipeline:
+    """The standard normalize -> segment -> cache -> provider -> postprocess -> score pipeline"""
+    stages = [NormalizeStage(), SegmentStage(max_chunk_size)]
+    if cache is not None:
+        stages.append(CacheLookupStage(cache))
+    stages += [
+        ProviderStage(pool, async_pool, concurrency=provider_concurrency, async_concurrency=async_concurrency),
+        PostprocessStage(),
+        ScoreStage(),
+    ]
+    return Pipeline(stages, name)
+
+
+# Shared by the Flask routes, simple_app.py and async_app.py
+default_pipeline = build_pipeline()
+
+
+def translate_text(text: str, target_language: str, source_language: str = 'auto', format: str = 'text') -> Dict:
+    """Translate text with the default pipeline"""
+    return default_pipeline.run(text, target_language, source_language, format)
+
+
+async def translate_text_async(text: str, target_language: str, source_language: str = 'auto',
+                               format: str = 'text') -> Dict:
+    """Translate text with the default pipeline without blocking the event loop"""
+    return await default_pipeline.run_async(text, target_language, source_language, format)
@@ -0,0 +1,194 @@
+"""
+Markup-aware extraction for HTML and Markdown translation.
+
+A document is parsed once. Only its human-readable text is pulled out as
+translation units: HTML text nodes and the alt/title/placeholder/aria-label
+attributes, or the prose parts of Markdown lines. The document is then
+rendered again with each unit replaced by its translation.
+
+These parts are never sent to the provider and come back untouched:
+- tags and attributes
+- URLs
+- code, fenced and inline
+- Markdown block and emphasis markers
+- anything inside ``translate="no"`` or ``.notranslate``
+
+Leading and trailing whitespace of each unit is kept, so inline spacing
+survives. Identical units are translated only once.
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+FORMATS = frozenset({'text', 'html', 'markdown'})
+
+SKIP_TAGS = frozenset({'script', 'style', 'code', 'pre', 'kbd', 'samp', 'var', 'noscript', 'template', 'svg', 'math'})
+TRANSLATABLE_ATTRIBUTES = ('alt', 'title', 'placeholder', 'aria-label')
+
+_WHITESPACE = re.compile(r'^(\s*)(.*?)(\s*)$', re.S)
+# Nothing to translate: punctuation/digits only, or a bare URL / e-mail address
+_NOT_TRANSLATABLE = re.compile(r'^(?:[\W\d_]*|(?:https?://|www\.|mailto:)\S+|\S+@\S+\.\w+)$')
+
+
+def _split_whitespace(text: str) -> Tuple[str, str, str]:
+    return _WHITESPACE.match(text).groups()
+
+
+def _unit(core: str) -> str:
+    """Collapse internal whitespace so a unit never spans lines (batches are newline-joined)"""
+    return ' '.join(core.split())
+
+
+def is_translatable(text: str) -> bool:
+    return bool(text) and not _NOT_TRANSLATABLE.match(text)
+
+
+class MarkupDocument:
+    """Base class: ``units`` to translate and ``render(translations)``"""
+
+    def __init__(self):
+        self._units: Dict[str, None] = {}  # insertion-ordered set
+
+    def _add_unit(self, core: str) -> str:
+        unit = _unit(core)
+        self._units.setdefault(unit, None)
+        return unit
+
+    @property
+    def units(self) -> List[str]:
+        """Unique translatable strings in document order"""
+        return list(self._units)
+
+    def plain_text(self) -> str:
+        """Translatable text only (used for language detection)"""
+        return ' '.join(self._units)
+
+    def render(self, translations: Dict[str, str]) -> str:
+        raise NotImplementedError
+
+
+class HTMLDocument(MarkupDocument):
+    def __init__(self, html: str):
+        # bs4 is imported by the first HTML request rather than at startup
+        from bs4 import BeautifulSoup
+        from bs4.element import CData, Comment, Declaration, Doctype, ProcessingInstruction
+
+        super().__init__()
+        skip_string_types = (Comment, Doctype, CData, ProcessingInstruction, Declaration)
+        self.soup = BeautifulSoup(html, 'html.parser')
+        self._text_slots = []  # (node, leading, unit, trailing)
+        self._attribute_slots = []  # (tag, attribute, unit)
+
+        for node in self.soup.find_all(string=True):
+            if isinstance(node, skip_string_types) or self._skipped(node.parent):
+                continue
+            leading, core, trailing = _split_whitespace(str(node))
+            if is_translatable(core):
+                self._text_slots.append((node, leading, self._add_unit(core), trailing))
+
+        for tag in self.soup.find_all(True):
+            if self._skipped(tag):
+                continue
+            for attribute in TRANSLATABLE_ATTRIBUTES:
+                value = tag.get(attribute)
+                if isinstance(value, str) and is_translatable(value.strip()):
+                    self._attribute_slots.append((tag, attribute, self._add_unit(value.strip())))
+
+    @staticmethod
+    def _skipped(tag) -> bool:
+        while tag is not None and tag.name != '[document]':
+            if tag.name in SKIP_TAGS or tag.get('translate') == 'no' or 'notranslate' in (tag.get('class') or ()):
+                return True
+            tag = tag.parent
+        return False
+
+    def render(self, translations: Dict[str, str]) -> str:
+        from bs4 import NavigableString
+
+        for node, leading, unit, trailing in self._text_slots:
+            node.replace_with(NavigableString(f'{leading}{translations.get(unit, unit)}{trailing}'))
+        for tag, attribute, unit in self._attribute_slots:
+            tag[attribute] = translations.get(unit, unit)
+        self._text_slots, self._attribute_slots = [], []
+        return str(self.soup)
+
+
+_FENCE = re.compile(r'^\s{0,3}(```|~~~)')
+_PROTECTED_LINE = re.compile(
+    r'^\s*(?:'
+    r'[-*_=|:\s]+'                     # rules, setext underlines, table separators
+    r'|\[[^\]]+\]:\s*\S+.*'            # reference link definitions
+    r'|</?[A-Za-z][^>]*>\s*'           # lines holding only an HTML tag
+    r')$'
+)
+_BLOCK_PREFIX = re.compile(r'^\s*(?:(?:#{1,6}|[-*+]|\d+[.)]|>)[ \t]+)*(?:\[[ xX]\][ \t]+)?')
+_INLINE_PROTECTED = re.compile(
+    r'`[^`\n]+`'                       # inline code
+    r'|\]\([^)\s]*(?:\s+"[^"]*")?\)'   # link / image destination
+    r'|\]\[[^\]]*\]'                   # reference link label
+    r'|!?\['                           # link / image text opener
+    r'|<(?:https?://|mailto:)[^>]+>'   # autolinks
+    r'|</?[A-Za-z][^>]*>'              # inline HTML tags
+    r'|(?:https?://|www\.)\S+'         # bare URLs
+    r'|\*{1,3}|_{2,3}|~~'              # emphasis markers
+    r'|\|'                             # table cell separators
+    r'|\s{2,}$'                        # hard line break
+)
+
+
+class MarkdownDocument(MarkupDocument):
+    def __init__(self, markdown: str):
+        super().__init__()
+        self._parts: List = []  # protected str, or (leading, unit, trailing)
+        in_fence = None
+        previous_blank = True
+        for line in markdown.splitlines(keepends=True):
+            body = line.rstrip('\r\n')
+            newline = line[len(body):]
+            fence = _FENCE.match(body)
+            if in_fence:
+                self._parts.append(line)
+                if fence and fence.group(1) == in_fence:
+                    in_fence = None
+            elif fence:
+                in_fence = fence.group(1)
+                self._parts.append(line)
+            elif (previous_blank and body.startswith(('    ', '\t'))) or _PROTECTED_LINE.match(body):
+                # Indented code block, rule, table separator, link definition
+                self._parts.append(line)
+            else:
+                self._add_line(body)
+                self._parts.append(newline)
+            previous_blank = not body.strip()
+
+    def _add_line(self, body: str):
+        prefix = _BLOCK_PREFIX.match(body).group(0)
+        self._parts.append(prefix)
+        position = len(prefix)
+        for match in _INLINE_PROTECTED.finditer(body, position):
+            self._add_text(body[position:match.start()])
+            self._parts.append(match.group(0))
+            position = match.end()
+        self._add_text(body[position:])
+
+    def _add_text(self, text: str):
+        if not text:
+            return
+        leading, core, trailing = _split_whitespace(text)
+        if is_translatable(core):
+            self._parts.append((leading, self._add_unit(core), trailing))
+        else:
+            self._parts.append(text)
+
+    def render(self, translations: Dict[str, str]) -> str:
+        return ''.join(part if isinstance(part, str) else f'{part[0]}{translations.get(part[1], part[1])}{part[2]}'
+                       for part in self._parts)
+
+
+def parse(text: str, format: str) -> MarkupDocument:
+    """Parse an HTML or Markdown document"""
+    if format == 'html':
+        return HTMLDocument(text)
+    if format == 'markdown':
+        return MarkdownDocument(text)
+    raise ValueError(f'Unsupported markup format: {format}')
@@ -0,0 +1,411 @@
+"""
+Translation pipeline stages.
+
+A stage reads and updates a ``TranslationJob``. Every stage has a ``run``
+method and an async ``run_async`` method; by default the async version just
+calls ``run``. Only the provider stage does I/O, so it is the only stage with
+a different async path.
+
+The default stage order is normalize -> segment -> cache -> provider ->
+postprocess -> score.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from backend.services.language_detection import detect_language, MIN_CONFIDENCE as MIN_DETECTION_CONFIDENCE
+from backend.services.languages import metric_label, same_language, to_provider_code
+from backend.services.metrics import (PROVIDER_LATENCY, PROVIDER_ERRORS, CHUNKS_PER_REQUEST, CHARACTERS_TRANSLATED,
+                                      record_cache)
+from backend.services.pipeline.markup import FORMATS, MarkupDocument, parse as parse_markup
+from backend.services.pipeline.text import chunk_text, calculate_quality_score
+from backend.services.profiling import span
+
+logger = logging.getLogger(__name__)
+
+MAX_CHUNK_SIZE = 5000
+MAX_BATCH_SEGMENTS = 128  # markup units sent in one provider call
+BATCH_SEPARATOR = '\n'
+TRANSLATION_CACHE_SIZE = 2048  # translated segments kept in memory
+
+
+class Segment:
+    """One chunk of the input and its translation"""
+
+    __slots__ = ('index', 'text', 'translated', 'cached', 'failed')
+
+    def __init__(self, index: int, text: str):
+        self.index = index
+        self.text = text
+        self.translated: Optional[str] = None
+        self.cached = False
+        self.failed = False
+
+    def copy(self) -> 'Segment':
+        segment = Segment(self.index, self.text)
+        segment.translated, segment.cached, segment.failed = self.translated, self.cached, self.failed
+        return segment
+
+
+class TranslationJob:
+    """State handed from stage to stage for one translation request"""
+
+    def __init__(self, text: str, target_language: str, source_language: str = 'auto', format: str = 'text'):
+        self.text = text
+        self.target_language = target_language
+        self.source_language = source_language
+        self.format = format
+        self.document: Optional[MarkupDocument] = None  # parsed HTML/Markdown, set by the normalize stage
+        self.characters_sent = 0
+        self.source_lang = source_language  # provider codes, set by the normalize stage
+        self.target_lang = target_language
+        self.detection = None
+        self.provider = 'google'
+        self.provider_skipped = False
+        self.segments: List[Segment] = []
+        self.translated_text = ''
+        self.quality_score = 0.0
+        self.cache: Optional['TranslationCache'] = None
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}  # stage name -> milliseconds
+
+    def copy(self) -> 'TranslationJob':
+        """Copy with independent segments (lets a stage be benchmarked repeatedly)"""
+        job = TranslationJob.__new__(TranslationJob)
+        job.__dict__.update(self.__dict__)
+        job.segments = [segment.copy() for segment in self.segments]
+        job.timings = dict(self.timings)
+        return job
+
+    def result(self) -> Dict:
+        """Response payload shared by every entry point"""
+        detection = self.detection
+        return {
+            'original_text': self.text,
+            'translated_text': self.translated_text,
+            'source_language': self.source_language,
+            'target_language': self.target_language,
+            'chunks_processed': 0 if self.provider_skipped else len(self.segments),
+            'cached_chunks': sum(1 for segment in self.segments if segment.cached),
+            'failed_chunks': sum(1 for segment in self.segments if segment.failed),
+            'total_characters': len(self.text),
+            'characters_sent': self.characters_sent,
+            'format': self.format,
+            'quality_score': self.quality_score,
+            'translation_service': 'none' if self.provider_skipped else self.provider,
+            'provider_skipped': self.provider_skipped,
+            'detected_language': detection.language if detection else None,
+            'detection_confidence': detection.confidence if detection else None,
+            'detection_time_ms': round(detection.elapsed_ms, 3) if detection else None,
+            'stage_timings_ms': {name: round(ms, 3) for name, ms in self.timings.items()},
+            'success': True,
+            'timestamp': datetime.utcnow().isoformat()
+        }
+
+
+class Stage:
+    """Base class: override ``run`` (and ``run_async`` for I/O-bound stages)"""
+
+    name = 'stage'
+
+    def run(self, job: TranslationJob):
+        raise NotImplementedError
+
+    async def run_async(self, job: TranslationJob):
+        self.run(job)
+
+
+class NormalizeStage(Stage):
+    """Strip input, resolve 'auto' locally and map languages to provider codes"""
+
+    name = 'normalize'
+
+    def run(self, job: TranslationJob):
+        job.text = job.text.strip()
+        if not job.text:
+            job.error = 'Empty text provided'
+            return
+        if job.format not in FORMATS:
+            job.error = f'Unsupported format: {job.format}'
+            return
+        if job.format != 'text':
+            job.document = parse_markup(job.text, job.format)
+
+        # Resolve 'auto' locally so the provider gets an explicit source language
+        if job.source_language == 'auto':
+            with span('translate.detect'):
+                job.detection = detect_language(job.document.plain_text() if job.document else job.text)
+            if job.detection.language and job.detection.confidence >= MIN_DETECTION_CONFIDENCE:
+                job.source_language = job.detection.language
+
+        job.target_lang = to_provider_code(job.target_language)
+        job.source_lang = to_provider_code(job.source_language)
+        # Text is already in the target language: skip the provider entirely. A detected (rather
+        # than caller-given) source must be near-certain, or the input would come back untranslated
+        job.provider_skipped = same_language(job.source_lang, job.target_lang) and \
+            (job.detection is None or job.detection.skips_provider)
+
+
+class SegmentStage(Stage):
+    """
+    Split plain text into provider-sized chunks at sentence boundaries; for
+    HTML/Markdown each unique translatable unit becomes a segment
+    """
+
+    name = 'segment'
+
+    def __init__(self, max_chunk_size: int = MAX_CHUNK_SIZE):
+        self.max_chunk_size = max_chunk_size
+
+    def run(self, job: TranslationJob):
+        units = job.document.units if job.document else chunk_text(job.text, self.max_chunk_size)
+        job.segments = [Segment(i, unit) for i, unit in enumerate(units)]
+        CHUNKS_PER_REQUEST.observe(len(job.segments))
+
+
+class TranslationCache:
+    """Thread-safe LRU of translated segments keyed by (source, target, text) hash"""
+
+    def __init__(self, max_entries: int = TRANSLATION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[bytes, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(source: str, target: str, text: str) -> bytes:
+        return hashlib.blake2b(f'{source}\x00{target}\x00{text}'.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, source: str, target: str, text: str) -> Optional[str]:
+        key = self.key(source, target, text)
+        with self._lock:
+            translated = self._entries.get(key)
+            if translated is not None:
+                self._entries.move_to_end(key)
+        return translated
+
+    def put(self, source: str, target: str, text: str, translated: str):
+        key = self.key(source, target, text)
+        with self._lock:
+            self._entries[key] = translated
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CacheLookupStage(Stage):
+    """Fill segments translated before; the provider stage stores new translations"""
+
+    name = 'cache'
+
+    def __init__(self, cache: TranslationCache):
+        self.cache = cache
+
+    def run(self, job: TranslationJob):
+        if job.provider_skipped:
+            return
+        job.cache = self.cache
+        for segment in job.segments:
+            translated = self.cache.get(job.source_lang, job.target_lang, segment.text)
+            record_cache('translation', translated is not None)
+            if translated is not None:
+                segment.translated = translated
+                segment.cached = True
+
+
+class ProviderStage(Stage):
+    """
+    Translate uncached segments. Sync runs use the pooled translators with up
+    to ``concurrency`` calls in flight; async runs await the async pool with
+    up to ``async_concurrency`` in flight. Markup units are short, so they are
+    batched into newline-joined calls of up to ``max_batch_chars``; if the
+    provider does not keep the line breaks, the batch is retried one unit at a
+    time. A failed segment falls back to its original text.
+    """
+
+    name = 'provider'
+
+    def __init__(self, pool=None, async_pool=None, provider: str = 'google',
+                 concurrency: int = 1, async_concurrency: int = 16, max_batch_chars: int = MAX_CHUNK_SIZE):
+        self._pool = pool
+        self._async_pool = async_pool
+        self.provider = provider
+        self.concurrency = max(1, concurrency)
+        self.async_concurrency = max(1, async_concurrency)
+        self.max_batch_chars = max_batch_chars
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        # Imported on first use: deep-translator and requests are not needed to serve glossary requests
+        if self._pool is None:
+            from backend.services.translator_pool import translator_pool
+            self._pool = translator_pool
+        return self._pool
+
+    @property
+    def async_pool(self):
+        if self._async_pool is None:
+            from backend.services.async_translator import async_translator_pool
+            self._async_pool = async_translator_pool
+        return self._async_pool
+
+    def _plan(self, job: TranslationJob) -> List[List[Segment]]:
+        """Group uncached segments into provider calls and count the characters sent"""
+        job.provider = self.provider
+        if job.provider_skipped:
+            return []
+        pending = [segment for segment in job.segments if segment.translated is None]
+        if job.document is None:
+            batches = [[segment] for segment in pending]
+        else:
+            batches, batch, size = [], [], 0
+            for segment in pending:
+                length = len(segment.text) + len(BATCH_SEPARATOR)
+                if batch and (size + length > self.max_batch_chars or len(batch) >= MAX_BATCH_SEGMENTS):
+                    batches.append(batch)
+                    batch, size = [], 0
+                batch.append(segment)
+                size += length
+            if batch:
+                batches.append(batch)
+        job.characters_sent = sum(len(BATCH_SEPARATOR.join(segment.text for segment in batch)) for batch in batches)
+        if job.characters_sent:
+            CHARACTERS_TRANSLATED.labels(metric_label(job.target_lang)).inc(job.characters_sent)
+        return batches
+
+    def _store(self, job: TranslationJob, segment: Segment, translated: str):
+        segment.translated = translated
+        if job.cache is not None:
+            job.cache.put(job.source_lang, job.target_lang, segment.text, translated)
+
+    def _fail(self, job: TranslationJob, batch: List[Segment], error: Exception):
+        PROVIDER_ERRORS.labels(self.provider, metric_label(job.source_lang), metric_label(job.target_lang)).inc()
+        logger.error(f"Error translating chunk {batch[0].index + 1}: {str(error)}")
+        # Fallback: keep the original text if translation fails
+        for segment in batch:
+            segment.translated = segment.text
+            segment.failed = True
+
+    def _finish(self, job: TranslationJob, batch: List[Segment], translated: str, call_start: float) -> bool:
+        """Store a successful call's result; False if a batch came back with the wrong number of lines"""
+        PROVIDER_LATENCY.labels(self.provider, metric_label(job.source_lang), metric_label(job.target_lang)).observe(
+            time.perf_counter() - call_start)
+        if len(batch) == 1:
+            self._store(job, batch[0], translated)
+            return True
+        parts = (translated or '').split(BATCH_SEPARATOR)
+        if len(parts) != len(batch):
+            return False
+        for segment, part in zip(batch, parts):
+            self._store(job, segment, part.strip())
+        return True
+
+    def _translate(self, translator, job: TranslationJob, batch: List[Segment]):
+        call_start = time.perf_counter()
+        text = BATCH_SEPARATOR.join(segment.text for segment in batch)
+        try:
+            with span('translate.provider.call', chunk=batch[0].index, segments=len(batch), characters=len(text)):
+                translated = translator.translate(text)
+        except Exception as e:
+            self._fail(job, batch, e)
+            return
+        if not self._finish(job, batch, translated, call_start):
+            for segment in batch:
+                self._translate(translator, job, [segment])
+
+    def _translate_with_checkout(self, job: TranslationJob, batch: List[Segment]):
+        with self.pool.translator(job.source_lang, job.target_lang, self.provider) as translator:
+            self._translate(translator, job, batch)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                    thread_name_prefix='pipeline-provider')
+            return self._executor
+
+    def run(self, job: TranslationJob):
+        batches = self._plan(job)
+        if not batches:
+            return
+        if self.concurrency == 1 or len(batches) == 1:
+            # One pooled translator (keep-alive session) for the whole request
+            with self.pool.translator(job.source_lang, job.target_lang, self.provider) as translator:
+                for batch in batches:
+                    self._translate(translator, job, batch)
+            return
+        # Each worker checks out its own translator; copy the context so trace spans follow
+        executor = self._get_executor()
+        futures = [executor.submit(contextvars.copy_context().run, self._translate_with_checkout, job, batch)
+                   for batch in batches]
+        for future in futures:
+            future.result()
+
+    async def run_async(self, job: TranslationJob):
+        batches = self._plan(job)
+        if not batches:
+            return
+        limit = asyncio.Semaphore(self.async_concurrency)
+
+        async def translate(batch: List[Segment]):
+            async with limit:
+                call_start = time.perf_counter()
+                text = BATCH_SEPARATOR.join(segment.text for segment in batch)
+                try:
+                    with span('translate.provider.call', chunk=batch[0].index, segments=len(batch),
+                              characters=len(text)):
+                        translated = await self.async_pool.translate(
+                            text, job.source_lang, job.target_lang, self.provider)
+                except Exception as e:
+                    self._fail(job, batch, e)
+                    return
+            if not self._finish(job, batch, translated, call_start):
+                await asyncio.gather(*(translate([segment]) for segment in batch))
+
+        await asyncio.gather(*(translate(batch) for batch in batches))
+
+
+class PostprocessStage(Stage):
+    """Join translated segments back into one text"""
+
+    name = 'postprocess'
+
+    def run(self, job: TranslationJob):
+        if job.provider_skipped:
+            job.translated_text = job.text
+        elif job.document is not None:
+            # Put translated units back into the original markup
+            job.translated_text = job.document.render({segment.text: segment.translated for segment in job.segments})
+        else:
+            job.translated_text = " ".join(segment.translated for segment in job.segments)
+
+
+class ScoreStage(Stage):
+    """Heuristic quality score of the translation"""
+
+    name = 'score'
+
+    def run(self, job: TranslationJob):
+        if job.document is not None and not job.provider_skipped:
+            # Score the prose only; markup and link syntax would skew the heuristics
+            original = ' '.join(segment.text for segment in job.segments)
+            translated = ' '.join(segment.translated for segment in job.segments)
+            job.quality_score = calculate_quality_score(original, translated, job.target_language)
+        else:
+            job.quality_score = calculate_quality_score(job.text, job.translated_text, job.target_language)
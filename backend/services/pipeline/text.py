@@ -0,0 +1,70 @@
+"""
+Text helpers shared by the translation pipeline stages.
+"""
+
+import re
+from typing import List
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+_ARTIFACTS = ('[', ']', '...', '??', '!!')
+
+
+def chunk_text(text: str, max_chunk_size: int = 5000) -> List[str]:
+    """
+    Split large text into chunks for efficient translation.
+    Tries to break at sentence boundaries when possible.
+    """
+    if len(text) <= max_chunk_size:
+        return [text]
+
+    chunks = []
+    sentences = _SENTENCE_BOUNDARY.split(text)
+    current_chunk = ""
+
+    for sentence in sentences:
+        if len(current_chunk + sentence) <= max_chunk_size:
+            current_chunk += sentence + " "
+        else:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+            current_chunk = sentence + " "
+
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+
+    return chunks
+
+
+def calculate_quality_score(original: str, translated: str, target_lang: str) -> float:
+    """
+    Calculate a simple quality score based on text characteristics.
+    """
+    try:
+        # Basic quality indicators
+        length_ratio = len(translated) / len(original) if len(original) > 0 else 0
+
+        # Penalize extremely short or long translations
+        if length_ratio < 0.1 or length_ratio > 3.0:
+            length_score = 0.3
+        elif 0.5 <= length_ratio <= 2.0:
+            length_score = 1.0
+        else:
+            length_score = 0.7
+
+        # Check for common translation artifacts
+        artifact_penalty = 0
+        for artifact in _ARTIFACTS:
+            if artifact in translated:
+                artifact_penalty += 0.1
+
+        # Check for proper sentence structure
+        sentence_score = 1.0
+        if not translated.endswith(('.', '!', '?')):
+            sentence_score = 0.8
+
+        # Combine scores
+        quality_score = (length_score + sentence_score - artifact_penalty) / 2
+        return max(0.0, min(1.0, quality_score))
+
+    except Exception:
+        return 0.5  # Default moderate score
@@ -0,0 +1,108 @@
+"""
+Warm-up before forking worker processes.
+
+With a pre-forking server (``gunicorn --preload``, see ``gunicorn.conf.py``)
+the app is imported once in the master. ``preload(app)`` then does the work
+that every worker would otherwise repeat on its first requests:
+- imports the provider modules that are kept off the import path
+- compiles the Jinja templates
+- loads the glossary snapshot and maps the compiled glossary file
+- fills the related-terms index
+- loads the polling-place CSV and builds its KD-tree (seconds for a state)
+
+Workers inherit all of this through ``fork``, and the memory pages stay
+shared until a worker writes to them.
+
+CPython's cyclic GC writes to the header of every object it scans, so the
+first collection in each worker would copy most of those pages. ``gc.freeze()``
+moves everything allocated so far into a permanent generation that the
+collector ignores. Disable the GC while the master loads (``gc.disable()``)
+so freed objects don't leave holes in the pages, and call ``post_fork()``
+early in each worker to turn it back on.
+"""
+
+import gc
+import logging
+import time
+from typing import Callable, Dict, List, Tuple
+
+from flask import Flask
+from sqlalchemy.orm import Session
+
+from backend.services.database import database
+
+logger = logging.getLogger(__name__)
+
+
+def _import_providers(app: Flask):
+    import backend.services.translator_pool  # noqa: F401
+    import bs4  # noqa: F401
+
+
+def _compile_templates(app: Flask):
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+
+
+def _load_glossary_snapshot(app: Flask):
+    from backend.services.glossary_snapshot import glossary_snapshot
+    if app.config.get('GLOSSARY_SNAPSHOT'):
+        glossary_snapshot.refresh(database.read_engine)
+
+
+def _map_compiled_glossary(app: Flask):
+    from backend.services.compiled_glossary import compiled_glossary
+    compiled_glossary.info()
+
+
+def _load_related_index(app: Flask):
+    from backend.services.related_terms import related_index
+    with Session(database.read_engine) as session:
+        related_index.refresh(session)
+
+
+def _load_polling_places(app: Flask):
+    from backend.services.polling_places import polling_places
+    polling_places.get()
+
+
+WARMERS: List[Tuple[str, Callable[[Flask], None]]] = [
+    ('providers', _import_providers),
+    ('templates', _compile_templates),
+    ('glossary snapshot', _load_glossary_snapshot),
+    ('compiled glossary', _map_compiled_glossary),
+    ('related index', _load_related_index),
+    ('polling places', _load_polling_places),
+]
+
+
+def warm(app: Flask) -> Dict[str, float]:
+    """Run each warmer; returns milliseconds per warmer. A failing warmer is logged and skipped."""
+    timings = {}
+    for name, warmer in WARMERS:
+        start = time.perf_counter()
+        try:
+            warmer(app)
+        except Exception as e:
+            logger.warning(f"Preload {name} skipped: {str(e)}")
+            continue
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+    return timings
+
+
+def preload(app: Flask) -> Dict[str, float]:
+    """Warm caches in the master, drop its DB connections, and freeze the heap before forking"""
+    gc.disable()
+    timings = warm(app)
+    # Connections must not be shared across processes; each worker opens its own
+    for engine in database.engines:
+        engine.dispose()
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Preloaded {timings}; {gc.get_freeze_count()} objects frozen")
+    return timings
+
+
+def post_fork():
+    """Call first thing in each worker: the frozen objects stay out of the worker's collections"""
+    gc.enable()
@@ -0,0 +1,370 @@
+"""
+Opt-in per-request profiling and lightweight trace spans.
+
+An authorized (admin) request can send ``X-CivicLink-Profile`` with one of:
+
+- ``trace``       record trace spans only
+- ``cprofile``    deterministic cProfile of the request (``.prof``, open with
+                  snakeviz or convert with flameprof)
+- ``sample``      sampling profiler; writes collapsed stacks (``.folded``)
+                  that flamegraph.pl and speedscope read directly
+- ``tracemalloc`` allocation diff between request start and end (``.txt``)
+
+Every mode also records trace spans: ``span()`` blocks around the translation
+stages and each SQL statement. Spans are summarized in a ``Server-Timing``
+response header and saved as a Chrome trace-event file (``.trace.json``,
+loadable in Perfetto / chrome://tracing). Artifacts land in ``PROFILE_DIR`` and
+the response carries their id in ``X-CivicLink-Profile-Id``; fetch them from
+``/api/profiles/<id>/<artifact>``. Only the newest ``PROFILE_KEEP`` profiles
+are kept.
+
+Outside a traced request ``span()`` costs one ContextVar lookup.
+"""
+
+import cProfile
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+PROFILE_HEADER = 'X-CivicLink-Profile'
+PROFILE_ID_HEADER = 'X-CivicLink-Profile-Id'
+PROFILE_STATUS_HEADER = 'X-CivicLink-Profile-Status'
+PROFILE_MODES = frozenset({'trace', 'cprofile', 'sample', 'tracemalloc'})
+PROFILE_DIR = os.environ.get('CIVICLINK_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'civiclink-profiles'))
+PROFILE_KEEP = int(os.environ.get('CIVICLINK_PROFILE_KEEP', 200))  # profiles (all their artifacts) kept on disk
+SAMPLE_INTERVAL = 0.001  # seconds between stack samples
+TRACEMALLOC_TOP = 25
+
+_PROFILE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+_ARTIFACT_SUFFIXES = {
+    'trace': '.trace.json',
+    'cprofile': '.prof',
+    'sample': '.folded',
+    'tracemalloc': '.tracemalloc.txt',
+}
+
+_current_trace: ContextVar[Optional['Trace']] = ContextVar('civiclink_trace', default=None)
+
+# cProfile and tracemalloc are process-wide enough that overlapping runs would
+# pollute each other; only one heavy profile runs at a time
+_heavy_profile_lock = threading.Lock()
+
+
+class Trace:
+    """Spans recorded during one request"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.spans: List[tuple] = []  # (name, start, duration, thread id, attrs)
+
+    def add(self, name: str, start: float, duration: float, attrs: Dict):
+        self.spans.append((name, start, duration, threading.get_ident(), attrs))
+
+    def server_timing(self) -> str:
+        """Aggregate span durations by name into a Server-Timing header value"""
+        totals: Dict[str, float] = {}
+        for name, _, duration, _, _ in self.spans:
+            totals[name] = totals.get(name, 0.0) + duration
+        total = time.perf_counter() - self.start
+        parts = [f'{re.sub(r"[^A-Za-z0-9_.-]", "_", name)};dur={seconds * 1000:.3f}' for name, seconds in totals.items()]
+        parts.append(f'total;dur={total * 1000:.3f}')
+        return ', '.join(parts)
+
+    def to_chrome_trace(self) -> Dict:
+        """Chrome trace-event format (complete events, microseconds)"""
+        pid = os.getpid()
+        events = [{
+            'name': self.name, 'ph': 'X', 'pid': pid, 'tid': threading.get_ident(),
+            'ts': 0, 'dur': (time.perf_counter() - self.start) * 1e6,
+        }]
+        for name, start, duration, tid, attrs in self.spans:
+            events.append({
+                'name': name, 'ph': 'X', 'pid': pid, 'tid': tid,
+                'ts': (start - self.start) * 1e6, 'dur': duration * 1e6,
+                'args': {key: str(value) for key, value in attrs.items()},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Record a timed span if the current request is being traced"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter() - start, attrs)
+
+
+@contextmanager
+def start_trace(name: str):
+    """Trace everything inside the block (used by the request hooks and scripts)"""
+    trace = Trace(name)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval into collapsed stacks"""
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='civiclink-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class RequestProfile:
+    """Runs one profiling mode around a request and writes its artifacts"""
+
+    def __init__(self, mode: str, name: str):
+        self.mode = mode
+        self.id = uuid.uuid4().hex
+        self.trace = Trace(name)
+        self._token = None
+        self._profiler = None
+        self._sampler = None
+        self._tracemalloc_started = False
+        self._snapshot = None
+        self._holds_lock = False
+        self.status = 'ok'
+
+    def start(self):
+        self._token = _current_trace.set(self.trace)
+        if self.mode in ('cprofile', 'tracemalloc'):
+            self._holds_lock = _heavy_profile_lock.acquire(blocking=False)
+            if not self._holds_lock:
+                # Another heavy profile is running; fall back to spans only
+                self.status = 'busy'
+                return
+        if self.mode == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.mode == 'sample':
+            self._sampler = SamplingProfiler(threading.get_ident())
+            self._sampler.start()
+        elif self.mode == 'tracemalloc':
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracemalloc_started = True
+            self._snapshot = tracemalloc.take_snapshot()
+
+    def stop(self) -> List[str]:
+        """Stop profiling, write artifacts and return their names"""
+        artifacts = {}
+        try:
+            if self._profiler is not None:
+                self._profiler.disable()
+                path = self._path('cprofile')
+                self._profiler.dump_stats(path)
+                artifacts['cprofile'] = path
+            if self._sampler is not None:
+                artifacts['sample'] = self._write('sample', self._sampler.stop())
+            if self._snapshot is not None:
+                after = tracemalloc.take_snapshot()
+                stats = after.compare_to(self._snapshot, 'lineno')[:TRACEMALLOC_TOP]
+                current, peak = tracemalloc.get_traced_memory()
+                report = [f'traced memory: current={current} peak={peak}', *map(str, stats)]
+                artifacts['tracemalloc'] = self._write('tracemalloc', '\n'.join(report) + '\n')
+            artifacts['trace'] = self._write('trace', json.dumps(self.trace.to_chrome_trace()))
+        finally:
+            self.close()
+        prune_profiles()
+        return sorted(artifacts)
+
+    def close(self):
+        """Disable the profilers and release the heavy-profile lock; safe to call more than once"""
+        try:
+            if self._profiler is not None:
+                self._profiler.disable()
+            if self._sampler is not None:
+                self._sampler.stop()
+            if self._tracemalloc_started:
+                self._tracemalloc_started = False
+                tracemalloc.stop()
+        finally:
+            if self._holds_lock:
+                self._holds_lock = False
+                _heavy_profile_lock.release()
+            self.reset()
+
+    def reset(self):
+        if self._token is not None:
+            _current_trace.reset(self._token)
+            self._token = None
+
+    def _path(self, artifact: str) -> str:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        return os.path.join(PROFILE_DIR, f'{self.id}{_ARTIFACT_SUFFIXES[artifact]}')
+
+    def _write(self, artifact: str, content: str) -> str:
+        path = self._path(artifact)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+
+def prune_profiles(keep: Optional[int] = None):
+    """Delete all but the newest ``keep`` profiles (default ``PROFILE_KEEP``) from ``PROFILE_DIR``"""
+    keep = PROFILE_KEEP if keep is None else keep
+    newest: Dict[str, float] = {}
+    try:
+        entries = list(os.scandir(PROFILE_DIR))
+    except OSError:
+        return
+    for entry in entries:
+        profile_id = entry.name[:32]
+        if _PROFILE_ID_PATTERN.match(profile_id):
+            try:
+                newest[profile_id] = max(newest.get(profile_id, 0.0), entry.stat().st_mtime)
+            except FileNotFoundError:
+                pass
+    if len(newest) <= keep:
+        return
+    expired = set(sorted(newest, key=newest.get, reverse=True)[keep:])
+    for entry in entries:
+        if entry.name[:32] in expired:
+            try:
+                os.remove(entry.path)
+            except OSError:  # pruned concurrently
+                pass
+
+
+def artifact_path(profile_id: str, artifact: str) -> Optional[str]:
+    """Resolve a stored artifact, refusing anything that is not a known id/kind"""
+    if not _PROFILE_ID_PATTERN.match(profile_id) or artifact not in _ARTIFACT_SUFFIXES:
+        return None
+    path = os.path.join(PROFILE_DIR, f'{profile_id}{_ARTIFACT_SUFFIXES[artifact]}')
+    return path if os.path.exists(path) else None
+
+
+def token_authorizer(token: Optional[str]) -> Callable[[], bool]:
+    """Authorize requests whose Bearer token equals ``token`` (disabled when unset)"""
+    import hmac
+
+    def authorize() -> bool:
+        from flask import request
+        if not token:
+            return False
+        supplied = request.headers.get('Authorization', '').replace('Bearer ', '', 1).strip()
+        return hmac.compare_digest(supplied.encode(), token.encode())
+    return authorize
+
+
+def instrument_profiling(app, authorize: Callable[[], bool]):
+    """
+    Enable opt-in profiling on a Flask app. ``authorize()`` decides, per
+    request, whether the caller may profile (admins only).
+    """
+    from flask import abort, g, request, send_file
+
+    @app.before_request
+    def _start_profile():
+        mode = request.headers.get(PROFILE_HEADER, '').strip().lower()
+        if mode not in PROFILE_MODES or request.endpoint == 'download_profile':
+            return
+        try:
+            allowed = authorize()
+        except Exception:
+            allowed = False
+        if not allowed:
+            g._profile_denied = True
+            return
+        profile = RequestProfile(mode, f'{request.method} {request.path}')
+        profile.start()
+        g._request_profile = profile
+
+    @app.after_request
+    def _finish_profile(response):
+        # Left on g for the teardown, which cleans up if this hook never gets to stop()
+        profile = g.get('_request_profile')
+        if profile is not None:
+            response.headers['Server-Timing'] = profile.trace.server_timing()
+            profile.stop()
+            response.headers[PROFILE_ID_HEADER] = profile.id
+            response.headers[PROFILE_STATUS_HEADER] = profile.status
+        elif g.pop('_profile_denied', False):
+            response.headers[PROFILE_STATUS_HEADER] = 'forbidden'
+        return response
+
+    @app.teardown_request
+    def _reset_profile(exc):
+        profile = g.pop('_request_profile', None)
+        if profile is not None:
+            profile.close()
+
+    def download_profile(profile_id, artifact):
+        """Download a stored profile artifact (admins only)"""
+        if not authorize():
+            abort(403)
+        path = artifact_path(profile_id, artifact)
+        if path is None:
+            abort(404)
+        return send_file(path, as_attachment=True)
+
+    app.add_url_rule('/api/profiles/<profile_id>/<artifact>', 'download_profile', download_profile)
+    return app
+
+
+def instrument_engine(engine):
+    """Record a trace span for every SQL statement executed on an engine"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_trace.get() is not None:
+            conn.info.setdefault('_trace_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        trace = _current_trace.get()
+        starts = conn.info.get('_trace_query_start')
+        if trace is not None and starts:
+            start = starts.pop()
+            operation = statement.lstrip().split(None, 1)[0].upper() if statement else 'UNKNOWN'
+            trace.add(f'db.{operation.lower()}', start, time.perf_counter() - start,
+                      {'statement': statement[:200]})
+
+    return engine
@@ -0,0 +1,128 @@
+"""
+Related-term expansion for the glossary API.
+
+``Translation.related_terms`` is a JSON list of translation IDs. To show
+them, a client used to call ``GET /api/translations/<id>`` once per ID,
+and every such call also bumped ``usage_count`` and committed.
+
+- ``expand_related`` collects the referenced IDs across a whole page and
+  loads them with one ``IN`` query. A page costs the same number of queries
+  however many related terms it has.
+- ``RelatedIndex`` keeps the ``id -> related ids`` graph in memory for
+  multi-hop traversal ("related to related"). It is rebuilt from a single
+  two-column scan every ``INDEX_TTL_SECONDS`` or after ``invalidate()``.
+  A change signature would not work here: ``updated_at`` moves on every
+  detail view because of the usage increment.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.models.Translation import Translation
+
+logger = logging.getLogger(__name__)
+
+EXPANDABLE = frozenset({'related_terms'})
+SUMMARY_FIELDS = ('id', 'english', 'translated', 'language', 'category', 'verified')
+MAX_DEPTH = 3
+IN_CHUNK_SIZE = 900  # below SQLite's default bound-parameter limit
+INDEX_TTL_SECONDS = 300
+
+
+def parse_expand(value: Optional[str]) -> Set[str]:
+    """``expand=a,b`` -> {'a', 'b'}; raises ValueError for unknown fields"""
+    fields = {field.strip() for field in (value or '').split(',') if field.strip()}
+    unknown = fields - EXPANDABLE
+    if unknown:
+        raise ValueError(f"Cannot expand: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def related_ids(value) -> Tuple[int, ...]:
+    """The valid IDs in a ``related_terms`` value, in order"""
+    if not isinstance(value, (list, tuple)):
+        return ()
+    return tuple(item for item in value if isinstance(item, int) and not isinstance(item, bool))
+
+
+def summarize(translation) -> Dict:
+    return {field: getattr(translation, field) for field in SUMMARY_FIELDS}
+
+
+def load_summaries(session, ids: Iterable[int]) -> Dict[int, Dict]:
+    """id -> summary for the given IDs, one IN query per ``IN_CHUNK_SIZE`` IDs"""
+    ids = sorted(set(ids))
+    summaries = {}
+    columns = [getattr(Translation, field) for field in SUMMARY_FIELDS]
+    for start in range(0, len(ids), IN_CHUNK_SIZE):
+        for row in session.query(*columns).filter(Translation.id.in_(ids[start:start + IN_CHUNK_SIZE])):
+            summaries[row.id] = summarize(row)
+    return summaries
+
+
+def expand_related(session, translations: List[Translation],
+                   summaries: Optional[Callable[[Iterable[int]], Dict[int, Dict]]] = None) -> List[Dict]:
+    """``to_dict()`` for each translation with ``related_terms`` resolved to summaries
+
+    ``summaries`` looks the IDs up elsewhere (the in-memory snapshot) instead of one IN query.
+    """
+    wanted = {term_id for translation in translations for term_id in related_ids(translation.related_terms)}
+    summaries = summaries(wanted) if summaries else load_summaries(session, wanted)
+    results = []
+    for translation in translations:
+        data = translation.to_dict()
+        # IDs that no longer exist are dropped
+        data['related_terms'] = [summaries[term_id] for term_id in related_ids(translation.related_terms)
+                                 if term_id in summaries]
+        results.append(data)
+    return results
+
+
+class RelatedIndex:
+    """In-memory adjacency lists for multi-hop related-term traversal"""
+
+    def __init__(self, ttl: float = INDEX_TTL_SECONDS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._built_at: Optional[float] = None
+        self._adjacency: Dict[int, Tuple[int, ...]] = {}
+
+    def refresh(self, session) -> Dict[int, Tuple[int, ...]]:
+        """Current adjacency, rebuilt when older than the TTL"""
+        with self._lock:
+            if self._built_at is None or time.monotonic() - self._built_at > self.ttl:
+                adjacency = {}
+                for term_id, value in session.query(Translation.id, Translation.related_terms):
+                    ids = related_ids(value)
+                    if ids:
+                        adjacency[term_id] = ids
+                self._adjacency = adjacency
+                self._built_at = time.monotonic()
+                logger.info(f"Related-term index rebuilt: {len(adjacency)} terms with links")
+            return self._adjacency
+
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+
+    def neighbors(self, session, term_id: int, depth: int = 1) -> Dict[int, int]:
+        """Breadth-first ``id -> hops`` for terms within ``depth`` hops of ``term_id`` (excluding it)"""
+        adjacency = self.refresh(session)
+        hops = {term_id: 0}
+        queue = deque([term_id])
+        while queue:
+            current = queue.popleft()
+            if hops[current] >= depth:
+                continue
+            for neighbor in adjacency.get(current, ()):
+                if neighbor not in hops:
+                    hops[neighbor] = hops[current] + 1
+                    queue.append(neighbor)
+        del hops[term_id]
+        return hops
+
+
+related_index = RelatedIndex()
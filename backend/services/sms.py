@@ -0,0 +1,290 @@
+"""
+SMS shortcodes: inbound parsing, reply tables and batched outbound delivery.
+
+The help page advertises ``VOTE 12345``, ``EARLY 12345``, ``DEADLINE``,
+``REGISTER`` and ``ID`` (``SMS_SHORTCODES``). On election day thousands
+of these arrive per second, so the per-message path does no I/O and
+little work:
+- **Parsing** uppercases and splits the first few words. The keyword
+  is one dict lookup (``KEYWORDS``); a 5-digit ZIP (or ZIP+4) and a
+  language code (``VOTE 12345 ES``) may follow in any order.
+- **Reply tables** are built once per static-translation artifact version.
+  Each (command, language) pair maps to a template taken from the
+  precompiled static translations (``python precompile_static.py`` picks
+  up ``static_texts()`` below). A translated template that lost a
+  placeholder falls back to English.
+- **Polling places**: ``VOTE``/``EARLY`` with a ZIP name the nearest
+  location (``polling_places``, a KD-tree query) when the dataset covers
+  that ZIP, and otherwise link to the finder.
+- **Outbound** replies are queued and sent by a background thread in
+  batches of up to ``MAX_BATCH``, waiting at most ``MAX_DELAY``. A burst
+  costs one gateway request per batch, not one per message. When the
+  queue is full, the webhook answers 503 so the gateway retries later.
+
+Without ``SMS_GATEWAY_URL`` the webhook returns the reply in its response
+body instead (for gateways that send the webhook response as the SMS).
+"""
+
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from string import Formatter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from backend.services.languages import GLOSSARY_LANGUAGES
+from backend.services.metrics import SMS_MESSAGES, SMS_OUTBOUND
+from backend.services.polling_places import polling_places
+from backend.services.static_translations import static_translations
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_URL = os.environ.get('CIVICLINK_PUBLIC_URL', 'http://localhost:5000').rstrip('/')
+GATEWAY_URL = os.environ.get('SMS_GATEWAY_URL')
+GATEWAY_TOKEN = os.environ.get('SMS_GATEWAY_TOKEN')
+MAX_BODY_CHARS = 1600  # longest concatenated SMS
+MAX_WORDS = 4
+MAX_BATCH = 100
+MAX_DELAY = 0.05  # seconds a reply may wait for its batch to fill
+MAX_QUEUE = 50_000
+SEND_TIMEOUT = 10
+
+REPLY_LANGUAGES = ('en', *(lang.code for lang in GLOSSARY_LANGUAGES))
+_REPLY_LANGUAGE_CODES = frozenset(REPLY_LANGUAGES)
+_ZIP = re.compile(r'^(\d{5})(?:-\d{4})?$')
+
+# English reply templates; {zip}, {place} and {url} are filled in per message
+REPLY_TEMPLATES = {
+    'vote': 'CivicLink: find your polling place for ZIP {zip} at {url}/vote?zip={zip}',
+    'vote_place': 'CivicLink: polling place nearest ZIP {zip}: {place}. More: {url}/vote?zip={zip}',
+    'vote_usage': 'CivicLink: text VOTE and your 5-digit ZIP code, for example VOTE 12345',
+    'early': 'CivicLink: early voting locations near ZIP {zip}: {url}/early-voting?zip={zip}',
+    'early_place': 'CivicLink: early voting nearest ZIP {zip}: {place}. More: {url}/early-voting?zip={zip}',
+    'early_usage': 'CivicLink: text EARLY and your 5-digit ZIP code, for example EARLY 12345',
+    'deadline': 'CivicLink: registration and mail ballot deadlines for your state: {url}/deadlines',
+    'register': 'CivicLink: check your voter registration status at {url}/register',
+    'id': 'CivicLink: what ID to bring when you vote: {url}/voter-id',
+    'help': ('CivicLink: text VOTE 12345, EARLY 12345, DEADLINE, REGISTER or ID. '
+             'Add a language code for another language, for example VOTE 12345 ES'),
+}
+# Keyword -> (command, reply key without a ZIP, reply key with a ZIP)
+KEYWORDS: Dict[str, Tuple[str, str, str]] = {
+    'VOTE': ('vote', 'vote_usage', 'vote'),
+    'EARLY': ('early', 'early_usage', 'early'),
+    'DEADLINE': ('deadline', 'deadline', 'deadline'),
+    'DEADLINES': ('deadline', 'deadline', 'deadline'),
+    'REGISTER': ('register', 'register', 'register'),
+    'ID': ('id', 'id', 'id'),
+    'HELP': ('help', 'help', 'help'),
+    'INFO': ('help', 'help', 'help'),
+}
+_UNKNOWN = ('unknown', 'help', 'help')
+# Reply key with a ZIP -> (reply key naming the nearest place, polling place type)
+PLACE_REPLIES = {'vote': ('vote_place', None), 'early': ('early_place', 'early')}
+
+
+def static_texts():
+    """Reply templates precompiled into every language by precompile_static.py"""
+    for template in REPLY_TEMPLATES.values():
+        yield template, 'en'
+
+
+class Inbound(NamedTuple):
+    sender: str
+    command: str
+    reply_key: str
+    zip: Optional[str]
+    language: str
+
+
+def parse_message(sender: str, body: str, default_language: str = 'en') -> Inbound:
+    words = (body or '')[:MAX_BODY_CHARS].upper().split(None, MAX_WORDS)[:MAX_WORDS]
+    command, without_zip, with_zip = KEYWORDS.get(words[0], _UNKNOWN) if words else _UNKNOWN
+    zip_code = None
+    language = default_language if default_language in _REPLY_LANGUAGE_CODES else 'en'
+    for word in words[1:]:
+        match = _ZIP.match(word)
+        if match:
+            zip_code = match.group(1)
+        elif word.lower() in _REPLY_LANGUAGE_CODES:
+            language = word.lower()
+    return Inbound(sender, command, with_zip if zip_code else without_zip, zip_code, language)
+
+
+def _fields(template: str) -> frozenset:
+    return frozenset(name for _, name, _, _ in Formatter().parse(template) if name)
+
+
+class ReplyTable:
+    """(reply key, language) -> template, rebuilt when the static translations change"""
+
+    def __init__(self, translations=static_translations, url: str = PUBLIC_URL):
+        self.translations = translations
+        self.url = url
+        self._version = object()  # never equal to an artifact version, including None (no artifact)
+        self._table: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+    def _build(self) -> Dict[Tuple[str, str], str]:
+        table = {}
+        for key, english in REPLY_TEMPLATES.items():
+            expected = _fields(english)
+            for language in REPLY_LANGUAGES:
+                template = self.translations.get(english, language)
+                try:
+                    valid = _fields(template) == expected
+                except ValueError:  # unbalanced braces
+                    valid = False
+                # Fill {url} now; only {zip} and {place} are left for reply time
+                table[key, language] = (template if valid else english).replace('{url}', self.url)
+        return table
+
+    def reply(self, message: Inbound, place: Optional[str] = None) -> str:
+        """The reply text; ``place`` switches a VOTE/EARLY reply to the one naming that location"""
+        if self._version != self.translations.version:
+            with self._lock:
+                if self._version != self.translations.version:
+                    self._table = self._build()
+                    self._version = self.translations.version
+        key = PLACE_REPLIES[message.reply_key][0] if place else message.reply_key
+        template = self._table[key, message.language]
+        return template.format(zip=message.zip, place=place) if message.zip else template
+
+
+reply_table = ReplyTable()
+
+
+def handle_message(sender: str, body: str, default_language: str = 'en') -> Tuple[Inbound, str]:
+    """Parse an inbound SMS and pick its reply"""
+    message = parse_message(sender, body, default_language)
+    SMS_MESSAGES.labels(message.command, message.language).inc()
+    return message, reply_table.reply(message, nearest_place(message))
+
+
+def nearest_place(message: Inbound) -> Optional[str]:
+    """'Name, address, city' of the closest polling place to the message's ZIP, if the dataset has one"""
+    if message.reply_key not in PLACE_REPLIES:
+        return None
+    index = polling_places.get()
+    nearest = index.near_zip(message.zip, k=1, kind=PLACE_REPLIES[message.reply_key][1]) if index else None
+    if not nearest:
+        return None
+    place = nearest[0][0]
+    return ', '.join(part for part in (place.name, place.address, place.city) if part)
+
+
+Outbound = Dict[str, str]  # {'to': ..., 'body': ...}
+
+
+class OutboundBatcher:
+    """Background sender that groups queued replies into batched gateway calls"""
+
+    def __init__(self, send: Callable[[List[Outbound]], None], max_batch: int = MAX_BATCH,
+                 max_delay: float = MAX_DELAY, max_queue: int = MAX_QUEUE):
+        self.send = send
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: 'queue.Queue[Optional[Outbound]]' = queue.Queue(max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._submit_lock = threading.Lock()
+        self.batches = 0
+
+    def submit(self, to: str, body: str) -> bool:
+        """Queue a reply; False when the queue is full"""
+        return self.submit_many([{'to': to, 'body': body}])
+
+    def submit_many(self, replies: List[Outbound]) -> bool:
+        """Queue all of ``replies`` or none of them; False when they don't all fit"""
+        if self._thread is None:
+            self._start()
+        # Only producers take this lock and the sender only drains, so the room checked here stays free
+        with self._submit_lock:
+            if self._queue.maxsize and self._queue.maxsize - self._queue.qsize() < len(replies):
+                SMS_OUTBOUND.labels('dropped').inc(len(replies))
+                return False
+            for reply in replies:
+                self._queue.put_nowait(reply)
+        return True
+
+    def _start(self):
+        # Started on first use, i.e. in the worker process rather than a pre-fork master
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='sms-outbound', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._deliver(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _deliver(self, batch: List[Outbound]):
+        self.batches += 1
+        try:
+            self.send(batch)
+        except Exception as e:
+            SMS_OUTBOUND.labels('failed').inc(len(batch))
+            logger.error(f"SMS batch of {len(batch)} failed: {str(e)}")
+        else:
+            SMS_OUTBOUND.labels('sent').inc(len(batch))
+
+    def flush(self):
+        """Block until every queued reply has been handed to the gateway"""
+        self._queue.join()
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+def http_sender(url: str, token: Optional[str] = None) -> Callable[[List[Outbound]], None]:
+    """POST {'messages': [...]} batches to a gateway over one keep-alive session"""
+    import requests  # only needed once a gateway is configured
+
+    session = requests.Session()
+    if token:
+        session.headers['Authorization'] = f'Bearer {token}'
+
+    def send(batch: List[Outbound]):
+        session.post(url, json={'messages': batch}, timeout=SEND_TIMEOUT).raise_for_status()
+    return send
+
+
+_outbound: Optional[OutboundBatcher] = None
+_outbound_lock = threading.Lock()
+
+
+def outbound() -> Optional[OutboundBatcher]:
+    """The process-wide batcher for SMS_GATEWAY_URL, or None when replies go back inline"""
+    global _outbound
+    if GATEWAY_URL is None:
+        return None
+    if _outbound is None:
+        with _outbound_lock:
+            if _outbound is None:
+                _outbound = OutboundBatcher(http_sender(GATEWAY_URL, GATEWAY_TOKEN))
+    return _outbound
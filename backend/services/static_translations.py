@@ -0,0 +1,204 @@
+"""
+Pre-translated static page content.
+
+The help page and translation assistant ship fixed English copy (FAQ entries,
+SMS shortcode descriptions, civic term explanations). ``python
+precompile_static.py`` translates every string into every registered
+language once and writes a versioned artifact
+(``backend/data/static_translations.json``). At runtime the artifact is
+loaded once and the pages look strings up there, so serving a language never
+calls the provider.
+
+Entries are keyed by a hash of the source text and its language. Editing a
+string changes its key, so the old entry counts as stale: it is recompiled on
+the next run and dropped from the artifact. Unchanged strings are reused
+without any provider calls. A string with no entry is served in its source
+language and labelled with it, not as a translation.
+
+The artifact is a build output: run ``python precompile_static.py`` when
+deploying (it needs the provider) so that pages are not served in English.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from backend.services.languages import CIVIC_LANGUAGES, resolve
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'static_translations.json')
+ARTIFACT_SCHEMA = 1
+
+# (text, source language code) pairs collected from the page modules
+Source = Tuple[str, str]
+
+
+def content_hash(text: str, source_language: str = 'en') -> str:
+    """Stable key for one source string"""
+    return hashlib.blake2b(f'{source_language}\0{text}'.encode('utf-8'), digest_size=10).hexdigest()
+
+
+def language_code(language: str, default: str = 'en') -> str:
+    """Civic code for an ISO code or language name ('Spanish' -> 'es')"""
+    lang = resolve(language)
+    return lang.code if lang else default
+
+
+class CompileReport(NamedTuple):
+    version: str
+    translated: int  # (string, language) pairs sent to the provider
+    reused: int  # pairs copied from the previous artifact
+    failed: int  # pairs left untranslated (served in the source language)
+    removed: int  # stale entries dropped
+
+    @property
+    def provider_calls(self) -> int:
+        return self.translated + self.failed
+
+
+class StaticTranslations:
+    """Read-only view of a compiled artifact"""
+
+    def __init__(self, artifact: Optional[Dict] = None):
+        artifact = artifact or {}
+        self.version: Optional[str] = artifact.get('version')
+        self.languages: List[str] = artifact.get('languages', [])
+        self.entries: Dict[str, Dict] = artifact.get('entries', {})
+
+    @classmethod
+    def load(cls, path: str = ARTIFACT_PATH) -> 'StaticTranslations':
+        try:
+            with open(path, encoding='utf-8') as f:
+                artifact = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable static translations artifact {path}: {str(e)}")
+            return cls()
+        if artifact.get('schema') != ARTIFACT_SCHEMA:
+            logger.warning(f"Ignoring static translations artifact with schema {artifact.get('schema')}")
+            return cls()
+        return cls(artifact)
+
+    def lookup(self, text: str, language: str, source_language: str = 'en') -> Optional[str]:
+        """``text`` in ``language``, or None if it has no compiled translation"""
+        if not text or language == source_language:
+            return text
+        entry = self.entries.get(content_hash(text, source_language))
+        if entry is None:
+            return None
+        return entry['translations'].get(language)
+
+    def get(self, text: str, language: str, source_language: str = 'en') -> str:
+        """``text`` in ``language``; the source text if it has no compiled translation"""
+        translated = self.lookup(text, language, source_language)
+        return text if translated is None else translated
+
+    def stale(self, sources: Iterable[Source], languages: Sequence[str]) -> List[Source]:
+        """Sources that are missing from the artifact or lack one of ``languages``"""
+        missing = []
+        for text, source_language in dict.fromkeys(sources):
+            entry = self.entries.get(content_hash(text, source_language))
+            translations = entry['translations'] if entry else {}
+            if any(code != source_language and code not in translations for code in languages):
+                missing.append((text, source_language))
+        return missing
+
+
+def target_languages() -> List[str]:
+    """Every registered language"""
+    return [lang.code for lang in CIVIC_LANGUAGES]
+
+
+def _artifact_version(entries: Dict[str, Dict], languages: Sequence[str]) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(','.join(languages).encode('utf-8'))
+    for key in sorted(entries):
+        digest.update(key.encode('utf-8'))
+        for code, text in sorted(entries[key]['translations'].items()):
+            digest.update(f'\0{code}\0{text}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _pipeline_translator() -> Callable[[str, str, str], Optional[str]]:
+    from backend.services.pipeline.engine import build_pipeline
+
+    pipeline = build_pipeline('precompile')
+
+    def translate(text: str, target_language: str, source_language: str) -> Optional[str]:
+        result = pipeline.run(text, target_language, source_language)
+        if not result.get('success') or result.get('failed_chunks'):
+            return None
+        return result['translated_text']
+
+    return translate
+
+
+def compile_static_translations(sources: Iterable[Source], path: str = ARTIFACT_PATH,
+                                languages: Optional[Sequence[str]] = None,
+                                translate: Optional[Callable[[str, str, str], Optional[str]]] = None,
+                                workers: int = 8) -> CompileReport:
+    """
+    Translate ``sources`` into ``languages`` (default: every registered
+    language), reusing the previous artifact's translations for unchanged
+    strings, and atomically rewrite the artifact.
+    ``translate(text, target, source)`` returns None on failure.
+    """
+    languages = list(languages or target_languages())
+    translate = translate or _pipeline_translator()
+    previous = StaticTranslations.load(path).entries
+
+    entries, work = {}, []
+    for text, source_language in dict.fromkeys(sources):
+        key = content_hash(text, source_language)
+        old = previous.get(key, {}).get('translations', {})
+        translations = {code: old[code] for code in languages if code != source_language and code in old}
+        entries[key] = {'source': text, 'source_language': source_language, 'translations': translations}
+        work += [(key, code) for code in languages if code != source_language and code not in translations]
+    reused = sum(len(entry['translations']) for entry in entries.values())
+
+    def run(item):
+        key, code = item
+        entry = entries[key]
+        try:
+            return item, translate(entry['source'], code, entry['source_language'])
+        except Exception as e:
+            logger.error(f"Precompiling {key} into {code} failed: {str(e)}")
+            return item, None
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for (key, code), translated in executor.map(run, work):
+            if translated is None:
+                failed += 1
+            else:
+                entries[key]['translations'][code] = translated
+
+    version = _artifact_version(entries, languages)
+    artifact = {
+        'schema': ARTIFACT_SCHEMA,
+        'version': version,
+        'generated_at': datetime.utcnow().isoformat(),
+        'languages': languages,
+        'entries': dict(sorted(entries.items())),
+    }
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, indent=1, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+    removed = len(set(previous) - set(entries))
+    return CompileReport(version, len(work) - failed, reused, failed, removed)
+
+
+# Loaded once; the page handlers only read from it
+static_translations = StaticTranslations.load()
+if static_translations.version is None:
+    logger.warning(f"No static translations artifact at {ARTIFACT_PATH}; static pages are served untranslated "
+                   f"until `python precompile_static.py` is run")
@@ -0,0 +1,297 @@
+"""
+Durable outbox for contact-support requests.
+
+The support form should answer just as fast when the mail or ticketing
+system behind it is slow or down. So ``submit`` does one INSERT into an
+SQLite outbox and returns. The outbox is its own file with the WAL profile
+from ``database.py``, so a long glossary import never holds its lock. A
+background dispatcher thread then:
+- claims up to ``BATCH_SIZE`` due rows in one write transaction by moving
+  their ``next_attempt_at`` out by ``LEASE_SECONDS``. Several worker
+  processes can share the outbox, and none picks up a row another still
+  holds.
+- hands the batch to the sink and deletes the rows it delivered. A
+  submit wakes the dispatcher, which waits ``MAX_DELAY`` so a burst goes
+  out as one batch.
+- for each row the sink reports as failed (or every row, when it raises),
+  retries with exponential backoff
+  (``RETRY_BASE_SECONDS`` doubling up to ``RETRY_MAX_SECONDS``). After
+  ``MAX_ATTEMPTS`` the rows are parked (``next_attempt_at`` NULL) with
+  their last error until ``requeue_parked()``. While deliveries fail,
+  the dispatcher only polls; new submits don't trigger another attempt.
+
+Delivery is at least once. If a process dies mid-batch, its rows are
+claimed again when the lease runs out. WAL commits with
+``synchronous=NORMAL`` survive a crashed process, though not a power cut
+before the next checkpoint.
+
+Sinks are callables taking a list of requests, like the SMS gateway
+sender. They return ``{request id: error}`` for the requests they could not
+deliver (None when all went out), so one bad request is retried or parked
+on its own without re-sending the rest. ``SUPPORT_SINK`` picks one: a JSON-lines file path (the default,
+next to the database) or ``smtp://host:port``, which sends to
+``SUPPORT_EMAIL_TO``.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import Column, Float, Integer, MetaData, Table, Text, bindparam, delete, func, select, update
+from sqlalchemy.engine import Engine, make_url
+
+from backend.services.database import create_configured_engine, is_sqlite
+from backend.services.metrics import SUPPORT_OUTBOX
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50
+MAX_DELAY = 0.05  # seconds a woken dispatcher lets a burst fill the batch
+POLL_SECONDS = 1.0  # how often an idle dispatcher looks for retries and other processes' rows
+LEASE_SECONDS = 60.0  # a claimed batch is re-delivered if not settled by then
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 2.0
+RETRY_MAX_SECONDS = 15 * 60.0
+SMTP_TIMEOUT = 10
+
+metadata = MetaData()
+outbox_table = Table(
+    'support_outbox', metadata,
+    Column('id', Integer, primary_key=True, autoincrement=True),
+    Column('payload', Text, nullable=False),  # JSON request
+    Column('created_at', Float, nullable=False),
+    Column('attempts', Integer, nullable=False, default=0),
+    Column('next_attempt_at', Float, index=True),  # NULL: parked after MAX_ATTEMPTS
+    Column('last_error', Text),
+)
+
+# Built once: constructing a statement costs more than executing the insert
+_INSERT = outbox_table.insert()
+_RETRY = update(outbox_table).where(outbox_table.c.id == bindparam('row_id')).values(
+    attempts=bindparam('new_attempts'), next_attempt_at=bindparam('retry_at'), last_error=bindparam('error'))
+
+SupportRequest = Dict[str, str]  # {'name', 'email', 'subject', 'message', ...}
+Sink = Callable[[List[SupportRequest]], Optional[Dict[int, str]]]  # -> {id: error} for undelivered requests
+
+
+def file_sink(path: str) -> Sink:
+    """Append each request to a JSON-lines file, fsynced once per batch"""
+
+    def send(batch: List[SupportRequest]):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(request, ensure_ascii=False) + '\n' for request in batch)
+            f.flush()
+            os.fsync(f.fileno())
+    return send
+
+
+def smtp_sink(host: str, port: int, sender: str, recipient: str) -> Sink:
+    """Email each request to ``recipient`` over one SMTP connection per batch"""
+    import smtplib
+    from email.message import EmailMessage
+
+    def email(request: SupportRequest) -> EmailMessage:
+        message = EmailMessage()
+        message['From'] = sender
+        message['To'] = recipient
+        message['Reply-To'] = request['email']
+        message['Subject'] = f"[Support #{request['id']}] {request['subject']}"
+        message.set_content(f"From: {request['name']} <{request['email']}>\n"
+                            f"Language: {request.get('language', 'en')}\n\n{request['message']}")
+        return message
+
+    def send(batch: List[SupportRequest]) -> Dict[int, str]:
+        failed: Dict[int, str] = {}
+        pending = list(batch)
+        try:
+            with smtplib.SMTP(host, port, timeout=SMTP_TIMEOUT) as smtp:
+                while pending:
+                    request = pending[0]
+                    try:
+                        smtp.send_message(email(request))
+                    except (ValueError, smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused,
+                            smtplib.SMTPDataError) as e:
+                        # This request is bad (e.g. a header the server or EmailMessage rejects); go on
+                        failed[request['id']] = str(e) or type(e).__name__
+                    pending.pop(0)
+        except (OSError, smtplib.SMTPException) as e:
+            # Connection refused or dropped: only the requests not sent yet are retried
+            failed.update((request['id'], str(e) or type(e).__name__) for request in pending)
+        return failed
+    return send
+
+
+def sink_from_url(url: str) -> Sink:
+    """``smtp://host[:port]`` or a file path (optionally ``file://``)"""
+    if url.startswith('smtp://'):
+        host, _, port = url[len('smtp://'):].rstrip('/').partition(':')
+        return smtp_sink(host, int(port or 25), os.environ.get('SUPPORT_EMAIL_FROM', 'civiclink@localhost'),
+                         os.environ.get('SUPPORT_EMAIL_TO', 'support@localhost'))
+    return file_sink(url[len('file://'):] if url.startswith('file://') else url)
+
+
+def retry_delay(attempts: int) -> float:
+    return min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+class SupportOutbox:
+    """SQLite outbox for support requests plus the thread that delivers them"""
+
+    def __init__(self, url: Optional[str] = None, sink: Optional[Sink] = None, batch_size: int = BATCH_SIZE,
+                 poll_seconds: float = POLL_SECONDS, max_delay: float = MAX_DELAY):
+        self.url = url
+        self.sink = sink
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.max_delay = max_delay
+        self._engine: Optional[Engine] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        # Writers in this process queue here rather than in SQLite's busy handler, which polls with
+        # sleeps of up to 100 ms; the busy timeout still covers other processes
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self.last_error: Optional[str] = None  # from the latest delivery attempt
+
+    def init_app(self, app):
+        """Default the outbox and sink to the app's instance folder and start the dispatcher with the first request"""
+        self.url = self.url or os.environ.get('SUPPORT_OUTBOX_URL') or \
+            f"sqlite:///{os.path.join(app.instance_path, 'support_outbox.db')}"
+        if self.sink is None:
+            self.sink = sink_from_url(os.environ.get('SUPPORT_SINK') or
+                                      os.path.join(app.instance_path, 'support_requests.jsonl'))
+        # Not at import: under gunicorn --preload the master must not own the thread or the connection
+        app.before_request(self.start)
+        return self
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    if self.url is None:
+                        raise RuntimeError('Support outbox is not configured; call support_outbox.init_app(app)')
+                    if is_sqlite(self.url):
+                        directory = os.path.dirname(make_url(self.url).database or '')
+                        if directory:
+                            os.makedirs(directory, exist_ok=True)
+                    engine = create_configured_engine(self.url)
+                    metadata.create_all(engine)
+                    self._engine = engine
+        return self._engine
+
+    def submit(self, request: SupportRequest) -> int:
+        """Store a request for delivery; returns its reference number"""
+        now = time.time()
+        engine = self.engine
+        with self._write_lock, engine.begin() as connection:
+            request_id = connection.execute(_INSERT, {
+                'payload': json.dumps(request, ensure_ascii=False), 'created_at': now, 'attempts': 0,
+                'next_attempt_at': now}).inserted_primary_key[0]
+        SUPPORT_OUTBOX.labels('queued').inc()
+        self._wake.set()
+        return request_id
+
+    def dispatch_once(self) -> int:
+        """Claim and deliver one batch of due requests; returns how many were claimed"""
+        now = time.time()
+        engine = self.engine
+        with self._write_lock, engine.begin() as connection:
+            rows = connection.execute(
+                select(outbox_table.c.id, outbox_table.c.payload, outbox_table.c.attempts)
+                .where(outbox_table.c.next_attempt_at <= now)
+                .order_by(outbox_table.c.next_attempt_at, outbox_table.c.id)
+                .limit(self.batch_size)).all()
+            if not rows:
+                return 0
+            ids = [row.id for row in rows]
+            connection.execute(update(outbox_table).where(outbox_table.c.id.in_(ids))
+                               .values(next_attempt_at=now + LEASE_SECONDS))
+
+        batch = [{**json.loads(row.payload), 'id': row.id} for row in rows]
+        try:
+            failed = self.sink(batch) or {}
+        except Exception as e:
+            failed = dict.fromkeys(ids, str(e) or type(e).__name__)
+        delivered = [row_id for row_id in ids if row_id not in failed]
+        if delivered:
+            with self._write_lock, self.engine.begin() as connection:
+                connection.execute(delete(outbox_table).where(outbox_table.c.id.in_(delivered)))
+            SUPPORT_OUTBOX.labels('delivered').inc(len(delivered))
+        if failed:
+            self._failed([row for row in rows if row.id in failed], failed)
+        # Only a batch that failed as a whole means the sink is down
+        self.last_error = next(iter(failed.values())) if failed and not delivered else None
+        return len(rows)
+
+    def _failed(self, rows, errors: Dict[int, str]):
+        now = time.time()
+        retries = []
+        for row in rows:
+            attempts = row.attempts + 1
+            retries.append({'row_id': row.id, 'new_attempts': attempts, 'error': errors[row.id][:1000],
+                            'retry_at': now + retry_delay(attempts) if attempts < MAX_ATTEMPTS else None})
+        parked = sum(retry['retry_at'] is None for retry in retries)
+        with self._write_lock, self.engine.begin() as connection:
+            connection.execute(_RETRY, retries)
+        SUPPORT_OUTBOX.labels('retried').inc(len(rows) - parked)
+        if parked:
+            SUPPORT_OUTBOX.labels('parked').inc(parked)
+        logger.warning(f"Support outbox delivery of {len(rows)} failed ({parked} parked): "
+                       f"{next(iter(errors.values()))}")
+
+    def start(self):
+        """Start the dispatcher thread in this process, once"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._stop.clear()
+                    self._thread = threading.Thread(target=self._run, name='support-outbox', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()  # before claiming, so a submit during delivery is not missed
+            try:
+                claimed = self.dispatch_once()
+            except Exception as e:
+                logger.error(f"Support outbox dispatch error: {str(e)}")
+                self.last_error = str(e)
+                claimed = 0
+            if self.last_error is not None:
+                # Sink or outbox failing: poll for due retries, but don't try again on every new submit
+                self._stop.wait(self.poll_seconds)
+            elif claimed < self.batch_size:  # drained; a full batch means more may be waiting
+                if self._wake.wait(self.poll_seconds):
+                    self._stop.wait(self.max_delay)  # let the rest of a burst join this batch
+
+    def stats(self) -> Dict[str, int]:
+        """Pending (including in-flight) and parked request counts"""
+        with self.engine.connect() as connection:
+            pending, parked = connection.execute(select(
+                func.count(outbox_table.c.next_attempt_at),
+                func.count() - func.count(outbox_table.c.next_attempt_at))).one()
+        return {'pending': pending, 'parked': parked}
+
+    def requeue_parked(self) -> int:
+        """Give parked requests a fresh set of attempts; returns how many"""
+        with self._write_lock, self.engine.begin() as connection:
+            count = connection.execute(update(outbox_table).where(outbox_table.c.next_attempt_at.is_(None))
+                                       .values(attempts=0, next_attempt_at=time.time())).rowcount
+        self._wake.set()
+        return count
+
+    def close(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+
+# Configured by app.py (init_app)
+support_outbox = SupportOutbox()
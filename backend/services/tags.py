@@ -0,0 +1,93 @@
+"""
+Indexed glossary tags.
+
+``Translation.tags`` is a JSON list, which SQL cannot filter without
+parsing every row. ``translation_tags`` mirrors it as one
+``(tag, language, translation_id)`` row per tag. The primary key leads
+with ``tag``, so ``?tag=`` filters and per-language tag counts are index
+range scans.
+
+The mirror is kept current by:
+
+- the ORM hooks in ``backend/models/Translation.py`` (create/update);
+- ``sync_batch_tags`` after each bulk-import batch;
+- ``backfill_tags`` on startup, for databases created before the table
+  existed.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam, distinct, func, select
+from sqlalchemy.engine import Connection, Engine
+
+from backend.models.Translation import Translation, TranslationTag, normalize_tags
+
+logger = logging.getLogger(__name__)
+
+TAG_MATCH_MODES = ('all', 'any')
+MAX_FILTER_TAGS = 10
+BACKFILL_BATCH_SIZE = 5000
+
+
+def parse_tags(values: Iterable[str]) -> List[str]:
+    """``?tag=a,b&tag=c`` -> normalized, de-duplicated tags"""
+    return normalize_tags([tag for value in values for tag in value.split(',')])
+
+
+def tag_filter(tags: List[str], match: str = 'all', language: Optional[str] = None):
+    """A ``Translation.id IN (...)`` clause: rows with every tag (``all``) or at least one (``any``)"""
+    table = TranslationTag.__table__
+    ids = select(table.c.translation_id).where(table.c.tag.in_(tags))
+    if language:
+        ids = ids.where(table.c.language == language)
+    if match == 'all' and len(tags) > 1:
+        ids = ids.group_by(table.c.translation_id).having(func.count(distinct(table.c.tag)) == len(tags))
+    return Translation.id.in_(ids)
+
+
+def tag_counts(session, language: Optional[str] = None) -> List[Tuple[str, str, int]]:
+    """(tag, language, count) rows from the index alone"""
+    table = TranslationTag.__table__
+    query = select(table.c.tag, table.c.language, func.count()).group_by(table.c.tag, table.c.language)
+    if language:
+        query = query.where(table.c.language == language)
+    return session.execute(query).all()
+
+
+def replace_tags(conn: Connection, rows: Dict[int, Tuple[str, object]]):
+    """Rewrite the index rows for ``{translation_id: (language, tags)}``"""
+    if not rows:
+        return
+    table = TranslationTag.__table__
+    # executemany rather than one huge IN list: no per-element bind expansion
+    conn.execute(table.delete().where(table.c.translation_id == bindparam('id')),
+                 [{'id': translation_id} for translation_id in rows])
+    values = [{'tag': tag, 'language': language, 'translation_id': translation_id}
+              for translation_id, (language, tags) in rows.items() for tag in normalize_tags(tags)]
+    if values:
+        conn.execute(table.insert(), values)
+
+
+def sync_batch_tags(conn: Connection, upserted: Iterable[Tuple[int, str, str]], batch: Dict[Tuple[str, str], Dict]):
+    """Index the tags of a bulk-import batch from the upsert's RETURNING (id, english, language) rows"""
+    replace_tags(conn, {term_id: (language, batch[(english, language)]['tags'])
+                        for term_id, english, language in upserted})
+
+
+def backfill_tags(engine: Engine, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """Populate an empty ``translation_tags`` from ``Translation.tags``; returns rows indexed"""
+    tag_table, table = TranslationTag.__table__, Translation.__table__
+    with engine.connect() as conn:
+        if conn.execute(select(tag_table.c.tag).limit(1)).first() is not None:
+            return 0
+        rows = conn.execute(select(table.c.id, table.c.language, table.c.tags)).all()
+    indexed = 0
+    for start in range(0, len(rows), batch_size):
+        batch = {term_id: (language, tags) for term_id, language, tags in rows[start:start + batch_size] if tags}
+        with engine.begin() as conn:
+            replace_tags(conn, batch)
+        indexed += len(batch)
+    if indexed:
+        logger.info(f"Indexed tags for {indexed} translations")
+    return indexed
@@ -0,0 +1,220 @@
+"""
+Pooled, reusable translation provider clients.
+
+deep-translator's GoogleTranslator calls the module-level ``requests.get`` for
+every chunk, so each call opens a new connection and pays a full TLS handshake.
+The pool below hands out translator instances keyed by (provider, source,
+target) that send their requests through one shared keep-alive
+``requests.Session`` per provider, so connections are reused across requests,
+language pairs and threads. The pooled client runs deep-translator's own
+``translate`` with only its HTTP call routed to that session.
+"""
+
+import contextvars
+import threading
+import time
+import types
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from deep_translator import GoogleTranslator, google as upstream_google
+
+from backend.services.metrics import record_cache
+
+# Default pool tuning
+DEFAULT_IDLE_TIMEOUT = 300  # seconds an unused translator is kept around
+DEFAULT_MAX_IDLE_PER_KEY = 8  # idle translators kept per (provider, source, target)
+DEFAULT_CONNECTIONS = 32  # keep-alive connections per provider host
+
+
+def create_session(pool_connections: int = DEFAULT_CONNECTIONS) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool sized for
+    concurrent translation traffic.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_connections)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Session of the translator currently running upstream's translate in this thread
+_current_session: contextvars.ContextVar[Optional[requests.Session]] = contextvars.ContextVar(
+    'translator_session', default=None)
+
+
+class _SessionRequests:
+    """``requests`` as seen by upstream's translate: ``get`` goes through the calling translator's session"""
+
+    def get(self, *args, **kwargs):
+        return (_current_session.get() or requests).get(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+# deep-translator's own GoogleTranslator.translate (parsing, retries and all), with its
+# module-level ``requests.get`` resolved to the pooled session instead of a new connection
+_upstream_translate = types.FunctionType(
+    GoogleTranslator.translate.__code__, {**vars(upstream_google), 'requests': _SessionRequests()},
+    'translate', GoogleTranslator.translate.__defaults__, GoogleTranslator.translate.__closure__)
+
+
+class PooledGoogleTranslator(GoogleTranslator):
+    """
+    GoogleTranslator that sends requests through a shared session instead of
+    opening a new connection for every call.
+    """
+
+    def __init__(self, source: str = 'auto', target: str = 'en', session: Optional[requests.Session] = None,
+                 base_url: Optional[str] = None, **kwargs):
+        super().__init__(source=source, target=target, **kwargs)
+        self.session = session or create_session()
+        if base_url:
+            self._base_url = base_url
+
+    def translate(self, text: str, **kwargs) -> str:
+        """GoogleTranslator.translate over the pooled session"""
+        token = _current_session.set(self.session)
+        try:
+            return _upstream_translate(self, text, **kwargs)
+        finally:
+            _current_session.reset(token)
+
+
+# Provider name -> pooled client class
+POOLED_PROVIDERS = {
+    'google': PooledGoogleTranslator,
+}
+
+
+class TranslatorPool:
+    """
+    Thread-safe pool of translator instances keyed by (provider, source, target).
+
+    Translator instances keep per-call state (URL params), so an instance is
+    only ever used by one thread at a time; the underlying HTTP session and its
+    connections are shared by every instance of the same provider.
+    Instances unused for longer than ``idle_timeout`` seconds are evicted.
+    """
+
+    def __init__(self, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 max_idle_per_key: int = DEFAULT_MAX_IDLE_PER_KEY,
+                 pool_connections: int = DEFAULT_CONNECTIONS,
+                 providers: Optional[Dict[str, type]] = None,
+                 base_urls: Optional[Dict[str, str]] = None):
+        self.idle_timeout = idle_timeout
+        self.max_idle_per_key = max_idle_per_key
+        self.pool_connections = pool_connections
+        self.providers = dict(providers or POOLED_PROVIDERS)
+        self.base_urls = dict(base_urls or {})
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str, str], List[Tuple[float, object]]] = {}
+        self._sessions: Dict[str, requests.Session] = {}
+        self._stats = {'created': 0, 'reused': 0, 'evicted': 0}
+
+    def _session_for(self, provider: str) -> requests.Session:
+        """Get (or lazily create) the shared session for a provider; caller holds the lock"""
+        session = self._sessions.get(provider)
+        if session is None:
+            session = create_session(self.pool_connections)
+            self._sessions[provider] = session
+        return session
+
+    def _evict_expired(self, now: float):
+        """Drop idle translators past their idle timeout; caller holds the lock"""
+        cutoff = now - self.idle_timeout
+        for key in list(self._idle):
+            entries = self._idle[key]
+            kept = [entry for entry in entries if entry[0] >= cutoff]
+            self._stats['evicted'] += len(entries) - len(kept)
+            if kept:
+                self._idle[key] = kept
+            else:
+                del self._idle[key]
+
+    def checkout(self, source: str, target: str, provider: str = 'google'):
+        """Take a translator for exclusive use; return it with ``checkin``"""
+        if provider not in self.providers:
+            raise ValueError(f'Unsupported translation provider: {provider}')
+
+        key = (provider, source, target)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_expired(now)
+            entries = self._idle.get(key)
+            if entries:
+                self._stats['reused'] += 1
+                translator = entries.pop()[1]
+            else:
+                translator = None
+                session = self._session_for(provider)
+                self._stats['created'] += 1
+        record_cache('translator_pool', translator is not None)
+        if translator is not None:
+            return translator
+
+        # Construct outside the lock; language validation can be slow-ish
+        options = {'base_url': self.base_urls[provider]} if provider in self.base_urls else {}
+        return self.providers[provider](source=source, target=target, session=session, **options)
+
+    def checkin(self, translator, source: str, target: str, provider: str = 'google'):
+        """Return a translator to the pool so later requests can reuse it"""
+        key = (provider, source, target)
+        with self._lock:
+            entries = self._idle.setdefault(key, [])
+            if len(entries) < self.max_idle_per_key:
+                entries.append((time.monotonic(), translator))
+
+    @contextmanager
+    def translator(self, source: str, target: str, provider: str = 'google'):
+        """Context manager yielding a pooled translator for one request"""
+        translator = self.checkout(source, target, provider)
+        try:
+            yield translator
+        finally:
+            self.checkin(translator, source, target, provider)
+
+    def register_provider(self, provider: str, factory):
+        """
+        Register (or replace) the client factory for a provider and drop its idle
+        instances. Passing ``None`` unregisters the provider. Returns the previous
+        factory so callers can restore it.
+        """
+        with self._lock:
+            previous = self.providers.pop(provider, None)
+            if factory is not None:
+                self.providers[provider] = factory
+            for key in [key for key in self._idle if key[0] == provider]:
+                del self._idle[key]
+        return previous
+
+    def evict_idle(self):
+        """Evict translators that have been idle longer than the timeout"""
+        with self._lock:
+            self._evict_expired(time.monotonic())
+
+    def stats(self) -> Dict:
+        """Get pool usage counters"""
+        with self._lock:
+            return {
+                **self._stats,
+                'idle': sum(len(entries) for entries in self._idle.values()),
+                'keys': len(self._idle),
+            }
+
+    def close(self):
+        """Drop all idle translators and close the shared sessions"""
+        with self._lock:
+            self._idle.clear()
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+# Process-wide pool shared by the translation routes
+translator_pool = TranslatorPool()
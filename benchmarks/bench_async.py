@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Load comparison: Flask simple_app on a fixed worker-thread pool vs the asyncio
+service (async_app.py), both backed by the fake provider with simulated latency.
+
+With a slow provider the Flask app can only have as many translations in flight
+as it has threads; the async service keeps every request in flight on one
+thread. Reports throughput, latency percentiles and peak thread count.
+
+Usage: python benchmarks/bench_async.py [--requests 2000] [--concurrency 500]
+           [--latency 0.2] [--flask-threads 32]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import BaseWSGIServer
+
+from backend.services.async_http import AsyncHTTPClient, start_asgi_server
+from backend.services.async_translator import async_translator_pool
+from benchmarks.fake_provider import use_fake_provider
+
+REQUEST_BODY = json.dumps({
+    'text': 'Voter registration is the process of signing up to vote in elections.',
+    'target_language': 'es', 'source_language': 'en',
+}).encode('utf-8')
+
+
+class ThreadPoolWSGIServer(BaseWSGIServer):
+    """Werkzeug server handling requests on a fixed-size thread pool (like gunicorn --threads)"""
+
+    multithread = True
+    request_queue_size = 4096
+
+    def __init__(self, host: str, port: int, app, threads: int):
+        super().__init__(host, port, app)
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi-worker')
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process_request, request, client_address)
+
+    def _process_request(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=True)
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+async def generate_load(url: str, total: int, concurrency: int):
+    """POST ``total`` translate requests with ``concurrency`` in flight; returns latencies and errors"""
+    client = AsyncHTTPClient(max_connections=concurrency, timeout=300)
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await client.post(url, body=REQUEST_BODY, headers={'Content-Type': 'application/json'})
+                if response.status != 200:
+                    errors += 1
+            except (OSError, asyncio.TimeoutError, ValueError):
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    await client.close()
+    return latencies, errors
+
+
+def measure(name: str, url: str, total: int, concurrency: int):
+    peak_threads = threading.active_count()
+    done = threading.Event()
+
+    def watch_threads():
+        nonlocal peak_threads
+        while not done.wait(0.05):
+            peak_threads = max(peak_threads, threading.active_count())
+
+    watcher = threading.Thread(target=watch_threads, daemon=True)
+    watcher.start()
+    start = time.perf_counter()
+    latencies, errors = asyncio.run(generate_load(url, total, concurrency))
+    elapsed = time.perf_counter() - start
+    done.set()
+    watcher.join()
+
+    latencies.sort()
+    return {
+        'server': name,
+        'requests': total,
+        'concurrency': concurrency,
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(total / elapsed, 1),
+        'p50_ms': round(_percentile(latencies, 0.50) * 1000, 1),
+        'p95_ms': round(_percentile(latencies, 0.95) * 1000, 1),
+        'p99_ms': round(_percentile(latencies, 0.99) * 1000, 1),
+        'peak_threads': peak_threads,
+    }
+
+
+def run_flask(total: int, concurrency: int, latency: float, threads: int):
+    import simple_app
+
+    server = ThreadPoolWSGIServer('127.0.0.1', 0, simple_app.app, threads)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with use_fake_provider(latency=latency):
+            url = f'http://127.0.0.1:{server.server_port}/api/translate-text'
+            result = measure(f'flask ({threads} threads)', url, total, concurrency)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return result
+
+
+def run_async(total: int, concurrency: int, latency: float):
+    import async_app
+
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(start_asgi_server(async_app.app, '127.0.0.1', 0))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        with use_fake_provider(pool=async_translator_pool, latency=latency):
+            result = measure('asyncio (1 thread)', f'http://127.0.0.1:{port}/api/translate-text', total, concurrency)
+    finally:
+        async def shutdown():
+            server.close()
+            await async_translator_pool.close()
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+    return result
+
+
+def run_comparison(total: int = 2000, concurrency: int = 500, latency: float = 0.2, flask_threads: int = 32):
+    """Run both servers under the same load; returns a list of result dicts"""
+    return [
+        run_flask(total, concurrency, latency, flask_threads),
+        run_async(total, concurrency, latency),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Flask vs asyncio translation service load comparison')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.2, help='fake provider latency per call (seconds)')
+    parser.add_argument('--flask-threads', type=int, default=32)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    print(f"🚦 {args.requests} requests, {args.concurrency} concurrent, provider latency {args.latency * 1000:.0f}ms")
+    for result in run_comparison(args.requests, args.concurrency, args.latency, args.flask_threads):
+        print(f"\n{result['server']}")
+        print(f"  throughput: {result['requests_per_second']} req/s ({result['seconds']}s, {result['errors']} errors)")
+        print(f"  latency:    p50 {result['p50_ms']}ms  p95 {result['p95_ms']}ms  p99 {result['p99_ms']}ms")
+        print(f"  threads:    {result['peak_threads']} peak")
+
+
+if __name__ == '__main__':
+    main()
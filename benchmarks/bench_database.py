@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write load against the glossary database: SQLite defaults vs the
+tuned profile in backend/services/database.py (WAL, pragmas, explicit pools,
+BEGIN IMMEDIATE writers and a separate query_only read engine).
+
+Worker threads run the same queries as the routes: reads are the paginated
+list query (count + page), writes are the detail view's read-then-increment of
+usage_count. Reports throughput, latency percentiles and ``database is
+locked`` errors per profile.
+
+Usage: python benchmarks/bench_database.py [--rows 20000] [--threads 16]
+           [--operations 4000] [--write-ratio 0.2]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, desc
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.models.Translation import Translation
+from backend.services.database import create_configured_engine
+from benchmarks.synthetic_glossary import populate
+
+PROFILES = ('default', 'tuned')
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def make_sessions(profile: str, url: str):
+    """(read sessionmaker, write sessionmaker, engines) for a profile"""
+    if profile == 'default':
+        engine = create_engine(url)
+        factory = sessionmaker(bind=engine)
+        return factory, factory, [engine]
+    write_engine = create_configured_engine(url)
+    read_engine = create_configured_engine(url, read_only=True)
+    return (sessionmaker(bind=read_engine, expire_on_commit=False), sessionmaker(bind=write_engine),
+            [write_engine, read_engine])
+
+
+def read_op(session, rng: random.Random):
+    """GET /api/translations/?language=..: count + first page"""
+    query = session.query(Translation).filter(Translation.language == rng.choice(('es', 'zh', 'ko', 'vi')))
+    query.count()
+    query.order_by(desc(Translation.usage_count), desc(Translation.created_at)).limit(20).all()
+
+
+def write_op(session, rng: random.Random, rows: int):
+    """GET /api/translations/<id>: read the row, increment usage_count, commit"""
+    translation = session.query(Translation).filter(Translation.id == rng.randint(1, rows)).first()
+    translation.increment_usage()
+    session.commit()
+
+
+def run_profile(profile: str, rows: int, threads: int, operations: int, write_ratio: float, seed: int = 1):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        url = f"sqlite:///{os.path.join(tmpdir, f'{profile}.db')}"
+        seed_engine = create_engine(url)
+        populate(seed_engine, rows)
+        seed_engine.dispose()
+
+        read_factory, write_factory, engines = make_sessions(profile, url)
+        lock = threading.Lock()
+        latencies = {'read': [], 'write': []}
+        errors = {'read': 0, 'write': 0}
+        rng_seed = random.Random(seed)
+        plan = ['write' if rng_seed.random() < write_ratio else 'read' for _ in range(operations)]
+
+        def run(index: int):
+            kind = plan[index]
+            rng = random.Random(index)
+            session = (write_factory if kind == 'write' else read_factory)()
+            start = time.perf_counter()
+            try:
+                if kind == 'write':
+                    write_op(session, rng, rows)
+                else:
+                    read_op(session, rng)
+                failed = False
+            except OperationalError:  # 'database is locked'
+                session.rollback()
+                failed = True
+            finally:
+                session.close()
+            elapsed = time.perf_counter() - start
+            with lock:
+                if failed:
+                    errors[kind] += 1
+                else:
+                    latencies[kind].append(elapsed)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(run, range(operations)))
+        elapsed = time.perf_counter() - start
+        for engine in engines:
+            engine.dispose()
+
+    result = {'profile': profile, 'operations': operations, 'threads': threads, 'write_ratio': write_ratio,
+              'rows': rows, 'seconds': round(elapsed, 3),
+              'operations_per_second': round(operations / elapsed, 1),
+              'locked_errors': errors['read'] + errors['write']}
+    for kind in ('read', 'write'):
+        values = sorted(latencies[kind])
+        result[f'{kind}_errors'] = errors[kind]
+        result[f'{kind}_p50_ms'] = round(_percentile(values, 0.50) * 1000, 2)
+        result[f'{kind}_p95_ms'] = round(_percentile(values, 0.95) * 1000, 2)
+    return result
+
+
+def run_comparison(rows: int = 20_000, threads: int = 16, operations: int = 4000, write_ratio: float = 0.2):
+    """Run the same mixed load against both profiles; returns a list of result dicts"""
+    return [run_profile(profile, rows, threads, operations, write_ratio) for profile in PROFILES]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite defaults vs tuned profile under mixed read/write load')
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--operations', type=int, default=4000)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    print(f"🗄️  {args.operations} operations on {args.threads} threads, "
+          f"{args.write_ratio:.0%} writes, {args.rows:,} rows")
+    for result in run_comparison(args.rows, args.threads, args.operations, args.write_ratio):
+        print(f"\n{result['profile']}")
+        print(f"  throughput: {result['operations_per_second']} ops/s ({result['seconds']}s, "
+              f"{result['locked_errors']} 'database is locked' errors)")
+        print(f"  reads:      p50 {result['read_p50_ms']}ms  p95 {result['read_p95_ms']}ms")
+        print(f"  writes:     p50 {result['write_p50_ms']}ms  p95 {result['write_p95_ms']}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Nearest polling place search over a synthetic statewide dataset.
+
+Generates places clustered around towns in a California-sized bounding box
+(one ZIP per town), writes them to a CSV and loads it the way the app does.
+It then times k-nearest queries through the KD-tree against a brute-force
+haversine scan, and checks that both return the same places.
+Usage: python benchmarks/bench_polling_places.py [--places 300000] [--queries 2000] [--k 5]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.services.polling_places import EARTH_RADIUS_KM, PollingPlace, PollingPlaceIndex, read_csv
+
+BOUNDS = ((32.5, 42.0), (-124.4, -114.1))  # (lat range, lon range)
+CSV_FIELDS = ('id', 'name', 'address', 'city', 'state', 'zip', 'latitude', 'longitude', 'type', 'hours')
+
+
+def synthetic_places(count: int, towns: int = 2000, seed: int = 1):
+    """``count`` places: four in five scattered around towns, the rest uniformly rural"""
+    rng = random.Random(seed)
+    (lat_lo, lat_hi), (lon_lo, lon_hi) = BOUNDS
+    centres = [(rng.uniform(lat_lo, lat_hi), rng.uniform(lon_lo, lon_hi), rng.uniform(0.01, 0.2))
+               for _ in range(towns)]
+    places = []
+    for i in range(count):
+        town = rng.randrange(towns)
+        lat, lon, spread = centres[town]
+        if i % 5:
+            lat, lon = lat + rng.gauss(0, spread), lon + rng.gauss(0, spread)
+        else:
+            lat, lon = rng.uniform(lat_lo, lat_hi), rng.uniform(lon_lo, lon_hi)
+        kind = ('election_day', 'election_day', 'early', 'both')[i % 4]
+        places.append(PollingPlace(str(i), f'Polling Place {i}', f'{i % 9000 + 100} Main St', f'Town {town}', 'CA',
+                                   f'{90000 + town:05d}', round(lat, 6), round(lon, 6), kind, '7am-8pm'))
+    return places
+
+
+def write_csv(places, path: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(','.join(CSV_FIELDS) + '\n')
+        for place in places:
+            f.write(','.join(map(str, place)) + '\n')
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    h = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def brute_force(places, lat: float, lon: float, k: int):
+    return sorted(places, key=lambda place: haversine_km(lat, lon, place.lat, place.lon))[:k]
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+BRUTE_FORCE_QUERIES = 20  # a full scan takes a few hundred ms at statewide sizes
+
+
+def run_comparison(places: int = 300_000, queries: int = 2000, k: int = 5, seed: int = 1):
+    """Load, KD-tree and brute-force results for one synthetic dataset"""
+    dataset = synthetic_places(places, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'polling_places.csv')
+        write_csv(dataset, path)
+        start = time.perf_counter()
+        loaded, _ = read_csv(path)
+        read_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    index = PollingPlaceIndex(loaded)
+    build_seconds = time.perf_counter() - start
+
+    rng = random.Random(seed + 1)
+    (lat_lo, lat_hi), (lon_lo, lon_hi) = BOUNDS
+    points = [(rng.uniform(lat_lo, lat_hi), rng.uniform(lon_lo, lon_hi)) for _ in range(queries)]
+    results = [{'places': places, 'csv_read_seconds': round(read_seconds, 3),
+                'index_build_seconds': round(build_seconds, 3)}]
+
+    for label, kind in (('all places', None), ('early voting', 'early')):
+        timings = []
+        for lat, lon in points:
+            start = time.perf_counter()
+            index.nearest(lat, lon, k=k, kind=kind)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        results.append({'search': f'kd-tree {label}', 'k': k, 'queries': queries,
+                        'mean_ms': round(sum(timings) / len(timings) * 1000, 4),
+                        'p50_ms': round(_percentile(timings, 0.5) * 1000, 4),
+                        'p99_ms': round(_percentile(timings, 0.99) * 1000, 4)})
+
+    timings, matches = [], 0
+    for lat, lon in points[:BRUTE_FORCE_QUERIES]:
+        start = time.perf_counter()
+        expected = brute_force(loaded, lat, lon, k)
+        timings.append(time.perf_counter() - start)
+        matches += [place for place, _ in index.nearest(lat, lon, k=k)] == expected
+    timings.sort()
+    results.append({'search': 'brute-force haversine', 'k': k, 'queries': len(timings),
+                    'mean_ms': round(sum(timings) / len(timings) * 1000, 4),
+                    'p50_ms': round(_percentile(timings, 0.5) * 1000, 4),
+                    'p99_ms': round(_percentile(timings, 0.99) * 1000, 4),
+                    'kd_tree_matches': f'{matches}/{len(timings)}'})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Polling place nearest-neighbour benchmark')
+    parser.add_argument('--places', type=int, default=300_000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    load, *searches = run_comparison(args.places, args.queries, args.k, args.seed)
+    print(f"{load['places']:,} places: CSV read {load['csv_read_seconds']} s, "
+          f"index built in {load['index_build_seconds']} s")
+    for result in searches:
+        print(f"{result['search']:>24}: k={result['k']} mean {result['mean_ms']} ms, p50 {result['p50_ms']} ms, "
+              f"p99 {result['p99_ms']} ms over {result['queries']:,} queries"
+              + (f" (kd-tree matches {result['kd_tree_matches']})" if 'kd_tree_matches' in result else ''))
+
+
+if __name__ == '__main__':
+    main()
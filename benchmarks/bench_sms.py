@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Load test for the SMS shortcode webhook against a local stand-in gateway.
+
+Worker threads post inbound messages to /api/sms/inbound, either one per
+request or in gateway batches. Replies are delivered to an HTTP stand-in
+for the SMS gateway, batched (the default) or one call per reply. The
+report covers inbound throughput, webhook latency percentiles, and the
+gateway calls needed to deliver every reply.
+Usage: python benchmarks/bench_sms.py [--messages 20000] [--threads 8] [--inbound-batch 1]
+           [--gateway-latency 0.005]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from backend.routes import sms as sms_routes
+from backend.services.sms import MAX_BATCH, OutboundBatcher, http_sender
+
+SAMPLE_MESSAGES = ['VOTE 12345', 'vote 94110 es', 'EARLY 60614', 'DEADLINE', 'register zh', 'ID', 'Id vi',
+                   'what time do polls open?', 'EARLY 10001-1234 ko']
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class _GatewayHandler(BaseHTTPRequestHandler):
+    """Accepts POST {'messages': [...]} like an SMS gateway's batch send API"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_POST(self):
+        batch = json.loads(self.rfile.read(int(self.headers['Content-Length'])))['messages']
+        if self.server.latency:
+            threading.Event().wait(self.server.latency)
+        with self.server.count_lock:
+            self.server.calls += 1
+            self.server.messages += len(batch)
+        self.send_response(202)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class GatewayStandIn:
+    """Context manager running the stand-in gateway on a random local port; ``url`` is its send endpoint"""
+
+    def __init__(self, latency: float = 0.0):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _GatewayHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.count_lock = threading.Lock()
+        self._server.calls = 0
+        self._server.messages = 0
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}/messages'
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def calls(self) -> int:
+        return self._server.calls
+
+    @property
+    def messages(self) -> int:
+        return self._server.messages
+
+
+def run_load(messages: int = 20_000, threads: int = 8, inbound_batch: int = 1, outbound_batch: int = MAX_BATCH,
+             gateway_latency: float = 0.005):
+    """Send ``messages`` through the webhook; returns throughput, latency and gateway call counts"""
+    app = Flask(__name__)
+    app.register_blueprint(sms_routes.sms_bp)
+    requests_needed = -(-messages // inbound_batch)
+
+    with GatewayStandIn(gateway_latency) as gateway:
+        batcher = OutboundBatcher(http_sender(gateway.url), max_batch=outbound_batch, max_queue=messages)
+        original = sms_routes.outbound
+        sms_routes.outbound = lambda: batcher
+        local = threading.local()
+        latencies = []
+
+        def one(i):
+            if not hasattr(local, 'client'):
+                local.client = app.test_client()
+            batch = [{'from': f'+1555{(i * inbound_batch + j) % 10 ** 7:07d}',
+                      'body': SAMPLE_MESSAGES[(i + j) % len(SAMPLE_MESSAGES)]} for j in range(inbound_batch)]
+            start = time.perf_counter()
+            response = local.client.post('/api/sms/inbound',
+                                         json={'messages': batch} if inbound_batch > 1 else batch[0])
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 202, response.data
+
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(one, range(requests_needed)))
+            accepted = time.perf_counter() - start
+            batcher.flush()
+            delivered = time.perf_counter() - start
+        finally:
+            sms_routes.outbound = original
+            batcher.close()
+
+        latencies.sort()
+        total = requests_needed * inbound_batch
+        return {
+            'outbound': 'batched' if outbound_batch > 1 else 'one call per reply',
+            'messages': total,
+            'inbound_per_second': round(total / accepted),
+            'webhook_p50_ms': round(_percentile(latencies, 0.5) * 1000, 3),
+            'webhook_p99_ms': round(_percentile(latencies, 0.99) * 1000, 3),
+            'delivered_seconds': round(delivered, 3),
+            'delivered_per_second': round(total / delivered),
+            'gateway_calls': gateway.calls,
+            'gateway_messages': gateway.messages,
+        }
+
+
+UNBATCHED_MAX_MESSAGES = 2000  # one gateway call per reply is slow; compare delivery rates instead
+
+
+def run_comparison(messages: int = 20_000, threads: int = 8, inbound_batch: int = 1, gateway_latency: float = 0.005):
+    """Batched outbound delivery vs one gateway call per reply"""
+    return [run_load(messages, threads, inbound_batch, MAX_BATCH, gateway_latency),
+            run_load(min(messages, UNBATCHED_MAX_MESSAGES), threads, inbound_batch, 1, gateway_latency)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SMS webhook load test')
+    parser.add_argument('--messages', type=int, default=20_000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--inbound-batch', type=int, default=1, help=f'messages per webhook call (max {MAX_BATCH})')
+    parser.add_argument('--gateway-latency', type=float, default=0.005, help='seconds per gateway call')
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    for result in run_comparison(args.messages, args.threads, args.inbound_batch, args.gateway_latency):
+        print(f"{result['outbound']:>20}: {result['inbound_per_second']:,} msg/s in, "
+              f"p50 {result['webhook_p50_ms']} ms, p99 {result['webhook_p99_ms']} ms; "
+              f"{result['gateway_messages']:,} replies in {result['gateway_calls']:,} gateway calls, "
+              f"all delivered after {result['delivered_seconds']} s ({result['delivered_per_second']:,}/s)")
+
+
+if __name__ == '__main__':
+    main()
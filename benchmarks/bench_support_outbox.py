@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Contact-support handler latency with the outbox vs delivering inline.
+
+Worker threads post /api/contact-support while the sink (a JSON-lines file)
+is fast, slow (``--sink-latency`` per batch), or down (every call raises).
+The baseline calls the slow sink inside the request, as wiring email into
+the handler directly would. The report covers handler latency percentiles,
+and for the outbox the sink calls and time needed to drain it.
+Usage: python benchmarks/bench_support_outbox.py [--requests 2000] [--threads 8] [--sink-latency 0.2]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+
+from src.pages import HelpAndLanguage
+from backend.services.support_outbox import SupportOutbox, file_sink
+
+
+def _percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class CountingSink:
+    """Wraps a sink with a fixed per-call latency (or an outage) and counts calls"""
+
+    def __init__(self, send, latency: float = 0.0, down: bool = False):
+        self.send = send
+        self.latency = latency
+        self.down = down
+        self.calls = 0
+        self.delivered = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, batch):
+        if self.latency:
+            time.sleep(self.latency)
+        if self.down:
+            raise ConnectionError('sink unavailable')
+        self.send(batch)
+        with self._lock:
+            self.calls += 1
+            self.delivered += len(batch)
+
+
+class InlineDelivery:
+    """Stand-in for the outbox that hands each request to the sink inside the request"""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self._ids = iter(range(1, 10 ** 9))
+
+    def submit(self, request):
+        reference = next(self._ids)
+        self.sink([{**request, 'id': reference}])
+        return reference
+
+
+def run_load(mode: str, requests: int = 2000, threads: int = 8, sink_latency: float = 0.2):
+    """``mode``: 'outbox', 'outbox, sink slow', 'outbox, sink down' or 'inline, sink slow'"""
+    app = Flask(__name__)
+    app.secret_key = 'bench'
+    app.register_blueprint(HelpAndLanguage.help_language_bp)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = CountingSink(file_sink(os.path.join(tmp, 'support_requests.jsonl')),
+                            latency=sink_latency if 'slow' in mode else 0.0, down='down' in mode)
+        if mode.startswith('inline'):
+            target = InlineDelivery(sink)
+        else:
+            target = SupportOutbox(f"sqlite:///{os.path.join(tmp, 'outbox.db')}", sink, poll_seconds=0.05)
+            target.start()
+        original = HelpAndLanguage.support_outbox
+        HelpAndLanguage.support_outbox = target
+        local = threading.local()
+        latencies = []
+
+        def one(i):
+            if not hasattr(local, 'client'):
+                local.client = app.test_client()
+            start = time.perf_counter()
+            response = local.client.post('/api/contact-support', json={
+                'name': f'Voter {i}', 'email': f'voter{i}@example.org', 'subject': 'Polling place hours',
+                'message': 'What time does my polling place open on election day?'})
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.data
+
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(one, range(requests)))
+            accepted = time.perf_counter() - start
+            drained = None
+            if isinstance(target, SupportOutbox):
+                if 'down' not in mode:
+                    while target.stats()['pending']:
+                        time.sleep(0.01)
+                    drained = round(time.perf_counter() - start, 3)
+                target.close()
+        finally:
+            HelpAndLanguage.support_outbox = original
+
+    latencies.sort()
+    return {
+        'mode': mode,
+        'requests': requests,
+        'requests_per_second': round(requests / accepted),
+        'handler_p50_ms': round(_percentile(latencies, 0.5) * 1000, 3),
+        'handler_p99_ms': round(_percentile(latencies, 0.99) * 1000, 3),
+        'sink_calls': sink.calls,
+        'delivered': sink.delivered,
+        'drained_seconds': drained,
+    }
+
+
+INLINE_MAX_REQUESTS = 200  # each inline request waits out the slow sink
+
+
+def run_comparison(requests: int = 2000, threads: int = 8, sink_latency: float = 0.2):
+    """Outbox with a fast, slow and failing sink, and inline delivery to the slow sink"""
+    return [run_load('outbox', requests, threads, sink_latency),
+            run_load('outbox, sink slow', requests, threads, sink_latency),
+            run_load('outbox, sink down', requests, threads, sink_latency),
+            run_load('inline, sink slow', min(requests, INLINE_MAX_REQUESTS), threads, sink_latency)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Contact-support outbox benchmark')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--sink-latency', type=float, default=0.2, help='seconds per sink call when slow')
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    for result in run_comparison(args.requests, args.threads, args.sink_latency):
+        drained = f", drained in {result['drained_seconds']} s" if result['drained_seconds'] is not None else ''
+        print(f"{result['mode']:>18}: {result['requests_per_second']:,} req/s, p50 {result['handler_p50_ms']} ms, "
+              f"p99 {result['handler_p99_ms']} ms; {result['delivered']:,} delivered in "
+              f"{result['sink_calls']:,} sink calls{drained}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fresh GoogleTranslator per request vs the pooled keep-alive client.
+
+Runs both against a local HTTPS stand-in and reports wall time and the number
+of TLS handshakes the server saw.
+Usage: python benchmarks/bench_translator_pool.py [--requests 200] [--threads 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from deep_translator import GoogleTranslator
+from backend.services.translator_pool import TranslatorPool
+from benchmarks.https_standin import HTTPSStandIn
+
+LANGUAGE_PAIRS = [('en', 'es'), ('en', 'zh-CN'), ('en', 'ar'), ('en', 'vi')]
+SAMPLE_TEXT = 'Voter registration is the process of signing up to vote in elections.'
+
+
+def run_fresh(standin: HTTPSStandIn, total: int, threads: int):
+    """Baseline: construct a new translator for every request"""
+    def one(i):
+        source, target = LANGUAGE_PAIRS[i % len(LANGUAGE_PAIRS)]
+        translator = GoogleTranslator(source=source, target=target)
+        translator._base_url = standin.url
+        return translator.translate(SAMPLE_TEXT)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one, range(total)))
+
+
+def run_pooled(standin: HTTPSStandIn, total: int, threads: int):
+    """Pooled: reuse translators and their shared keep-alive session"""
+    pool = TranslatorPool(base_urls={'google': standin.url})
+
+    def one(i):
+        source, target = LANGUAGE_PAIRS[i % len(LANGUAGE_PAIRS)]
+        with pool.translator(source, target) as translator:
+            return translator.translate(SAMPLE_TEXT)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(one, range(total)))
+    stats = pool.stats()
+    pool.close()
+    return stats
+
+
+def measure(standin: HTTPSStandIn, runner, total: int, threads: int):
+    standin.reset_counters()
+    start = time.perf_counter()
+    extra = runner(standin, total, threads)
+    elapsed = time.perf_counter() - start
+    result = {
+        'requests': standin.requests_served,
+        'handshakes': standin.handshakes,
+        'seconds': round(elapsed, 4),
+        'requests_per_second': round(total / elapsed, 1) if elapsed else None,
+    }
+    if extra:
+        result['pool'] = extra
+    return result
+
+
+def run_benchmark(total: int = 200, threads: int = 8, latency: float = 0.0):
+    """Run both variants and return a result dict"""
+    with HTTPSStandIn(latency=latency) as standin:
+        previous_bundle = os.environ.get('REQUESTS_CA_BUNDLE')
+        os.environ['REQUESTS_CA_BUNDLE'] = standin.ca_bundle
+        try:
+            fresh = measure(standin, run_fresh, total, threads)
+            pooled = measure(standin, run_pooled, total, threads)
+        finally:
+            if previous_bundle is None:
+                os.environ.pop('REQUESTS_CA_BUNDLE', None)
+            else:
+                os.environ['REQUESTS_CA_BUNDLE'] = previous_bundle
+
+    return {
+        'fresh': fresh,
+        'pooled': pooled,
+        'handshakes_saved': fresh['handshakes'] - pooled['handshakes'],
+        'speedup': round(fresh['seconds'] / pooled['seconds'], 2) if pooled['seconds'] else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.0, help='server-side delay per request (seconds)')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.requests, args.threads, args.latency)
+    print("🔐 Translator pool benchmark (local HTTPS stand-in)")
+    print("=" * 60)
+    for name in ('fresh', 'pooled'):
+        r = result[name]
+        print(f"{name:>7}: {r['requests']} requests, {r['handshakes']} TLS handshakes, "
+              f"{r['seconds']:.3f}s ({r['requests_per_second']} req/s)")
+    print(f"Handshakes saved: {result['handshakes_saved']}  Speedup: {result['speedup']}x")
+
+
+if __name__ == '__main__':
+    main()
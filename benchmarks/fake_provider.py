@@ -0,0 +1,104 @@
+"""
+Fake translation provider with configurable latency, jitter and error rate.
+
+Lets benchmarks (and tests) exercise the translation code paths without
+touching the live Google service.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from deep_translator.exceptions import RequestError
+
+
+class FakeProvider:
+    """
+    Drop-in for a pooled translator client: ``translate(text) -> str``, plus
+    ``translate_async`` for the async translator pool
+    """
+
+    def __init__(self, source: str = 'auto', target: str = 'en', session=None,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rng: random.Random = None):
+        self.source = source
+        self.target = target
+        self.session = session
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = rng or random.Random()
+        self.calls = 0
+        self.characters = 0
+
+    def _delay(self) -> float:
+        if not self.latency and not self.jitter:
+            return 0.0
+        return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    def translate(self, text: str, **kwargs) -> str:
+        self.calls += 1
+        self.characters += len(text)
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise RequestError()
+        return f'[{self.target}] {text}'
+
+    async def translate_async(self, text: str, **kwargs) -> str:
+        """Non-blocking variant used by the asyncio service"""
+        self.calls += 1
+        self.characters += len(text)
+        delay = self._delay()
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise RequestError()
+        return f'[{self.target}] {text}'
+
+
+class FakeProviderFactory:
+    """Builds FakeProvider instances with shared settings and aggregate counters"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.instances = []
+
+    def __call__(self, source: str = 'auto', target: str = 'en', session=None, **kwargs) -> FakeProvider:
+        with self._lock:
+            rng = random.Random(self._rng.random())
+            provider = FakeProvider(source, target, session, self.latency, self.jitter, self.error_rate, rng)
+            self.instances.append(provider)
+        return provider
+
+    @property
+    def calls(self) -> int:
+        return sum(provider.calls for provider in self.instances)
+
+    @property
+    def characters(self) -> int:
+        return sum(provider.characters for provider in self.instances)
+
+
+@contextmanager
+def use_fake_provider(pool=None, provider: str = 'google', **settings):
+    """
+    Temporarily route a translator pool's provider to a fake one (works for
+    both TranslatorPool and AsyncTranslatorPool).
+    Yields the FakeProviderFactory so callers can read call counters.
+    """
+    if pool is None:
+        from backend.services.translator_pool import translator_pool as pool
+    factory = FakeProviderFactory(**settings)
+    previous = pool.register_provider(provider, factory)
+    try:
+        yield factory
+    finally:
+        pool.register_provider(provider, previous)
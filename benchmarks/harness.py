@@ -0,0 +1,139 @@
+"""
+Minimal benchmark harness: timing, JSON result files and regression checks.
+
+Each benchmark records per-round timings and summary statistics. Results are
+saved as JSON so two runs can be compared with ``compare_results``; a
+benchmark whose median slowed down by more than the threshold is flagged as a
+regression.
+"""
+
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_REGRESSION_THRESHOLD = 0.15  # 15% slower median counts as a regression
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Summary statistics (seconds) for a list of per-round timings"""
+    ordered = sorted(timings)
+    return {
+        'rounds': len(ordered),
+        'min': ordered[0],
+        'max': ordered[-1],
+        'mean': statistics.fmean(ordered),
+        'median': statistics.median(ordered),
+        'p95': _percentile(ordered, 0.95),
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+class BenchmarkSuite:
+    """Collects named benchmark results for one run"""
+
+    def __init__(self, name: str = 'civiclink', min_time: float = 0.2, max_rounds: int = 1000):
+        self.name = name
+        self.min_time = min_time
+        self.max_rounds = max_rounds
+        self.results: Dict[str, Dict] = {}
+
+    def bench(self, name: str, func: Callable, rounds: Optional[int] = None, warmup: int = 1,
+              extra: Optional[Dict] = None) -> Dict:
+        """
+        Time ``func()`` repeatedly and record the result under ``name``.
+        Without ``rounds``, runs until ``min_time`` seconds have elapsed.
+        """
+        for _ in range(warmup):
+            func()
+
+        timings = []
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            deadline = time.perf_counter() + self.min_time
+            while True:
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+                if rounds is not None:
+                    if len(timings) >= rounds:
+                        break
+                elif time.perf_counter() >= deadline or len(timings) >= self.max_rounds:
+                    break
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+        result = summarize(timings)
+        if extra:
+            result['extra'] = extra
+        self.results[name] = result
+        print(f"  {name:<48} median {result['median'] * 1000:9.3f} ms  "
+              f"p95 {result['p95'] * 1000:9.3f} ms  ({result['rounds']} rounds)")
+        return result
+
+    def record(self, name: str, values: Dict):
+        """Record a non-timing result (e.g. bytes or handshakes saved)"""
+        self.results[name] = {'extra': values}
+        print(f"  {name:<48} {values}")
+
+    def to_dict(self) -> Dict:
+        return {
+            'suite': self.name,
+            'created_at': datetime.utcnow().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'benchmarks': self.results,
+        }
+
+    def save(self, path: Optional[str] = None) -> str:
+        """Write results as JSON; defaults to benchmarks/results/<timestamp>.json"""
+        if path is None:
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            path = os.path.join(RESULTS_DIR, f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+def load_results(path: str) -> Dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(current: Dict, baseline: Dict,
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict]:
+    """
+    Compare two result documents by median time.
+    Returns one entry per shared benchmark, with ``regression`` set when the
+    current median is more than ``threshold`` slower than the baseline.
+    """
+    comparisons = []
+    current_benchmarks = current.get('benchmarks', {})
+    for name, base in baseline.get('benchmarks', {}).items():
+        now = current_benchmarks.get(name)
+        if not now or 'median' not in now or 'median' not in base or not base['median']:
+            continue
+        change = (now['median'] - base['median']) / base['median']
+        comparisons.append({
+            'name': name,
+            'baseline_median': base['median'],
+            'current_median': now['median'],
+            'change': change,
+            'regression': change > threshold,
+        })
+    return comparisons
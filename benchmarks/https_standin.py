@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Local HTTPS stand-in for the Google Translate web endpoint.
+
+Serves the same ``<div class="t0">`` markup deep-translator scrapes, over TLS
+with a throwaway self-signed certificate, and counts TLS handshakes so
+benchmarks can show how many connections a client really opened.
+"""
+
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+from urllib.parse import parse_qs, urlparse
+
+
+def generate_self_signed_cert(directory: str):
+    """Create a self-signed localhost certificate with openssl; returns (cert, key) paths"""
+    cert_path = os.path.join(directory, 'standin-cert.pem')
+    key_path = os.path.join(directory, 'standin-key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+         '-keyout', key_path, '-out', cert_path, '-days', '1',
+         '-subj', '/CN=localhost', '-addext', 'subjectAltName=DNS:localhost,IP:127.0.0.1'],
+        check=True, capture_output=True
+    )
+    return cert_path, key_path
+
+
+class _TranslateHandler(BaseHTTPRequestHandler):
+    """Answers GET /?q=...&tl=... with a fake translation"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        text = params.get('q', [''])[0]
+        target = params.get('tl', ['en'])[0]
+        self.server.requests_served += 1
+        if self.server.latency:
+            threading.Event().wait(self.server.latency)
+        body = f'<html><body><div class="t0">[{target}] {escape(text)}</div></body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _CountingTLSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler, context: ssl.SSLContext, latency: float = 0.0):
+        super().__init__(address, handler)
+        self.context = context
+        self.latency = latency
+        self.handshakes = 0
+        self.requests_served = 0
+        self._count_lock = threading.Lock()
+
+    def get_request(self):
+        sock, addr = super().get_request()
+        with self._count_lock:
+            self.handshakes += 1
+        return self.context.wrap_socket(sock, server_side=True), addr
+
+
+class HTTPSStandIn:
+    """
+    Context manager running the stand-in on a random local port.
+
+    ``url`` is the base URL to point a translator at and ``ca_bundle`` the
+    certificate clients must trust to verify it.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self._tmpdir = None
+        self._server = None
+        self._thread = None
+        self.url = None
+        self.ca_bundle = None
+
+    def __enter__(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        cert_path, key_path = generate_self_signed_cert(self._tmpdir.name)
+        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        context.load_cert_chain(cert_path, key_path)
+        self._server = _CountingTLSServer(('127.0.0.1', 0), _TranslateHandler, context, self.latency)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.url = f'https://localhost:{self._server.server_address[1]}/'
+        self.ca_bundle = cert_path
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._tmpdir.cleanup()
+
+    @property
+    def handshakes(self) -> int:
+        return self._server.handshakes
+
+    @property
+    def requests_served(self) -> int:
+        return self._server.requests_served
+
+    def reset_counters(self):
+        self._server.handshakes = 0
+        self._server.requests_served = 0
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+CivicLink benchmark suite.
+
+Covers the text helpers, every Flask endpoint (through the test client) and the
+glossary SQL queries against a synthetic database, using a fake provider with
+configurable latency/jitter/error rate instead of the live Google service.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--suites text,endpoints,sql,pool,async,database,sms,polling,support]
+        [--rows 10000] [--latency 0] [--jitter 0] [--error-rate 0]
+        [--output results.json] [--compare baseline.json] [--threshold 0.15]
+
+Exits with status 1 when --compare finds a regression.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_provider import use_fake_provider
+from benchmarks.harness import (BenchmarkSuite, DEFAULT_REGRESSION_THRESHOLD, compare_results,
+                                load_results)
+
+ALL_SUITES = ('text', 'endpoints', 'sql', 'pool', 'async', 'database', 'sms', 'polling', 'support')
+
+CIVIC_PARAGRAPH = (
+    "Voter registration is the process of signing up to vote in elections. "
+    "You must register before you can cast a ballot. The requirements vary by state, "
+    "but most states accept a driver's license, state ID, or passport as identification. "
+    "Early voting allows you to vote before Election Day at designated locations. "
+)
+TEXT_SIZES = {'1kb': 1_000, '50kb': 50_000, '500kb': 500_000}
+
+
+class CheckedClient:
+    """Flask test client wrapper that fails loudly instead of timing error responses"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def _checked(self, method: str, url: str, **kwargs):
+        response = getattr(self._client, method)(url, **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{method.upper()} {url} returned {response.status_code}: {response.data[:200]!r}")
+        return response
+
+    def get(self, url, **kwargs):
+        return self._checked('get', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._checked('post', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._checked('put', url, **kwargs)
+
+
+def sample_text(size: int) -> str:
+    return (CIVIC_PARAGRAPH * (size // len(CIVIC_PARAGRAPH) + 1))[:size]
+
+
+def bench_text(suite: BenchmarkSuite, provider_settings: dict):
+    """chunk_text, translate_text_efficient, calculate_quality_score and each pipeline stage in isolation"""
+    from backend.routes.translations import chunk_text, translate_text_efficient, calculate_quality_score
+    from backend.services.pipeline.engine import build_pipeline, translation_cache
+
+    print("\n📝 Text pipeline")
+    # Uncached pipeline so each stage is timed on the same cold-cache work every round
+    pipeline = build_pipeline('bench', cache=None)
+    for label, size in TEXT_SIZES.items():
+        text = sample_text(size)
+        suite.bench(f'chunk_text[{label}]', lambda: chunk_text(text))
+        suite.bench(f'calculate_quality_score[{label}]',
+                    lambda: calculate_quality_score(text, text.upper(), 'es'))
+        with use_fake_provider(**provider_settings) as provider:
+            translation_cache.clear()
+            result = suite.bench(f'translate_text_efficient[{label}]',
+                                 lambda: translate_text_efficient(text, 'es', 'en'))
+            result['extra'] = {'provider_calls': provider.calls, 'provider_characters': provider.characters}
+
+            for stage in pipeline.stages:
+                job = pipeline.prepare(text, 'es', 'en', until=stage.name)
+                suite.bench(f'pipeline stage {stage.name}[{label}]', lambda stage=stage, job=job: stage.run(job.copy()))
+
+
+def bench_simple_app_endpoints(suite: BenchmarkSuite, provider_settings: dict):
+    """Every route of simple_app.py through the Flask test client"""
+    import simple_app
+
+    client = CheckedClient(simple_app.app.test_client())
+    text = sample_text(TEXT_SIZES['1kb'])
+    print("\n🌐 simple_app endpoints")
+    suite.bench('simple_app GET /', lambda: client.get('/'))
+    suite.bench('simple_app GET /translation-assistant', lambda: client.get('/translation-assistant'))
+    suite.bench('simple_app GET /help-language', lambda: client.get('/help-language'))
+    suite.bench('simple_app GET /api/languages', lambda: client.get('/api/languages'))
+    suite.bench('simple_app GET /health', lambda: client.get('/health'))
+    with use_fake_provider(**provider_settings):
+        suite.bench('simple_app POST /api/translate-text',
+                    lambda: client.post('/api/translate-text',
+                                        json={'text': text, 'target_language': 'spanish', 'source_language': 'en'}))
+        suite.bench('simple_app POST /api/translate-civic-term',
+                    lambda: client.post('/api/translate-civic-term',
+                                        json={'term': 'Voter Registration', 'target_language': 'spanish'}))
+    bench_response_sizes(suite, client, provider_settings)
+
+
+def bench_response_sizes(suite: BenchmarkSuite, client, provider_settings: dict):
+    """Bytes saved by compact responses and gzip request/response bodies on /api/translate-text"""
+    import gzip
+    import json
+
+    print("\n📦 Translation payload sizes")
+    for label in ('1kb', '50kb'):
+        payload = {'text': sample_text(TEXT_SIZES[label]), 'target_language': 'spanish', 'source_language': 'en'}
+        compact_payload = json.dumps({**payload, 'compact': True}).encode('utf-8')
+        gzipped_payload = gzip.compress(compact_payload)
+        with use_fake_provider(**provider_settings):
+            full = client.post('/api/translate-text', json=payload)
+            compact = client.post('/api/translate-text', data=compact_payload,
+                                  headers={'Content-Type': 'application/json'})
+            compact_gzip = client.post('/api/translate-text', data=gzipped_payload, headers={
+                'Content-Type': 'application/json', 'Content-Encoding': 'gzip', 'Accept-Encoding': 'gzip'})
+            suite.bench(f'simple_app POST /api/translate-text compact+gzip[{label}]',
+                        lambda: client.post('/api/translate-text', data=gzipped_payload, headers={
+                            'Content-Type': 'application/json', 'Content-Encoding': 'gzip',
+                            'Accept-Encoding': 'gzip'}))
+        suite.record(f'translate-text payload bytes[{label}]', {
+            'request_bytes': len(compact_payload),
+            'request_gzip_bytes': len(gzipped_payload),
+            'response_bytes': len(full.data),
+            'compact_response_bytes': len(compact.data),
+            'compact_gzip_response_bytes': len(compact_gzip.data),
+            'response_bytes_saved': len(full.data) - len(compact_gzip.data),
+        })
+
+
+def _import_app(database_url: str):
+    """Import app.py bound to the benchmark database"""
+    os.environ['DATABASE_URL'] = database_url
+    import app as app_module
+    return app_module
+
+
+def bench_app(suite: BenchmarkSuite, provider_settings: dict, rows: int, suites: set):
+    """app.py page/API endpoints and the glossary SQL queries on a synthetic database"""
+    from benchmarks.synthetic_glossary import populate, make_token
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database_url = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        os.environ['SUPPORT_OUTBOX_URL'] = f"sqlite:///{os.path.join(tmpdir, 'support_outbox.db')}"
+        os.environ['SUPPORT_SINK'] = os.path.join(tmpdir, 'support_requests.jsonl')
+        app_module = _import_app(database_url)
+        with app_module.app.app_context():
+            print(f"\n🗄️  Populating synthetic glossary ({rows:,} rows)...")
+            admin_id = populate(app_module.db.engine, rows)
+
+        from backend.middleware import auth
+        headers = {'Authorization': f'Bearer {make_token(admin_id, auth.JWT_SECRET)}'}
+        client = CheckedClient(app_module.app.test_client())
+        text = sample_text(TEXT_SIZES['1kb'])
+
+        if 'endpoints' in suites:
+            print("\n🌐 app endpoints")
+            suite.bench('app GET /', lambda: client.get('/'))
+            suite.bench('app GET /health', lambda: client.get('/health'))
+            suite.bench('app GET /translation-assistant', lambda: client.get('/translation-assistant?search=vot'))
+            suite.bench('app GET /help-language', lambda: client.get('/help-language'))
+            suite.bench('app GET /api/search-translations', lambda: client.get('/api/search-translations?q=ballot'))
+            suite.bench('app POST /api/update-language', lambda: client.post('/api/update-language', json={'language': 'es'}))
+            suite.bench('app POST /api/update-accessibility',
+                        lambda: client.post('/api/update-accessibility', json={'large_text': True}))
+            suite.bench('app POST /api/contact-support',
+                        lambda: client.post('/api/contact-support', json={
+                            'name': 'Bench', 'email': 'bench@example.org', 'subject': 'Hi', 'message': 'Hello'}))
+            with use_fake_provider(**provider_settings):
+                suite.bench('app POST /api/translate-text',
+                            lambda: client.post('/api/translate-text', json={'text': text, 'target_language': 'es'}))
+                suite.bench('app POST /api/translations/translate',
+                            lambda: client.post('/api/translations/translate',
+                                                json={'text': text, 'target_language': 'es', 'source_language': 'en'}))
+
+        if 'sql' in suites:
+            print(f"\n🔎 Glossary queries ({rows:,} rows)")
+            queries = {
+                'list (default order)': '/api/translations/',
+                'list language+category': '/api/translations/?language=es&category=voting',
+                'list verified page 50': '/api/translations/?verified=true&page=50',
+                'list with facets': '/api/translations/?language=es&facets=true',
+                'list search': '/api/translations/?search=ballot%2012',
+                'list tags all (mail+local)': '/api/translations/?tag=mail,local',
+                'list tags any (mail|local)': '/api/translations/?tag=mail,local&tag_match=any',
+                'tags': '/api/translations/tags',
+                'list expand related (100)': '/api/translations/?limit=100&expand=related_terms',
+                'related depth 2': f'/api/translations/{max(1, rows // 3)}/related?depth=2',
+                'categories': '/api/translations/categories',
+                'stats overview': '/api/translations/stats/overview',
+                'detail (usage increment)': f'/api/translations/{max(1, rows // 2)}',
+            }
+            app_module.app.config['GLOSSARY_SNAPSHOT'] = False
+            for label, url in queries.items():
+                suite.bench(f'sql {label}', lambda url=url: client.get(url), extra={'rows': rows})
+
+            # The same list queries answered from the in-memory snapshot
+            from backend.services.glossary_snapshot import glossary_snapshot
+            print(f"\n🧠 Glossary snapshot ({rows:,} rows)")
+            app_module.app.config['GLOSSARY_SNAPSHOT'] = True
+            for label, url in queries.items():
+                if url.startswith('/api/translations/?') or url == '/api/translations/':
+                    suite.bench(f'snapshot {label}', lambda url=url: client.get(url), extra={'rows': rows})
+            suite.record('snapshot size', glossary_snapshot.stats())
+
+            # Exact lookups: database fallback, then the memory-mapped compiled file
+            from backend.services.compiled_glossary import compile_glossary, compiled_glossary
+            from backend.services.database import database
+            print(f"\n🗜️  Compiled glossary ({rows:,} rows)")
+            term = client.get('/api/translations/?verified=true&language=es&limit=1').json['translations'][0]
+            lookup_url = f"/api/translations/lookup?term={term['english']}&language=es"
+            compiled_glossary.path = os.path.join(tmpdir, 'glossary.bin')
+            suite.bench('sql lookup', lambda: client.get(lookup_url), extra={'rows': rows})
+            result = compile_glossary(database.write_engine, compiled_glossary.path)
+            suite.record('compiled glossary', result._asdict())
+            suite.bench('compiled lookup', lambda: client.get(lookup_url), extra={'rows': rows})
+            suite.bench('compiled lookup (no HTTP)', lambda: compiled_glossary.lookup(term['english'], 'es'),
+                        extra={'rows': rows})
+
+            counter = iter(range(10 ** 9))
+            suite.bench('sql create_translation', lambda: client.post('/api/translations/', headers=headers, json={
+                'english': f'bench term {next(counter)}', 'translated': 'término', 'language': 'es',
+                'explanation': 'Benchmark entry', 'category': 'general'}), extra={'rows': rows})
+            suite.bench('sql verify_translation',
+                        lambda: client.put('/api/translations/1/verify', headers=headers, json={'verified': True}),
+                        extra={'rows': rows})
+
+            # One streamed NDJSON upload through POST /bulk (batched upserts)
+            bulk_rows = 50_000
+            body = ''.join(json.dumps({
+                'english': f'bulk term {i}', 'translated': f'término {i}', 'language': 'es',
+                'explanation': 'Bulk benchmark entry', 'category': 'general', 'tags': ['bulk']
+            }) + '\n' for i in range(bulk_rows)).encode('utf-8')
+            report = client.post('/api/translations/bulk', data=body,
+                                 headers={**headers, 'Content-Type': 'application/x-ndjson'}).json
+            suite.record('sql bulk import (NDJSON)', {
+                'rows': bulk_rows, 'upserted': report['upserted'], 'seconds': report['seconds'],
+                'rows_per_second': report['rows_per_second']})
+
+            # Full-table streamed export through GET /export
+            start = time.perf_counter()
+            response = client.get('/api/translations/export', headers=headers)
+            exported = sum(chunk.count(b'\n') for chunk in response.response)
+            seconds = time.perf_counter() - start
+            suite.record('sql streaming export (NDJSON)', {
+                'rows': exported, 'seconds': round(seconds, 3), 'rows_per_second': round(exported / seconds)})
+
+        with app_module.app.app_context():
+            app_module.db.engine.dispose()
+
+
+def bench_pool(suite: BenchmarkSuite):
+    """TLS handshakes saved by the pooled provider clients"""
+    from benchmarks.bench_translator_pool import run_benchmark
+
+    print("\n🔐 Translator pool (local HTTPS stand-in)")
+    result = run_benchmark(total=100, threads=8)
+    suite.record('translator_pool handshakes', result)
+
+
+def bench_async(suite: BenchmarkSuite, latency: float):
+    """Flask (fixed thread pool) vs the asyncio service under concurrent slow provider calls"""
+    from benchmarks.bench_async import run_comparison
+
+    print("\n⚡ Flask vs asyncio service (500 concurrent requests)")
+    for result in run_comparison(total=1000, concurrency=500, latency=latency or 0.2):
+        suite.record(f"async_load {result['server']}", result)
+
+
+def bench_database(suite: BenchmarkSuite, rows: int):
+    """SQLite defaults vs the tuned WAL/read-write-split profile under mixed concurrent load"""
+    from benchmarks.bench_database import run_comparison
+
+    print("\n🗄️  Database profiles (16 threads, 20% writes)")
+    for result in run_comparison(rows=rows, threads=16, operations=2000, write_ratio=0.2):
+        suite.record(f"database_load {result['profile']}", result)
+
+
+def bench_sms(suite: BenchmarkSuite):
+    """SMS webhook intake and batched vs per-reply delivery to a stand-in gateway"""
+    from benchmarks.bench_sms import run_comparison
+
+    print("\n📱 SMS webhook (8 threads, 5 ms gateway calls)")
+    for inbound_batch in (1, 50):
+        for result in run_comparison(messages=10_000, threads=8, inbound_batch=inbound_batch):
+            suite.record(f"sms_load inbound x{inbound_batch} {result['outbound']}", result)
+
+
+def bench_polling(suite: BenchmarkSuite):
+    """Nearest polling places: KD-tree vs brute-force haversine over a statewide dataset"""
+    from benchmarks.bench_polling_places import run_comparison
+
+    print("\n🗳️  Polling places (300k synthetic, k=5)")
+    load, *searches = run_comparison(places=300_000, queries=2000, k=5)
+    suite.record('polling_places load', load)
+    for result in searches:
+        suite.record(f"polling_places {result['search']}", result)
+
+
+def bench_support(suite: BenchmarkSuite):
+    """Contact-support handler latency: outbox with fast/slow/failing sinks vs inline delivery"""
+    from benchmarks.bench_support_outbox import run_comparison
+
+    print("\n📨 Contact-support outbox (8 threads, 200 ms slow sink)")
+    for result in run_comparison(requests=2000, threads=8, sink_latency=0.2):
+        suite.record(f"support_outbox {result['mode']}", result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CivicLink benchmark suite')
+    parser.add_argument('--suites', default=','.join(ALL_SUITES), help=f'comma-separated subset of {ALL_SUITES}')
+    parser.add_argument('--rows', type=int, default=10_000, help='synthetic glossary size (10k - 1M)')
+    parser.add_argument('--latency', type=float, default=0.0, help='fake provider latency per call (seconds)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='fake provider latency jitter (seconds)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fake provider error rate (0-1)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimum seconds per benchmark')
+    parser.add_argument('--output', help='JSON results path (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', help='baseline JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help='median slowdown that counts as a regression (fraction)')
+    args = parser.parse_args()
+
+    # Per-chunk logging (including simulated provider errors) would dominate the timings
+    logging.disable(logging.ERROR)
+
+    suites = {name.strip() for name in args.suites.split(',') if name.strip()}
+    unknown = suites - set(ALL_SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+
+    provider_settings = {'latency': args.latency, 'jitter': args.jitter,
+                         'error_rate': args.error_rate, 'seed': args.seed}
+    suite = BenchmarkSuite(min_time=args.min_time)
+    print("🚀 CivicLink benchmarks")
+    print(f"   fake provider: {provider_settings}")
+
+    if 'text' in suites:
+        bench_text(suite, provider_settings)
+    if 'endpoints' in suites:
+        bench_simple_app_endpoints(suite, provider_settings)
+    if suites & {'endpoints', 'sql'}:
+        bench_app(suite, provider_settings, args.rows, suites)
+    if 'pool' in suites:
+        bench_pool(suite)
+    if 'async' in suites:
+        bench_async(suite, args.latency)
+    if 'database' in suites:
+        bench_database(suite, args.rows)
+    if 'sms' in suites:
+        bench_sms(suite)
+    if 'polling' in suites:
+        bench_polling(suite)
+    if 'support' in suites:
+        bench_support(suite)
+
+    path = suite.save(args.output)
+    print(f"\n💾 Results saved to {path}")
+
+    if args.compare:
+        comparisons = compare_results(suite.to_dict(), load_results(args.compare), args.threshold)
+        regressions = [c for c in comparisons if c['regression']]
+        print(f"\n📊 Compared {len(comparisons)} benchmarks against {args.compare}")
+        for c in comparisons:
+            marker = '❌' if c['regression'] else '  '
+            print(f"{marker} {c['name']:<48} {c['change']:+.1%}")
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Synthetic glossary generator for database benchmarks.
+
+Fills the ``translations`` table with realistic-looking rows (10k - 1M) using
+batched executemany inserts, plus an admin user whose token can drive the
+authenticated endpoints.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+import jwt
+from sqlalchemy import insert
+
+from backend.models.Translation import Base, Translation, LanguageEnum, CategoryEnum, DifficultyEnum
+from backend.models.User import User
+from backend.services.tags import backfill_tags
+
+CIVIC_TERMS = [
+    'voter registration', 'polling place', 'ballot', 'early voting', 'absentee ballot',
+    'provisional ballot', 'precinct', 'election day', 'voter id', 'mail-in ballot',
+    'candidate', 'referendum', 'ballot measure', 'registration deadline', 'poll worker',
+    'county clerk', 'sample ballot', 'drop box', 'curbside voting', 'same-day registration',
+]
+TAGS = ['voting', 'deadline', 'id', 'mail', 'registration', 'accessibility', 'federal', 'state', 'local']
+BATCH_SIZE = 10000
+
+
+def _rows(count: int, rng: random.Random, verifier_id: int):
+    languages = [lang.value for lang in LanguageEnum]
+    categories = [cat.value for cat in CategoryEnum]
+    difficulties = [level.value for level in DifficultyEnum]
+    start = datetime(2024, 1, 1)
+    for i in range(count):
+        term = CIVIC_TERMS[i % len(CIVIC_TERMS)]
+        language = languages[i % len(languages)]
+        verified = rng.random() < 0.7
+        created = start + timedelta(minutes=i)
+        yield {
+            'english': f'{term} {i}',
+            'translated': f'[{language}] {term} {i}',
+            'language': language,
+            'explanation': f'Explanation of {term} for glossary entry {i}.',
+            'category': rng.choice(categories),
+            'audio_url': f'/audio/{term.replace(" ", "-")}-{language}-{i}.mp3',
+            'verified': verified,
+            'verified_by': verifier_id if verified else None,
+            'verified_at': created if verified else None,
+            'usage_count': rng.randint(0, 5000),
+            'tags': rng.sample(TAGS, rng.randint(0, 3)),
+            'difficulty': rng.choice(difficulties),
+            'context': None,
+            'related_terms': [rng.randint(1, count) for _ in range(rng.randint(0, 4))],
+            'feedback': [],
+            'created_at': created,
+            'updated_at': created,
+        }
+
+
+def populate(engine, rows: int, seed: int = 42) -> int:
+    """Create the schema and insert ``rows`` translations; returns the admin user id"""
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        admin_id = conn.execute(insert(User).values(
+            email='bench-admin@example.org', first_name='Bench', last_name='Admin', role='admin'
+        )).inserted_primary_key[0]
+
+    batch = []
+    for row in _rows(rows, rng, admin_id):
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            with engine.begin() as conn:
+                conn.execute(insert(Translation), batch)
+            batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(insert(Translation), batch)
+    backfill_tags(engine)
+    return admin_id
+
+
+def make_token(user_id: int, secret: str) -> str:
+    """Sign a token the Flask auth middleware accepts"""
+    return jwt.encode({'userId': user_id}, secret, algorithm='HS256')
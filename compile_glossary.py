@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Compile the verified glossary into the memory-mapped lookup file shared by all API workers
+Usage: python compile_glossary.py [--output backend/data/glossary.bin] [--database-url URL] [--check TERM:LANG]
+
+The file is written next to the target and swapped in with an atomic rename, so running
+workers pick it up within a second without a restart. Once the file exists the API
+recompiles it after glossary writes.
+"""
+
+import argparse
+import sys
+
+from backend.services.compiled_glossary import GLOSSARY_PATH, CompiledGlossary, compile_glossary
+from backend.services.database import create_configured_engine
+from import_glossary import DEFAULT_DATABASE_URL
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output', default=GLOSSARY_PATH)
+    parser.add_argument('--database-url', default=DEFAULT_DATABASE_URL)
+    parser.add_argument('--check', metavar='TERM:LANG', help='look a term up in the compiled file afterwards')
+    args = parser.parse_args(argv)
+
+    engine = create_configured_engine(args.database_url, read_only=True)
+    try:
+        result = compile_glossary(engine, args.output)
+    finally:
+        engine.dispose()
+    print(f"✓ {result.entries:,} verified terms, {result.bytes:,} bytes in {result.seconds:.2f}s")
+    print(f"Wrote {args.output}")
+
+    if args.check:
+        term, _, language = args.check.rpartition(':')
+        entry = CompiledGlossary(args.output).lookup(term, language)
+        print(entry if entry else f"{term!r} not found in {language}")
+        return 0 if entry else 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Stream the glossary to an NDJSON or CSV file (optionally .gz)
+Usage: python export_glossary.py translations.ndjson.gz [--format csv] [--language es] [--category voting]
+           [--verified true] [--database-url URL]
+
+Rows are read through a server-side cursor and written as they arrive, so memory
+stays flat regardless of table size. Use - to write to stdout.
+"""
+
+import argparse
+import sys
+
+from backend.services.database import create_configured_engine
+from backend.services.glossary_export import EXPORT_BATCH_SIZE, EXPORT_FORMATS, export_chunks
+from import_glossary import DEFAULT_DATABASE_URL
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('path', help='output file; .gz is gzipped; - for stdout')
+    parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), help='default: from the file extension')
+    parser.add_argument('--language')
+    parser.add_argument('--category')
+    parser.add_argument('--verified', choices=['true', 'false'])
+    parser.add_argument('--database-url', default=DEFAULT_DATABASE_URL)
+    parser.add_argument('--batch-size', type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    name = args.path[:-3] if args.path.endswith('.gz') else args.path
+    export_format = args.format or next((fmt for fmt in EXPORT_FORMATS if name.endswith(f'.{fmt}')), None)
+    if export_format is None:
+        parser.error('cannot tell the format from the file name; pass --format')
+    verified = None if args.verified is None else args.verified == 'true'
+
+    engine = create_configured_engine(args.database_url, read_only=True)
+    output = sys.stdout.buffer if args.path == '-' else open(args.path, 'wb')
+    written = 0
+    try:
+        for chunk in export_chunks(engine, export_format, language=args.language, category=args.category,
+                                   verified=verified, compress=args.path.endswith('.gz'),
+                                   batch_size=args.batch_size):
+            output.write(chunk)
+            written += len(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+        engine.dispose()
+
+    print(f"✓ {written:,} bytes written to {args.path}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,19 @@
 #!/usr/bin/env python3
 """
-Get all supported languages from deep-translator
+List all supported languages from the language registry snapshot
+Usage: python get_languages.py [--refresh]
 """
 
-from deep_translator import GoogleTranslator
+import sys
 
-def get_all_languages():
-    """Get all supported languages from GoogleTranslator"""
-    translator = GoogleTranslator()
-    languages = translator.get_supported_languages()
+from backend.services.languages import ALL_LANGUAGES, SNAPSHOT_PATH, refresh_provider_snapshot
+
+def get_all_languages(refresh: bool = False):
+    """Get all supported languages, optionally refreshing the on-disk snapshot first"""
+    languages = ALL_LANGUAGES
+    if refresh:
+        languages = list(refresh_provider_snapshot()['google'])
+        print(f"Refreshed provider snapshot: {SNAPSHOT_PATH}")
     
     print(f"Total supported languages: {len(languages)}")
     print("\nAll languages:")
@@ -18,4 +23,4 @@ def get_all_languages():
     return languages
 
 if __name__ == "__main__":
-    get_all_languages()
+    get_all_languages(refresh='--refresh' in sys.argv[1:])
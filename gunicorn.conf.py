@@ -0,0 +1,27 @@
+"""
+Gunicorn settings for app.py: gunicorn app:app
+
+The app is imported once in the master, warmed by backend/services/preload.py
+and frozen, and then forked into workers that share those memory pages.
+"""
+
+import gc
+import os
+
+# Off while the master imports and warms the app, so freed objects don't fragment shared pages
+gc.disable()
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+preload_app = True
+
+
+def when_ready(server):
+    from app import app
+    from backend.services.preload import preload
+    server.log.info(f"Preloaded before fork (ms): {preload(app)}")
+
+
+def post_fork(server, worker):
+    from backend.services.preload import post_fork as enable_gc
+    enable_gc()
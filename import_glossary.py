@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Bulk import glossary terms from an NDJSON or CSV file (optionally .gz)
+Usage: python import_glossary.py terms.ndjson [--format csv] [--database-url URL] [--batch-size 5000]
+
+Rows are upserted on (english, language); invalid rows are reported by line number.
+Use - to read from stdin.
+"""
+
+import argparse
+import os
+import sys
+
+from backend.models.Translation import Base
+from backend.services.database import create_configured_engine
+from backend.services.glossary_import import IMPORT_BATCH_SIZE, IMPORT_FORMATS, detect_format, import_stream
+
+# Flask-SQLAlchemy resolves app.py's relative sqlite:///civiclink.db under instance/
+DEFAULT_DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///instance/civiclink.db')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('path', help='NDJSON/CSV file, optionally gzipped; - for stdin')
+    parser.add_argument('--format', choices=sorted(IMPORT_FORMATS), help='default: from the file extension')
+    parser.add_argument('--database-url', default=DEFAULT_DATABASE_URL)
+    parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument('--user-id', type=int, help='recorded as verified_by')
+    args = parser.parse_args(argv)
+
+    import_format = args.format or detect_format(filename=args.path)
+    if import_format is None:
+        parser.error('cannot tell the format from the file name; pass --format')
+
+    engine = create_configured_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    stream = sys.stdin.buffer if args.path == '-' else open(args.path, 'rb')
+    try:
+        report = import_stream(engine, stream, import_format, user_id=args.user_id,
+                               compressed=args.path.endswith('.gz'), batch_size=args.batch_size)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        engine.dispose()
+
+    for error in report.errors:
+        print(f"line {error['line']}: {error['error']}", file=sys.stderr)
+    result = report.to_dict()
+    print(f"✓ {result['upserted']:,} rows upserted, {result['failed']:,} failed, "
+          f"{result['duplicates']:,} duplicates in {result['seconds']}s ({result['rows_per_second']} rows/s)")
+    if result['errors_truncated']:
+        print(f"(first {len(report.errors)} errors shown)", file=sys.stderr)
+    return 1 if report.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Pre-translate the static help and translation-assistant content into every registered language
+Usage: python precompile_static.py [--check] [--languages es,fr,...] [--workers N]
+
+Only strings that are new or changed since the last run are sent to the provider.
+--check lists stale strings and exits non-zero instead of translating.
+"""
+
+import argparse
+import sys
+
+from backend.services.static_translations import (ARTIFACT_PATH, StaticTranslations, compile_static_translations,
+                                                  target_languages)
+from backend.services import sms
+from src.pages import HelpAndLanguage, TranslationAssistant
+
+STATIC_CONTENT_MODULES = (HelpAndLanguage, TranslationAssistant, sms)
+
+def collect_sources():
+    """(text, source language) pairs from every page with static content"""
+    return list(dict.fromkeys(source for module in STATIC_CONTENT_MODULES for source in module.static_texts()))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--check', action='store_true', help='report stale strings without translating')
+    parser.add_argument('--languages', help='comma-separated language codes (default: all registered)')
+    parser.add_argument('--workers', type=int, default=8, help='concurrent provider calls')
+    parser.add_argument('--output', default=ARTIFACT_PATH)
+    args = parser.parse_args(argv)
+
+    sources = collect_sources()
+    languages = args.languages.split(',') if args.languages else target_languages()
+
+    if args.check:
+        stale = StaticTranslations.load(args.output).stale(sources, languages)
+        for text, source_language in stale:
+            print(f"stale [{source_language}] {text[:70]}")
+        print(f"{len(stale)} of {len(sources)} strings need compiling")
+        return 1 if stale else 0
+
+    print(f"Precompiling {len(sources)} strings into {len(languages)} languages...")
+    report = compile_static_translations(sources, args.output, languages, workers=args.workers)
+    print(f"✓ Artifact {report.version}: {report.translated} translated, {report.reused} reused, "
+          f"{report.failed} failed, {report.removed} stale entries removed")
+    print(f"Wrote {args.output}")
+    return 1 if report.failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,11 @@
 from flask import Blueprint, render_template, request, jsonify, session
+from backend.services.languages import GLOSSARY_LANGUAGES, LANGUAGES_BY_CODE
+from backend.services.page_cache import PageCache
+from backend.services.static_translations import language_code, static_translations
+from backend.services.support_outbox import support_outbox
+from functools import lru_cache
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -43,17 +49,48 @@ SMS_SHORTCODES = [
     {'code': 'EARLY', 'description': 'Find early voting locations', 'example': 'Text EARLY 12345'}
 ]
 
-# Languages
+# Languages offered in the settings page: English plus the glossary languages
 LANGUAGES = [
-    {'code': 'en', 'name': 'English', 'flag': '🇺🇸', 'native': 'English'},
-    {'code': 'es', 'name': 'Spanish', 'flag': '🇪🇸', 'native': 'Español'},
-    {'code': 'zh', 'name': 'Chinese', 'flag': '🇨🇳', 'native': '中文'},
-    {'code': 'ar', 'name': 'Arabic', 'flag': '🇸🇦', 'native': 'العربية'},
-    {'code': 'hi', 'name': 'Hindi', 'flag': '🇮🇳', 'native': 'हिन्दी'},
-    {'code': 'ko', 'name': 'Korean', 'flag': '🇰🇷', 'native': '한국어'},
-    {'code': 'vi', 'name': 'Vietnamese', 'flag': '🇻🇳', 'native': 'Tiếng Việt'},
-    {'code': 'tl', 'name': 'Tagalog', 'flag': '🇵🇭', 'native': 'Tagalog'}
+    {'code': lang.code, 'name': lang.name, 'flag': lang.flag, 'native': lang.native}
+    for lang in [LANGUAGES_BY_CODE['en'], *GLOSSARY_LANGUAGES]
 ]
+LANGUAGE_CODES = frozenset(lang['code'] for lang in LANGUAGES)
+MAX_SUPPORT_MESSAGE_CHARS = 10_000
+_CONTROL_CHARACTERS = re.compile(r'[\x00-\x1f\x7f-\x9f\u2028\u2029]')
+
+def static_texts():
+    """Strings precompiled into every language by precompile_static.py"""
+    for faq in FAQ_DATA:
+        source_language = language_code(faq['language'])
+        yield faq['question'], source_language
+        yield faq['answer'], source_language
+    for shortcode in SMS_SHORTCODES:
+        yield shortcode['description'], 'en'
+
+@lru_cache(maxsize=None)
+def localized_content(language: str):
+    """FAQ entries and SMS shortcodes in ``language`` (from the precompiled artifact)"""
+    if language == 'en':
+        return FAQ_DATA, SMS_SHORTCODES
+    name = LANGUAGES_BY_CODE[language].name
+    faq_data = []
+    for faq in FAQ_DATA:
+        source_language = language_code(faq['language'])
+        question = static_translations.lookup(faq['question'], language, source_language)
+        answer = static_translations.lookup(faq['answer'], language, source_language)
+        if question is None or answer is None:
+            # Not compiled yet: keep the entry in (and labelled with) its own language
+            faq_data.append(faq)
+            continue
+        faq_data.append({'question': question, 'answer': answer, 'language': name})
+    sms_shortcodes = [
+        {**shortcode, 'description': static_translations.get(shortcode['description'], language)}
+        for shortcode in SMS_SHORTCODES
+    ]
+    return faq_data, sms_shortcodes
+
+# Rendered pages keyed by (language, accessibility flags, static artifact version)
+page_cache = PageCache('help_language_page')
 
 @help_language_bp.route('/help-language')
 def help_language():
@@ -63,15 +100,22 @@ def help_language():
     high_contrast = session.get('high_contrast', False)
     large_text = session.get('large_text', False)
     audio_enabled = session.get('audio_enabled', True)
+    if selected_language not in LANGUAGE_CODES:
+        selected_language = 'en'
     
-    return render_template('help_language.html',
-                         faq_data=FAQ_DATA,
-                         sms_shortcodes=SMS_SHORTCODES,
-                         languages=LANGUAGES,
-                         selected_language=selected_language,
-                         high_contrast=high_contrast,
-                         large_text=large_text,
-                         audio_enabled=audio_enabled)
+    def render():
+        faq_data, sms_shortcodes = localized_content(selected_language)
+        return render_template('help_language.html',
+                             faq_data=faq_data,
+                             sms_shortcodes=sms_shortcodes,
+                             languages=LANGUAGES,
+                             selected_language=selected_language,
+                             high_contrast=high_contrast,
+                             large_text=large_text,
+                             audio_enabled=audio_enabled)
+    
+    key = (selected_language, high_contrast, large_text, audio_enabled, static_translations.version)
+    return page_cache.response(key, render)
 
 @help_language_bp.route('/api/update-language', methods=['POST'])
 def update_language():
@@ -85,8 +129,7 @@ def update_language():
         language = data['language']
         
         # Validate language code
-        valid_languages = [lang['code'] for lang in LANGUAGES]
-        if language not in valid_languages:
+        if language not in LANGUAGE_CODES:
             return jsonify({'error': 'Invalid language code'}), 400
         
         # Save to session
@@ -142,20 +185,30 @@ def contact_support():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        name = data.get('name', '').strip()
-        email = data.get('email', '').strip()
-        subject = data.get('subject', '').strip()
-        message = data.get('message', '').strip()
+        fields = [data.get(field, '') for field in ('name', 'email', 'subject', 'message')]
+        if not all(isinstance(value, str) for value in fields):
+            return jsonify({'error': 'All fields must be text'}), 400
+        name, email, subject, message = (value.strip() for value in fields)
         
         # Validate required fields
         if not all([name, email, subject, message]):
             return jsonify({'error': 'All fields are required'}), 400
-        
-        # In a real app, this would send an email or create a support ticket
-        logger.info(f"Support request from {name} ({email}): {subject}")
+        if len(message) > MAX_SUPPORT_MESSAGE_CHARS or max(len(name), len(email), len(subject)) > 500:
+            return jsonify({'error': 'Support request is too long'}), 400
+        # Name, email and subject end up in email headers: no line breaks or other control characters
+        if any(_CONTROL_CHARACTERS.search(value) for value in (name, email, subject)):
+            return jsonify({'error': 'Name, email and subject must be a single line'}), 400
+        
+        # One insert into the outbox; the dispatcher thread emails/files it, so a slow sink never delays this
+        reference = support_outbox.submit({
+            'name': name, 'email': email, 'subject': subject, 'message': message,
+            'language': session.get('selected_language', 'en')
+        })
+        logger.info(f"Support request #{reference} queued: {subject}")
         
         return jsonify({
-            'message': 'Support request submitted successfully. We\'ll get back to you soon!'
+            'message': 'Support request submitted successfully. We\'ll get back to you soon!',
+            'reference': reference
         })
         
     except Exception as e:
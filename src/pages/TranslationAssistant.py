@@ -1,5 +1,11 @@
 from flask import Blueprint, render_template, request, jsonify, session
 from backend.routes.translations import translate_text_efficient, LANGUAGE_MAPPING
+from backend.services.languages import GLOSSARY_LANGUAGES, resolve
+from backend.services.pipeline.markup import FORMATS as TEXT_FORMATS
+from backend.services.json_codec import get_request_json, json_response, wants_compact
+from backend.services.page_cache import PageCache
+from backend.services.static_translations import language_code, static_translations
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -46,43 +52,89 @@ TRANSLATION_DATA = [
 ]
 
 LANGUAGES = [
-    {'code': 'es', 'name': 'Spanish', 'flag': '🇪🇸'},
-    {'code': 'zh', 'name': 'Chinese', 'flag': '🇨🇳'},
-    {'code': 'ar', 'name': 'Arabic', 'flag': '🇸🇦'},
-    {'code': 'hi', 'name': 'Hindi', 'flag': '🇮🇳'},
-    {'code': 'ko', 'name': 'Korean', 'flag': '🇰🇷'},
-    {'code': 'vi', 'name': 'Vietnamese', 'flag': '🇻🇳'},
-    {'code': 'tl', 'name': 'Tagalog', 'flag': '🇵🇭'}
+    {'code': lang.code, 'name': lang.name, 'flag': lang.flag}
+    for lang in GLOSSARY_LANGUAGES
 ]
 
+def static_texts():
+    """Strings precompiled into every language by precompile_static.py"""
+    for term in TRANSLATION_DATA:
+        yield term['english'], 'en'
+        yield term['explanation'], 'en'
+
+@lru_cache(maxsize=64)
+def localized_terms(language: str):
+    """
+    TRANSLATION_DATA for a language code. Curated translations win; other
+    languages use the precompiled artifact (no provider calls). Terms not
+    compiled into the language are kept in English, labelled English and
+    flagged ``untranslated``.
+    """
+    lang = resolve(language)
+    if lang is None or lang.code == 'en':
+        return TRANSLATION_DATA
+    terms = []
+    for term in TRANSLATION_DATA:
+        if language_code(term['language']) == lang.code:
+            terms.append(term)
+            continue
+        translated = static_translations.lookup(term['english'], lang.code)
+        explanation = static_translations.lookup(term['explanation'], lang.code)
+        if translated is None or explanation is None:
+            terms.append({
+                'english': term['english'],
+                'translated': term['english'],
+                'language': 'English',
+                'explanation': term['explanation'],
+                'audio_url': '',
+                'untranslated': True
+            })
+            continue
+        terms.append({
+            'english': term['english'],
+            'translated': translated,
+            'language': lang.name,
+            'explanation': explanation,
+            'audio_url': ''
+        })
+    return terms
+
+# Rendered pages keyed by (search term, language, static artifact version)
+page_cache = PageCache('translation_assistant_page')
+
+def filter_terms(terms, search_term):
+    if not search_term:
+        return terms
+    search_lower = search_term.lower()
+    return [
+        term for term in terms
+        if (search_lower in term['english'].lower() or
+            search_lower in term['translated'].lower() or
+            search_lower in term['explanation'].lower())
+    ]
+
 @translation_assistant_bp.route('/translation-assistant')
 def translation_assistant():
     """Render the translation assistant page"""
     search_term = request.args.get('search', '').strip()
     selected_language = request.args.get('language', 'Spanish')
     
-    # Filter translations based on search term
-    filtered_terms = TRANSLATION_DATA
-    if search_term:
-        search_lower = search_term.lower()
-        filtered_terms = [
-            term for term in TRANSLATION_DATA
-            if (search_lower in term['english'].lower() or
-                search_lower in term['translated'].lower() or
-                search_lower in term['explanation'].lower())
-        ]
+    def render():
+        # Localize, then filter translations based on search term
+        filtered_terms = filter_terms(localized_terms(selected_language), search_term)
+        return render_template('translation_assistant.html',
+                             translation_data=filtered_terms,
+                             languages=LANGUAGES,
+                             search_term=search_term,
+                             selected_language=selected_language)
     
-    return render_template('translation_assistant.html',
-                         translation_data=filtered_terms,
-                         languages=LANGUAGES,
-                         search_term=search_term,
-                         selected_language=selected_language)
+    return page_cache.response((search_term, selected_language, static_translations.version), render)
 
 @translation_assistant_bp.route('/api/translate-text', methods=['POST'])
 def translate_text_api():
     """API endpoint for translating text"""
     try:
-        data = request.get_json()
+        data = get_request_json()
         
         if not data:
             return jsonify({'error': 'No data provided'}), 400
@@ -90,17 +142,21 @@ def translate_text_api():
         text = data.get('text', '').strip()
         target_language = data.get('target_language', 'es')
         source_language = data.get('source_language', 'auto')
+        text_format = data.get('format', 'text')
         
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
+        if text_format not in TEXT_FORMATS:
+            return jsonify({'error': 'Invalid format'}), 400
+        
         # Perform translation using the efficient translation function
-        result = translate_text_efficient(text, target_language, source_language)
+        result = translate_text_efficient(text, target_language, source_language, text_format)
         
         if 'error' in result:
             return jsonify(result), 400
         
-        return jsonify(result)
+        return json_response(result, compact=wants_compact(data))
         
     except Exception as e:
         logger.error(f"Translation API error: {str(e)}")
@@ -114,16 +170,7 @@ def search_translations():
         language = request.args.get('language', '')
         
         # Filter translations
-        filtered_terms = TRANSLATION_DATA
-        
-        if search_term:
-            search_lower = search_term.lower()
-            filtered_terms = [
-                term for term in filtered_terms
-                if (search_lower in term['english'].lower() or
-                    search_lower in term['translated'].lower() or
-                    search_lower in term['explanation'].lower())
-            ]
+        filtered_terms = filter_terms(TRANSLATION_DATA, search_term)
         
         if language:
             filtered_terms = [
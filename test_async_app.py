@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio translation service
+"""
+
+import asyncio
+import json
+import time
+
+import async_app
+from backend.services.async_http import AsyncHTTPClient, start_asgi_server
+from backend.services.languages import LANGUAGES_RESPONSE_BODY
+from backend.services.pipeline.engine import translation_cache
+from benchmarks.fake_provider import use_fake_provider
+
+
+async def _call(method, path, payload=None):
+    """Invoke the ASGI app directly; returns (status, body)"""
+    body = json.dumps(payload).encode() if payload is not None else b''
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await async_app.app({'type': 'http', 'method': method, 'path': path, 'headers': []}, receive, send)
+    return messages[0]['status'], b''.join(m.get('body', b'') for m in messages[1:])
+
+
+def test_routes_match_simple_app_contract():
+    async def scenario():
+        with use_fake_provider(pool=async_app.async_translator_pool):
+            status, body = await _call('POST', '/api/translate-text',
+                                       {'text': 'Where do I vote?', 'target_language': 'es', 'source_language': 'en'})
+            assert status == 200
+            result = json.loads(body)
+            assert result['success'] and result['translated_text'] == '[es] Where do I vote?'
+
+            status, body = await _call('POST', '/api/translate-civic-term', {'term': 'Ballot', 'target_language': 'spanish'})
+            assert status == 200 and json.loads(body)['translated_term'] == '[es] Ballot'
+
+        assert await _call('GET', '/api/languages') == (200, LANGUAGES_RESPONSE_BODY)
+        assert (await _call('POST', '/api/translate-text', {'target_language': 'es'}))[0] == 400
+        assert (await _call('GET', '/api/translate-text'))[0] == 405
+        assert (await _call('GET', '/missing'))[0] == 404
+
+    asyncio.run(scenario())
+
+
+def test_server_keeps_connections_alive_and_overlaps_slow_calls():
+    async def scenario():
+        server = await start_asgi_server(async_app.app, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = AsyncHTTPClient()
+        pool = async_app.async_translator_pool
+        try:
+            response = await client.get(f'http://127.0.0.1:{port}/health')
+            assert response.status == 200 and json.loads(response.body)['status'] == 'healthy'
+            await client.get(f'http://127.0.0.1:{port}/api/languages')
+            assert client.stats['connections_opened'] == 1
+
+            body = json.dumps({'text': 'Register to vote.', 'target_language': 'es', 'source_language': 'en'}).encode()
+            translation_cache.clear()
+            with use_fake_provider(pool=pool, latency=0.2):
+                start = time.perf_counter()
+                responses = await asyncio.gather(*(
+                    client.post(f'http://127.0.0.1:{port}/api/translate-text', body=body) for _ in range(50)))
+                elapsed = time.perf_counter() - start
+            assert all(r.status == 200 for r in responses)
+            # 50 x 200ms calls overlap instead of running back to back
+            assert elapsed < 2.0
+            assert client.stats['connections_opened'] <= 50
+        finally:
+            await client.close()
+            await pool.close()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_server_limits_body_size_and_read_time(monkeypatch):
+    from backend.services import async_http
+
+    monkeypatch.setattr(async_http, 'READ_TIMEOUT', 0.2)
+
+    async def exchange(port, data):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(data)
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 2)
+        writer.close()
+        return response.split(b'\r\n', 1)[0]
+
+    async def scenario():
+        server = await start_asgi_server(async_app.app, '127.0.0.1', 0, max_body_bytes=1024)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            # Rejected from the headers, before the body arrives
+            head = b'POST /api/translate-text HTTP/1.1\r\nHost: x\r\nContent-Length: 2000000000\r\n\r\n'
+            assert await exchange(port, head) == b'HTTP/1.1 413 Payload Too Large'
+            chunked = (b'POST /api/translate-text HTTP/1.1\r\nHost: x\r\nTransfer-Encoding: chunked\r\n\r\n'
+                       + b'400\r\n' + b'x' * 1024 + b'\r\n' + b'1\r\n')
+            assert await exchange(port, chunked) == b'HTTP/1.1 413 Payload Too Large'
+            # A body that never finishes arriving does not hold the connection
+            slow = b'POST /api/translate-text HTTP/1.1\r\nHost: x\r\nContent-Length: 100\r\n\r\n{'
+            assert await exchange(port, slow) == b'HTTP/1.1 408 Request Timeout'
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        status, _ = await _call('POST', '/api/translate-text',
+                                {'text': 'x' * (async_app.MAX_BODY_BYTES + 1), 'target_language': 'es'})
+        assert status == 413
+
+    asyncio.run(scenario())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for pronunciation audio serving: ranges, conditional requests, cache headers and the hot-file cache
+"""
+
+import os
+
+import pytest
+from flask import Flask
+
+from backend.routes import audio
+from backend.services.audio_files import IMMUTABLE_MAX_AGE, MAX_AGE, AudioLibrary
+
+SMALL = bytes(range(256)) * 4  # 1 KB, served from the hot cache
+LARGE = os.urandom(700 * 1024)  # above HOT_FILE_MAX_BYTES, served from disk
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    (tmp_path / 'ballot-es.mp3').write_bytes(SMALL)
+    (tmp_path / 'long-es.mp3').write_bytes(LARGE)
+    (tmp_path / 'notes.txt').write_text('not audio')
+    library = AudioLibrary(str(tmp_path / ''), hot_cache_bytes=2048)
+    monkeypatch.setattr(audio, 'audio_library', library)
+    return library
+
+
+@pytest.fixture
+def client(library):
+    app = Flask(__name__)
+    app.register_blueprint(audio.audio_bp)
+    return app.test_client()
+
+
+@pytest.mark.parametrize('name, body', [('ballot-es.mp3', SMALL), ('long-es.mp3', LARGE)])
+def test_ranges_and_conditional_requests(client, name, body):
+    url = f'/audio/{name}'
+    full = client.get(url)
+    etag = full.headers['ETag']
+    assert full.status_code == 200 and full.data == body and full.mimetype == 'audio/mpeg'
+    assert full.headers['Accept-Ranges'] == 'bytes'
+    assert full.cache_control.public and full.cache_control.max_age == MAX_AGE
+
+    # Resume and seek: byte ranges, suffix ranges, If-Range, unsatisfiable ranges
+    part = client.get(url, headers={'Range': 'bytes=100-199'})
+    assert part.status_code == 206 and part.data == body[100:200]
+    assert part.headers['Content-Range'] == f'bytes 100-199/{len(body)}'
+    assert client.get(url, headers={'Range': 'bytes=-10'}).data == body[-10:]
+    assert client.get(url, headers={'Range': 'bytes=500-', 'If-Range': etag}).data == body[500:]
+    assert client.get(url, headers={'Range': 'bytes=500-', 'If-Range': '"stale"'}).data == body
+    assert client.get(url, headers={'Range': f'bytes={len(body)}-'}).status_code == 416
+
+    revalidated = client.get(url, headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304 and not revalidated.data
+    versioned = client.get(url, query_string={'v': full.get_etag()[0]})
+    assert versioned.cache_control.max_age == IMMUTABLE_MAX_AGE and versioned.cache_control.immutable
+
+    for missing in ('missing.mp3', 'notes.txt', '../ballot-es.mp3', '%2e%2e/ballot-es.mp3'):
+        assert client.get(f'/audio/{missing}').status_code == 404
+
+
+def test_hot_cache_and_replaced_files(client, library, tmp_path):
+    first = client.get('/audio/ballot-es.mp3')
+    client.get('/audio/long-es.mp3')
+    assert library.stats()['hot_files'] == 1  # the large file is never held in memory
+
+    # A replaced file gets a new ETag and new bytes straight away
+    (tmp_path / 'ballot-es.mp3').write_bytes(SMALL[::-1])
+    os.utime(tmp_path / 'ballot-es.mp3', ns=(1, 1))
+    second = client.get('/audio/ballot-es.mp3')
+    assert second.data == SMALL[::-1] and second.headers['ETag'] != first.headers['ETag']
+    assert client.get('/audio/ballot-es.mp3', headers={'If-None-Match': first.headers['ETag']}).status_code == 200
+
+    # The cache is bounded by bytes, least recently used first
+    (tmp_path / 'poll-es.mp3').write_bytes(SMALL)
+    (tmp_path / 'vote-es.mp3').write_bytes(SMALL)
+    client.get('/audio/poll-es.mp3')
+    client.get('/audio/vote-es.mp3')
+    assert library.stats() == {'hot_files': 2, 'hot_bytes': 2048, 'etags': 4}
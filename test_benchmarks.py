@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark harness and fake provider
+"""
+
+from backend.services.translator_pool import TranslatorPool
+from benchmarks.fake_provider import FakeProvider, use_fake_provider
+from benchmarks.harness import BenchmarkSuite, compare_results
+
+
+def test_fake_provider_error_rate_and_counters():
+    provider = FakeProvider(target='es', error_rate=1.0)
+    try:
+        provider.translate('ballot')
+    except Exception:
+        pass
+    else:
+        raise AssertionError('expected a simulated provider error')
+    assert provider.calls == 1
+    assert FakeProvider(target='es').translate('ballot') == '[es] ballot'
+
+
+def test_use_fake_provider_restores_pool():
+    pool = TranslatorPool()
+    original = pool.providers['google']
+    with use_fake_provider(pool) as factory:
+        with pool.translator('en', 'es') as translator:
+            assert translator.translate('vote') == '[es] vote'
+        assert factory.calls == 1
+    assert pool.providers['google'] is original
+
+
+def test_compare_results_flags_regressions():
+    suite = BenchmarkSuite(min_time=0)
+    suite.bench('noop', lambda: None, rounds=3)
+    current = suite.to_dict()
+    baseline = {'benchmarks': {'noop': {'median': current['benchmarks']['noop']['median'] / 10}}}
+
+    [comparison] = compare_results(current, baseline, threshold=0.15)
+    assert comparison['regression']
+    assert not compare_results(current, current)[0]['regression']
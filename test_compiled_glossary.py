@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped compiled glossary: parity with the database, atomic swap, API lookup
+"""
+
+import os
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, select, update
+
+from backend.middleware import auth
+from backend.models.Translation import Translation
+from backend.services.compiled_glossary import CompiledGlossary, compile_glossary, compiled_glossary
+from backend.services.database import create_configured_engine, database, engine_options
+from benchmarks.synthetic_glossary import make_token, populate
+
+
+def test_compiled_lookups_match_database_and_swap_atomically(tmp_path):
+    engine = create_configured_engine(f"sqlite:///{tmp_path / 'glossary.db'}")
+    populate(engine, 400)
+    path = str(tmp_path / 'glossary.bin')
+    result = compile_glossary(engine, path)
+    reader = CompiledGlossary(path, check_interval=0)
+
+    with engine.connect() as conn:
+        rows = conn.execute(select(Translation)).mappings().all()
+    verified = [row for row in rows if row['verified']]
+    assert result.entries == len(reader) == len(verified)
+    for row in rows:
+        entry = reader.lookup(f"  {row['english'].upper()} ", row['language'])
+        if not row['verified']:
+            assert entry is None
+            continue
+        assert entry == {'id': row['id'], 'language': row['language'], 'english': row['english'],
+                         'translated': row['translated'], 'explanation': row['explanation'],
+                         'category': row['category'], 'audio_url': row['audio_url']}
+    assert reader.lookup(verified[0]['english'], 'xx') is None
+    assert reader.lookup('not a term', verified[0]['language']) is None
+
+    # A recompile replaces the file; the open reader maps the new one and the old inode is gone
+    target = verified[0]
+    with engine.begin() as conn:
+        conn.execute(update(Translation).where(Translation.id == target['id']).values(translated='Nuevo'))
+    inode = os.stat(path).st_ino
+    compile_glossary(engine, path)
+    assert os.stat(path).st_ino != inode
+    assert reader.lookup(target['english'], target['language'])['translated'] == 'Nuevo'
+    assert [name for name in os.listdir(tmp_path) if name.endswith('.tmp')] == []
+    engine.dispose()
+
+
+def test_lookup_endpoint_uses_compiled_file_and_recompiles(tmp_path, monkeypatch):
+    from backend.routes.translations import translations_bp
+    from backend.services import compiled_glossary as module
+
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=url, SQLALCHEMY_ENGINE_OPTIONS=engine_options(url))
+    db = SQLAlchemy(app)
+    database.init_app(app, db)
+    app.register_blueprint(translations_bp)
+    with app.app_context():
+        admin_id = populate(db.engine, 50)
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {make_token(admin_id, auth.JWT_SECRET)}'}
+    monkeypatch.setattr(compiled_glossary, 'path', str(tmp_path / 'glossary.bin'))
+    monkeypatch.setattr(compiled_glossary, 'check_interval', 0)
+    monkeypatch.setattr(compiled_glossary, '_mapping', None)
+    monkeypatch.setattr(compiled_glossary, '_checked_at', None)
+
+    assert client.get('/api/translations/lookup?term=x&language=xx').status_code == 400
+    term = client.get('/api/translations/?verified=true&language=es').json['translations'][0]
+    response = client.get(f"/api/translations/lookup?term={term['english'].lower()}&language=es")
+    assert response.json['source'] == 'database'
+    database_entry = response.json['translation']
+
+    # The database fallback matches exactly what the compiled file matches (spacing, case folding)
+    with database.write_engine.begin() as conn:
+        conn.execute(insert(Translation), [
+            {'english': 'Straße', 'translated': 'Calle', 'language': 'es', 'explanation': 'x', 'verified': True},
+            {'english': 'Ballot  drop   box', 'translated': 'Buzón', 'language': 'es', 'explanation': 'x',
+             'verified': True}])
+    lookups = [('STRASSE', 'es'), ('straße', 'es'), ('ballot drop box', 'es'), (' BALLOT drop  BOX ', 'es'),
+               ('Ballot  drop', 'es'), (term['english'].upper(), 'es')]
+
+    def lookup_all():
+        return [client.get('/api/translations/lookup', query_string={'term': text, 'language': language}).json
+                for text, language in lookups]
+
+    from_database = lookup_all()
+    assert [result.get('source') for result in from_database] == ['database'] * 4 + [None, 'database']
+
+    compile_glossary(database.write_engine, compiled_glossary.path)
+    response = client.get(f"/api/translations/lookup?term={term['english']}&language=es")
+    assert response.json == {'translation': database_entry, 'source': 'compiled'}
+    assert lookup_all() == [{**result, 'source': 'compiled'} if 'source' in result else result
+                            for result in from_database]
+    assert client.get('/api/translations/lookup?term=Poll&language=es').status_code == 404
+
+    # Creating a term schedules a background recompile of the existing file
+    client.post('/api/translations/', headers=headers, json={
+        'english': 'Poll', 'translated': 'Encuesta', 'language': 'es', 'explanation': 'x', 'category': 'voting'})
+    pending = module._scheduled
+    assert pending is not None
+    pending.join()
+    response = client.get('/api/translations/lookup?term=poll&language=es')
+    assert (response.json['source'], response.json['translation']['translated']) == ('compiled', 'Encuesta')
+    for engine in database.engines:
+        engine.dispose()
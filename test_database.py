@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for the database layer (WAL pragmas, read/write session split)
+"""
+
+import pytest
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from backend.models.Translation import Base, Translation
+from backend.services.database import Database, engine_options
+
+
+def _make_database(url):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(url)
+    db = SQLAlchemy(app)
+    database = Database().init_app(app, db)
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+    return app, database
+
+
+def test_reads_use_a_separate_query_only_engine(tmp_path):
+    app, database = _make_database(f"sqlite:///{tmp_path / 'glossary.db'}")
+    assert database.read_engine is not database.write_engine
+    with app.app_context():
+        session = database.session
+        assert session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        session.add(Translation(english='Ballot', translated='Boleta', language='es', explanation='x'))
+        session.commit()
+
+        # Committed writes are visible to the read session, which cannot write
+        reader = database.read_session
+        assert reader.query(Translation).count() == 1
+        assert reader.execute(text('PRAGMA busy_timeout')).scalar() == 5000
+        with pytest.raises(OperationalError):
+            reader.execute(text("UPDATE translations SET usage_count = 1"))
+        reader.rollback()
+
+    for engine in database.engines:
+        engine.dispose()
+
+
+def test_in_memory_database_shares_one_session():
+    app, database = _make_database('sqlite://')
+    assert database.engines == [database.write_engine]
+    with app.app_context():
+        assert database.read_session is database.session
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for facet counts on the glossary list endpoint
+"""
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, insert
+
+from backend.models.Translation import Base, Translation
+from backend.services.database import database, engine_options
+
+
+def test_facets_match_filtered_results(tmp_path):
+    from backend.routes.translations import translations_bp
+
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=url, SQLALCHEMY_ENGINE_OPTIONS=engine_options(url))
+    db = SQLAlchemy(app)
+    database.init_app(app, db)
+    app.register_blueprint(translations_bp)
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        with db.engine.begin() as conn:
+            conn.execute(insert(Translation), [{
+                'english': f'term {i}', 'translated': f'término {i}', 'language': ('es', 'zh', 'ko')[i % 3],
+                'explanation': 'x', 'category': ('voting', 'deadlines')[i % 2], 'verified': i % 4 == 0,
+                'difficulty': 'beginner' if i < 20 else 'advanced'} for i in range(30)])
+
+    statements = []
+    event.listen(database.read_engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    client = app.test_client()
+    body = client.get('/api/translations/?category=voting&facets=true&limit=5').json
+    # page + one aggregate that also gives the total
+    assert len([s for s in statements if s.lstrip().upper().startswith('SELECT')]) == 2
+
+    assert body['pagination']['total'] == 15 and len(body['translations']) == 5
+    assert body['facets'] == {
+        'language': {'es': 5, 'ko': 5, 'zh': 5},
+        'category': {'voting': 15},
+        'verified': {'true': 8, 'false': 7},
+        'difficulty': {'beginner': 10, 'advanced': 5},
+    }
+    assert sum(body['facets']['language'].values()) == body['pagination']['total']
+
+    plain = client.get('/api/translations/?category=voting&limit=5').json
+    assert 'facets' not in plain and plain['pagination'] == body['pagination']
+    for engine in database.engines:
+        engine.dispose()
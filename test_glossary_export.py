@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming glossary export (NDJSON/CSV, gzip, filters and the /export route)
+"""
+
+import gzip
+import io
+import json
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert
+
+from backend.middleware import auth
+from backend.models.Translation import Base
+from backend.models.User import User
+from backend.services.database import create_configured_engine, database, engine_options
+from backend.services.glossary_export import export_chunks
+from backend.services.glossary_import import import_stream, read_csv
+from benchmarks.synthetic_glossary import make_token
+
+ROWS = [
+    {'english': 'Ballot', 'translated': 'Boleta', 'language': 'es', 'explanation': 'Voting form', 'category': 'voting',
+     'tags': ['paper', 'mail'], 'verified': True},
+    {'english': 'Precinct', 'translated': 'Precinto', 'language': 'es', 'explanation': 'Area', 'category': 'locations',
+     'verified': False},
+    {'english': 'Ballot', 'translated': '选票', 'language': 'zh', 'explanation': 'Voting form', 'category': 'voting'},
+]
+
+
+def _ndjson(rows):
+    return ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows).encode('utf-8')
+
+
+def _content(csv_body):
+    return [(row['english'], row['translated'], row['language'], row['tags'], row['verified'])
+            for _, row in read_csv(io.StringIO(csv_body.decode('utf-8')))]
+
+
+def test_exports_stream_and_round_trip(tmp_path):
+    engine = create_configured_engine(f"sqlite:///{tmp_path / 'glossary.db'}")
+    Base.metadata.create_all(engine)
+    import_stream(engine, io.BytesIO(_ndjson(ROWS)), 'ndjson')
+
+    body = b''.join(export_chunks(engine, 'ndjson', batch_size=2))
+    records = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+    assert [(r['english'], r['language'], r['tags']) for r in records] == [
+        ('Ballot', 'es', ['paper', 'mail']), ('Precinct', 'es', []), ('Ballot', 'zh', [])]
+    assert records[0]['verified'] is True and records[0]['created_at']
+
+    spanish_verified = b''.join(export_chunks(engine, 'ndjson', language='es', verified=True))
+    assert len(spanish_verified.splitlines()) == 1
+
+    csv_body = gzip.decompress(b''.join(export_chunks(engine, 'csv', category='voting', compress=True)))
+    rows = [row for _, row in read_csv(io.StringIO(csv_body.decode('utf-8')))]
+    assert [(row['translated'], row['tags']) for row in rows] == [('Boleta', ['paper', 'mail']), ('选票', [])]
+
+    # An export loads back into an empty database unchanged
+    copy = create_configured_engine(f"sqlite:///{tmp_path / 'copy.db'}")
+    Base.metadata.create_all(copy)
+    report = import_stream(copy, io.BytesIO(csv_body), 'csv')
+    assert (report.upserted, report.failed) == (2, 0)
+    assert _content(b''.join(export_chunks(copy, 'csv'))) == _content(csv_body)
+    engine.dispose()
+    copy.dispose()
+
+
+def test_export_route_streams_for_organizers(tmp_path):
+    from backend.routes.translations import translations_bp
+
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=url, SQLALCHEMY_ENGINE_OPTIONS=engine_options(url))
+    db = SQLAlchemy(app)
+    database.init_app(app, db)
+    app.register_blueprint(translations_bp)
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        import_stream(db.engine, io.BytesIO(_ndjson(ROWS)), 'ndjson')
+        with db.engine.begin() as conn:
+            organizer_id = conn.execute(insert(User).values(
+                email='org@example.org', first_name='O', last_name='R', role='organizer')).inserted_primary_key[0]
+
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {make_token(organizer_id, auth.JWT_SECRET)}'}
+    response = client.get('/api/translations/export?language=zh', headers=headers)
+    assert response.status_code == 200 and response.is_streamed
+    assert response.mimetype == 'application/x-ndjson'
+    assert [json.loads(line)['translated'] for line in response.data.splitlines()] == ['选票']
+
+    response = client.get('/api/translations/export?format=csv', headers={**headers, 'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(gzip.decompress(response.data).splitlines()) == 4
+
+    assert client.get('/api/translations/export?format=xml', headers=headers).status_code == 400
+    assert client.get('/api/translations/export?category=nope', headers=headers).status_code == 400
+    assert client.get('/api/translations/export').status_code == 401
+    for engine in database.engines:
+        engine.dispose()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Tests for bulk glossary import (NDJSON/CSV upserts and the /bulk route)
+"""
+
+import gzip
+import io
+import json
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, select
+
+from backend.middleware import auth
+from backend.models.Translation import Base, Translation
+from backend.models.User import User
+from backend.services.database import create_configured_engine, database, engine_options
+from backend.services.glossary_import import import_stream
+from benchmarks.synthetic_glossary import make_token
+
+ROWS = [
+    {'english': 'Ballot', 'translated': 'Boleta', 'language': 'es', 'explanation': 'Voting form', 'category': 'voting'},
+    {'english': 'Precinct', 'translated': 'Precinto', 'language': 'es', 'explanation': 'Area', 'category': 'locations',
+     'tags': ['local']},
+    {'english': 'Ballot', 'translated': '选票', 'language': 'zh', 'explanation': 'Voting form', 'category': 'voting'},
+]
+
+
+def _ndjson(rows):
+    return ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows).encode('utf-8')
+
+
+def test_upserts_in_batches_and_reports_bad_rows(tmp_path):
+    engine = create_configured_engine(f"sqlite:///{tmp_path / 'glossary.db'}")
+    Base.metadata.create_all(engine)
+    wrong_types = [{**ROWS[0], 'english': 'Vote', 'difficulty': []}, {**ROWS[0], 'english': 'Poll', 'context': {}}]
+    body = _ndjson(ROWS) + b'{"english": "Poll", "language": "xx"}\nnot json\n' + _ndjson(wrong_types)
+    report = import_stream(engine, io.BytesIO(body), 'ndjson', batch_size=2)
+    assert (report.received, report.upserted, report.failed) == (7, 3, 4)
+    assert [error['line'] for error in report.errors] == [4, 5, 6, 7]
+    assert [error['error'] for error in report.errors[2:]] == ['Invalid difficulty', 'context must be text']
+
+    with engine.begin() as conn:
+        conn.execute(Translation.__table__.update().values(usage_count=7))
+
+    csv_body = ('english,translated,language,explanation,category,tags,verified\n'
+                'Ballot,Boleta electoral,es,Voting form,voting,voting|paper,false\n'
+                'Ballot,x,es,Voting form,not-a-category,,\n').encode('utf-8')
+    report = import_stream(engine, io.BytesIO(gzip.compress(csv_body)), 'csv', compressed=True)
+    assert (report.upserted, report.errors) == (1, [{'line': 3, 'error': 'Invalid category'}])
+
+    with engine.connect() as conn:
+        ballot = conn.execute(select(Translation.__table__).where(
+            Translation.english == 'Ballot', Translation.language == 'es')).one()
+        assert len(conn.execute(select(Translation.id)).all()) == 3
+    # Updated in place: content replaced, usage kept
+    assert (ballot.translated, ballot.tags, ballot.verified, ballot.usage_count) == (
+        'Boleta electoral', ['voting', 'paper'], False, 7)
+    engine.dispose()
+
+
+def test_bulk_route_requires_organizer(tmp_path):
+    from backend.routes.translations import translations_bp
+
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=url, SQLALCHEMY_ENGINE_OPTIONS=engine_options(url))
+    db = SQLAlchemy(app)
+    database.init_app(app, db)
+    app.register_blueprint(translations_bp)
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        with db.engine.begin() as conn:
+            organizer_id = conn.execute(insert(User).values(
+                email='org@example.org', first_name='O', last_name='R', role='organizer')).inserted_primary_key[0]
+            voter_id = conn.execute(insert(User).values(
+                email='voter@example.org', first_name='V', last_name='R', role='voter')).inserted_primary_key[0]
+
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {make_token(organizer_id, auth.JWT_SECRET)}',
+               'Content-Type': 'application/x-ndjson'}
+    response = client.post('/api/translations/bulk', data=_ndjson(ROWS), headers=headers)
+    assert response.status_code == 200
+    assert response.json['upserted'] == 3 and response.json['errors'] == []
+
+    voter = {**headers, 'Authorization': f'Bearer {make_token(voter_id, auth.JWT_SECRET)}'}
+    assert client.post('/api/translations/bulk', data=_ndjson(ROWS), headers=voter).status_code == 403
+    assert client.post('/api/translations/bulk', data=b'x', headers={**headers, 'Content-Type': 'text/plain'}
+                       ).status_code == 400
+    for engine in database.engines:
+        engine.dispose()
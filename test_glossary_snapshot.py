@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-memory glossary snapshot: parity with the SQL list query and incremental refresh
+"""
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from backend.middleware import auth
+from backend.models.Translation import Translation
+from backend.services.database import create_configured_engine, database, engine_options
+from backend.services.glossary_snapshot import GlossarySnapshot, glossary_snapshot
+from benchmarks.synthetic_glossary import make_token, populate
+
+FILTERS = [
+    {},
+    {'language': 'es', 'page': 3},
+    {'category': 'voting', 'verified': True, 'limit': 7},
+    {'verified': False, 'tags': ['mail', 'local'], 'tag_match': 'any'},
+    {'tags': ['mail', 'local']},
+    {'language': 'zh', 'search': 'BALLOT 1'},
+    {'language': 'ko', 'page': 99},
+]
+
+
+def _stored_usage(engine, translation_id):
+    with engine.connect() as conn:
+        return conn.execute(select(Translation.usage_count).where(Translation.id == translation_id)).scalar()
+
+
+def test_snapshot_matches_sql(tmp_path):
+    from backend.routes.translations import query_translations
+
+    engine = create_configured_engine(f"sqlite:///{tmp_path / 'glossary.db'}")
+    populate(engine, 700)
+    snapshot = GlossarySnapshot()
+    snapshot.refresh(engine)
+    with Session(engine) as session:
+        for filters in FILTERS:
+            args = {'language': None, 'category': None, 'verified': None, 'tags': [], 'tag_match': 'all',
+                    'search': '', 'page': 1, 'limit': 20, **filters}
+            rows, total, facets = query_translations(session, with_facets=True, **args)
+            snap_rows, snap_total, snap_facets = snapshot.query(facets=True, **args)
+            assert [row.id for row in snap_rows] == [row.id for row in rows], filters
+            assert (snap_total, snap_facets) == (total, facets), filters
+            assert [row.to_dict() for row in snap_rows] == [
+                {**row.to_dict(), 'tags': tuple(row.tags), 'related_terms': tuple(row.related_terms),
+                 'feedback': tuple(row.feedback or ())} for row in rows]
+    assert 0 < snapshot.stats()['bytes'] < 2_000_000
+
+    # Tag strings are counted; queries keep working on the version they started with
+    published = snapshot._columns
+    before = snapshot.stats()['bytes']
+    with engine.begin() as conn:
+        conn.execute(update(Translation).where(Translation.id == 1).values(tags=['x' * 10_000]))
+    snapshot.expire()
+    snapshot.refresh(engine)
+    assert snapshot.stats()['bytes'] - before > 5_000
+    assert snapshot._columns is not published and published.rows[published.positions[1]].tags != ('x' * 10_000,)
+
+    # The rows just written fall inside the delta's skew window; a later check must not re-apply them
+    applied = []
+    snapshot._upsert = lambda columns, values: applied.append(values)
+    snapshot.expire()
+    snapshot.refresh(engine)
+    assert applied == [] and snapshot.stats()['rows'] == 700
+    engine.dispose()
+
+
+def test_snapshot_refreshes_incrementally(tmp_path):
+    from backend.routes.translations import translations_bp
+
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=url, SQLALCHEMY_ENGINE_OPTIONS=engine_options(url),
+                      GLOSSARY_SNAPSHOT=True)
+    db = SQLAlchemy(app)
+    database.init_app(app, db)
+    app.register_blueprint(translations_bp)
+    with app.app_context():
+        admin_id = populate(db.engine, 50)
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {make_token(admin_id, auth.JWT_SECRET)}'}
+
+    def ids(url):
+        return [t['id'] for t in client.get(url).json['translations']]
+
+    assert client.get('/api/translations/?language=es').json['pagination']['total'] == 8
+    assert glossary_snapshot.stats()['rows'] == 50
+
+    # Writes through the API are applied straight away
+    response = client.post('/api/translations/', headers=headers, json={
+        'english': 'Poll', 'translated': 'Encuesta', 'language': 'es', 'explanation': 'x', 'category': 'voting',
+        'tags': ['fresh']})
+    new_id = response.json['translation']['id']
+    duplicate = client.post('/api/translations/', headers=headers, json={
+        'english': 'Poll', 'translated': 'Sondeo', 'language': 'es', 'explanation': 'x', 'category': 'voting'})
+    assert (duplicate.status_code, duplicate.json['id']) == (409, new_id)
+    assert ids('/api/translations/?tag=fresh') == [new_id]
+    for _ in range(3):
+        client.get('/api/translations/1')
+    usage = {t['id']: t['usage_count'] for t in client.get('/api/translations/?limit=100').json['translations']}
+    assert usage[1] == _stored_usage(database.write_engine, 1)
+
+    # Changes made elsewhere arrive with the next delta check (row updates) or reload (deletes)
+    with database.write_engine.begin() as conn:
+        conn.execute(update(Translation).where(Translation.id == 2).values(usage_count=10 ** 6))
+        conn.execute(insert(Translation).values(
+            english='Elsewhere', translated='x', language='vi', explanation='x', category='general'))
+    glossary_snapshot.expire()
+    assert ids('/api/translations/?limit=1') == [2]
+    assert client.get('/api/translations/?language=vi').json['pagination']['total'] == 8
+
+    with database.write_engine.begin() as conn:
+        conn.execute(delete(Translation).where(Translation.id == 2))
+    glossary_snapshot.expire()
+    assert 2 not in ids('/api/translations/?limit=100')
+    assert glossary_snapshot.stats()['rows'] == 51
+    for engine in database.engines:
+        engine.dispose()
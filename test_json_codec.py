@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for compact translation responses and gzip request/response bodies
+"""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+import async_app
+import simple_app
+from backend.services import json_codec
+from backend.services.pipeline.engine import translation_cache
+from backend.services.translator_pool import translator_pool
+from benchmarks.fake_provider import use_fake_provider
+
+TEXT = 'Bring a photo ID to your polling place. ' * 60
+
+
+def test_compact_gzip_round_trip():
+    client = simple_app.app.test_client()
+    translation_cache.clear()
+    request_body = gzip.compress(json.dumps({'text': TEXT, 'target_language': 'es', 'source_language': 'en',
+                                             'compact': True}).encode())
+    with use_fake_provider(translator_pool):
+        full = client.post('/api/translate-text', json={'text': TEXT, 'target_language': 'es', 'source_language': 'en'})
+        compact = client.post('/api/translate-text', data=request_body, headers={
+            'Content-Type': 'application/json', 'Content-Encoding': 'gzip', 'Accept-Encoding': 'gzip'})
+
+    assert compact.status_code == 200 and compact.headers['Content-Encoding'] == 'gzip'
+    result = json.loads(gzip.decompress(compact.data))
+    assert 'original_text' not in result and 'original_text' in full.json
+    assert result['translated_text'] == full.json['translated_text']
+    assert len(compact.data) * 10 < len(full.data)
+
+
+def test_async_app_compact_and_gzip():
+    async def call(payload, headers):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': gzip.compress(json.dumps(payload).encode()), 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        await async_app.app({'type': 'http', 'method': 'POST', 'path': '/api/translate-text',
+                             'headers': headers}, receive, send)
+        return dict(messages[0]['headers']), b''.join(m.get('body', b'') for m in messages[1:])
+
+    with use_fake_provider(pool=async_app.async_translator_pool):
+        headers, body = asyncio.run(call({'text': TEXT, 'target_language': 'es', 'compact': True},
+                                         [(b'content-encoding', b'gzip'), (b'accept-encoding', b'br, gzip;q=0.8')]))
+    assert headers[b'content-encoding'] == b'gzip'
+    assert 'original_text' not in json.loads(gzip.decompress(body))
+
+
+def test_request_body_limits():
+    assert json_codec.accepts_gzip('deflate, gzip;q=0.5') and not json_codec.accepts_gzip('gzip;q=0')
+    assert json_codec.maybe_gzip(b'{}', 'gzip') == (b'{}', None)
+    with pytest.raises(json_codec.RequestBodyError):
+        json_codec.decode_body(gzip.compress(b' ' * (json_codec.MAX_REQUEST_BYTES + 1)), 'gzip')
+    with pytest.raises(json_codec.RequestBodyError):
+        json_codec.load_json_body(b'{}', 'br')
+    # Truncated after the complete JSON, before the CRC/length trailer
+    with pytest.raises(json_codec.RequestBodyError):
+        json_codec.load_json_body(gzip.compress(b'{"text": "Vote"}')[:-4], 'gzip')
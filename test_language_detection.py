@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for offline source-language detection
+"""
+
+import simple_app
+from benchmarks.fake_provider import use_fake_provider
+from backend.services.translator_pool import translator_pool
+from backend.services.languages import LANGUAGES_BY_CODE
+from backend.services.language_detection import LanguageDetector, MIN_CONFIDENCE, _UNSUPPORTED_LATIN_SAMPLES
+
+
+def test_script_based_detection():
+    detector = LanguageDetector()
+    assert detector.detect('我需要什么文件才能投票？').language == 'zh'
+    assert detector.detect('こんにちは、投票所はどこですか').language == 'ja'
+    assert detector.detect('투표소는 어디에 있나요?').language == 'ko'
+    assert detector.detect('أين يمكنني التصويت؟').language == 'ar'
+    assert detector.detect('मैं कहाँ वोट कर सकता हूँ?').language == 'hi'
+
+
+def test_latin_ngram_detection():
+    detector = LanguageDetector()
+    cases = {
+        'The requirements vary by state, but most states accept a license.': 'en',
+        'Los requisitos varían según el estado donde usted vive.': 'es',
+        'Tôi có thể bỏ phiếu ở đâu?': 'vi',
+        'Saan ako maaaring bumoto?': 'tl',
+    }
+    for text, expected in cases.items():
+        detection = detector.detect(text)
+        assert detection.language == expected, (text, detection)
+        assert detection.confidence >= MIN_CONFIDENCE
+
+
+def test_short_civic_phrases():
+    detector = LanguageDetector()
+    cases = {
+        'Where is my polling place?': 'en',
+        'Can I vote by mail?': 'en',
+        '¿Cuándo es la fecha límite para registrarse?': 'es',
+        'Dove posso votare?': 'it',
+        'Waar kan ik stemmen?': 'nl',
+        'Gdzie mogę głosować?': 'pl',
+    }
+    for text, expected in cases.items():
+        detection = detector.detect(text)
+        assert detection.language == expected, (text, detection)
+        assert detection.confidence >= MIN_CONFIDENCE
+
+    # A single word is spelled the same in several languages
+    for text in ('Vote', 'Register'):
+        assert detector.detect(text).language is None
+
+
+def test_unprofiled_languages_stay_undetermined():
+    assert not _UNSUPPORTED_LATIN_SAMPLES.keys() & LANGUAGES_BY_CODE.keys()
+
+    detector = LanguageDetector()
+    for text in ("Els col·legis electorals obren a les nou del matí i tanquen a les vuit del vespre. "
+                 "Cal portar un document d'identitat vàlid.",
+                 "On puc votar si no sóc al meu municipi el dia de les eleccions?"):
+        detection = detector.detect(text)
+        assert detection.language is None and not detection.skips_provider, (text, detection)
+
+    # Catalan asked for in Spanish is translated from 'auto', not returned as "already Spanish"
+    catalan = "Cal portar un document d'identitat vàlid per votar al col·legi electoral."
+    with use_fake_provider() as factory:
+        result = simple_app.translate_text_efficient(catalan, 'spanish')
+    assert result['success'] and not result['provider_skipped']
+    assert result['detected_language'] is None and result['translated_text'] != catalan
+    assert [provider.source for provider in factory.instances] == ['auto']
+
+
+def test_undetermined_text_and_cache():
+    detector = LanguageDetector()
+    assert detector.detect('12345').language is None
+
+    first = detector.detect('Where is my polling place?')
+    second = detector.detect('Where is my polling place?')
+    assert not first.cached
+    assert second.cached
+    assert second.language == first.language
+
+
+def test_same_language_skips_provider(monkeypatch):
+    def fail_checkout(*args, **kwargs):
+        raise AssertionError('provider must not be called')
+
+    monkeypatch.setattr(translator_pool, 'checkout', fail_checkout)
+    text = 'Los requisitos varían según el estado, pero la mayoría acepta una licencia de conducir.'
+    result = simple_app.translate_text_efficient(text, 'spanish')
+
+    assert result['success']
+    assert result['provider_skipped']
+    assert result['translated_text'] == text
+    assert result['detected_language'] == 'es'
+    assert result['detection_time_ms'] is not None
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Tests for the unified language registry
+"""
+
+import json
+
+from backend.models.Translation import LanguageEnum
+from backend.services import languages
+
+
+def test_glossary_codes_match_language_enum():
+    assert languages.GLOSSARY_CODES == frozenset(lang.value for lang in LanguageEnum)
+
+
+def test_resolve_accepts_codes_names_native_names_and_aliases():
+    for spelling in ('zh', 'Chinese', '中文', 'chinese (simplified)', 'zh-CN', ' ZH '):
+        assert languages.resolve(spelling).code == 'zh'
+    assert languages.resolve('klingon') is None
+
+
+def test_provider_codes():
+    assert languages.to_provider_code('zh') == 'zh-CN'
+    assert languages.to_provider_code('Tagalog') == 'tl'
+    assert languages.to_provider_code('he') == 'iw'
+    assert languages.to_provider_code('auto') == 'auto'
+    assert languages.is_supported('welsh')
+
+
+def test_languages_response_body_is_preserialized():
+    payload = json.loads(languages.LANGUAGES_RESPONSE_BODY)
+    assert payload['total_count'] == len(languages.ALL_LANGUAGES)
+    assert payload['civic_languages']['spanish'] == {'flag': '🇪🇸', 'native': 'Español', 'code': 'es'}
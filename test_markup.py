@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for markup-aware (HTML / Markdown) translation
+"""
+
+from contextlib import contextmanager
+
+from backend.services.pipeline.engine import build_pipeline
+from backend.services.pipeline.markup import parse
+from backend.services.translator_pool import TranslatorPool
+from benchmarks.fake_provider import use_fake_provider
+
+HTML = ('<p>Register <a href="https://vote.example.gov/register" title="Official site">online</a> today.</p>'
+        '<img src="/ballot.png" alt="Sample ballot"><code>voter_id = 42</code>'
+        '<span class="notranslate">CivicLink</span>')
+
+MARKDOWN = """# Voting guide
+
+Bring your **photo ID** to the [polling place](https://vote.example.gov/find).
+
+```
+curl https://api.example.gov/polls
+```
+
+- Run `civiclink lookup` first
+"""
+
+
+class UpperTranslator:
+    """Translates by upper-casing; optionally collapses line breaks like some providers do"""
+
+    def __init__(self, join_lines=False):
+        self.join_lines = join_lines
+        self.calls = []
+
+    def translate(self, text):
+        self.calls.append(text)
+        return text.upper().replace('\n', ' ') if self.join_lines else text.upper()
+
+
+class SingleTranslatorPool:
+    def __init__(self, translator):
+        self._translator = translator
+
+    @contextmanager
+    def translator(self, source, target, provider='google'):
+        yield self._translator
+
+
+def test_html_keeps_tags_attributes_and_code():
+    translator = UpperTranslator()
+    pipeline = build_pipeline('html', cache=None, pool=SingleTranslatorPool(translator))
+    result = pipeline.run(HTML, 'es', 'en', format='html')
+    html = result['translated_text']
+    assert '<a href="https://vote.example.gov/register" title="OFFICIAL SITE">ONLINE</a>' in html
+    assert html.startswith('<p>REGISTER <a') and '</a> TODAY.</p>' in html
+    assert 'alt="SAMPLE BALLOT"' in html and 'src="/ballot.png"' in html
+    assert '<code>voter_id = 42</code>' in html and '>CivicLink<' in html
+    assert result['format'] == 'html'
+    assert result['characters_sent'] < result['total_characters']
+    # All five units go out in one newline-joined call
+    assert len(translator.calls) == 1
+
+
+def test_markdown_keeps_links_code_and_emphasis():
+    pipeline = build_pipeline('md', cache=None, pool=SingleTranslatorPool(UpperTranslator()))
+    translated = pipeline.run(MARKDOWN, 'es', 'en', format='markdown')['translated_text']
+    assert translated.splitlines()[0] == '# VOTING GUIDE'
+    assert 'BRING YOUR **PHOTO ID** TO THE [POLLING PLACE](https://vote.example.gov/find).' in translated
+    assert '```\ncurl https://api.example.gov/polls\n```' in translated
+    assert '- RUN `civiclink lookup` FIRST' in translated
+
+
+def test_batch_with_lost_line_breaks_is_retried_per_unit():
+    translator = UpperTranslator(join_lines=True)
+    pipeline = build_pipeline('retry', cache=None, pool=SingleTranslatorPool(translator))
+    translated = pipeline.run(HTML, 'es', 'en', format='html')['translated_text']
+    assert 'alt="SAMPLE BALLOT"' in translated and '</a> TODAY.</p>' in translated
+    units = parse(HTML, 'html').units
+    assert len(translator.calls) == 1 + len(units)
+
+
+def test_repeated_units_use_cache_and_invalid_format_errors():
+    pool = TranslatorPool()
+    pipeline = build_pipeline('md-cache', pool=pool)
+    with use_fake_provider(pool) as provider:
+        first = pipeline.run('Vote early.\n\nVote early.', 'es', 'en', format='markdown')
+        second = pipeline.run('*Vote early.*', 'es', 'en', format='markdown')
+    assert first['translated_text'] == '[es] Vote early.\n\n[es] Vote early.'
+    assert second['translated_text'] == '*[es] Vote early.*'
+    assert provider.calls == 1
+    assert 'error' in pipeline.run('<p>Hi</p>', 'es', 'en', format='pdf')
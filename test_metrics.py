@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the Prometheus metrics exporter
+"""
+
+from flask import Flask
+
+from backend.services.metrics import Registry, instrument_app
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.histogram('test_latency_seconds', 'Test latency', ('route',), buckets=(0.1, 1.0))
+    latency.labels('/a').observe(0.05)
+    latency.labels('/a').observe(0.5)
+    latency.labels('/a').observe(5)
+
+    text = registry.render()
+    assert '# TYPE test_latency_seconds histogram' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'test_latency_seconds_count{route="/a"} 3' in text
+
+
+def test_counter_labels_are_escaped():
+    registry = Registry()
+    errors = registry.counter('test_errors_total', 'Test errors', ('pair',))
+    errors.labels('en"es').inc(2)
+    assert 'test_errors_total{pair="en\\"es"} 2' in registry.render()
+
+
+def test_instrumented_app_exposes_route_latency():
+    app = Flask(__name__)
+
+    @app.route('/items/<int:item_id>')
+    def item(item_id):
+        return {'id': item_id}
+
+    instrument_app(app, 'test_app')
+    client = app.test_client()
+    client.get('/items/7')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    body = response.data.decode()
+    assert 'civiclink_http_request_duration_seconds_count{app="test_app",method="GET",route="/items/<int:item_id>",status="200"} 1' in body
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the rendered page cache
+"""
+
+import gzip
+
+import pytest
+from flask import Flask
+
+from src.pages import HelpAndLanguage, TranslationAssistant
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(TranslationAssistant.translation_assistant_bp)
+    app.register_blueprint(HelpAndLanguage.help_language_bp)
+    TranslationAssistant.page_cache.invalidate()
+    HelpAndLanguage.page_cache.invalidate()
+    yield app.test_client()
+    TranslationAssistant.page_cache.invalidate()
+    HelpAndLanguage.page_cache.invalidate()
+
+
+def test_repeat_hits_are_served_precompressed(client):
+    first = client.get('/translation-assistant?search=ballot', headers={'Accept-Encoding': 'gzip'})
+    second = client.get('/translation-assistant?search=ballot', headers={'Accept-Encoding': 'gzip'})
+    plain = client.get('/translation-assistant?search=ballot')
+    assert (first.headers['X-Page-Cache'], second.headers['X-Page-Cache']) == ('miss', 'hit')
+    assert second.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in second.headers['Vary']
+    assert gzip.decompress(second.data) == plain.data
+    assert 'Content-Encoding' not in plain.headers and b'Boleta Electoral' in plain.data
+    assert b'Lugar de Votaci' not in plain.data
+
+    # Different inputs get their own entry; a matching ETag gets a 304
+    assert client.get('/translation-assistant?search=poll').headers['X-Page-Cache'] == 'miss'
+    revalidated = client.get('/translation-assistant?search=ballot', headers={'If-None-Match': plain.headers['ETag']})
+    assert revalidated.status_code == 304 and not revalidated.data
+
+
+def test_accessibility_flags_are_part_of_the_key(client):
+    assert client.get('/help-language').headers['X-Page-Cache'] == 'miss'
+    assert client.get('/help-language').headers['X-Page-Cache'] == 'hit'
+    client.post('/api/update-accessibility', json={'large_text': True})
+    assert client.get('/help-language').headers['X-Page-Cache'] == 'miss'
+
+    HelpAndLanguage.page_cache.invalidate()
+    assert len(HelpAndLanguage.page_cache) == 0
+    assert client.get('/help-language').headers['X-Page-Cache'] == 'miss'
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the staged translation pipeline
+"""
+
+import asyncio
+
+from backend.services.metrics import render_metrics
+from backend.services.pipeline.engine import build_pipeline
+from backend.services.pipeline.stages import TranslationCache
+from backend.services.translator_pool import TranslatorPool
+from backend.services.async_translator import AsyncTranslatorPool
+from benchmarks.fake_provider import use_fake_provider
+
+LONG_TEXT = ' '.join(f'Sentence number {i} about voter registration.' for i in range(40))
+
+
+def test_cache_skips_provider_on_repeat():
+    pool = TranslatorPool()
+    pipeline = build_pipeline('test', cache=TranslationCache(), pool=pool)
+    with use_fake_provider(pool) as provider:
+        first = pipeline.run('Where is my polling place?', 'es', 'en')
+        second = pipeline.run('Where is my polling place?', 'es', 'en')
+    assert first['translated_text'] == second['translated_text'] == '[es] Where is my polling place?'
+    assert provider.calls == 1
+    assert (first['cached_chunks'], second['cached_chunks']) == (0, 1)
+    assert list(second['stage_timings_ms']) == ['normalize', 'segment', 'cache', 'provider', 'postprocess', 'score']
+
+
+def test_concurrent_provider_keeps_segment_order():
+    pool = TranslatorPool()
+    sequential = build_pipeline('seq', cache=None, pool=pool, max_chunk_size=200)
+    concurrent = build_pipeline('par', cache=None, pool=pool, max_chunk_size=200, provider_concurrency=4)
+    with use_fake_provider(pool, latency=0.01):
+        expected = sequential.run(LONG_TEXT, 'es', 'en')
+        result = concurrent.run(LONG_TEXT, 'es', 'en')
+    assert result['chunks_processed'] > 4
+    assert result['translated_text'] == expected['translated_text']
+
+
+def test_async_run_matches_sync_result():
+    pool, async_pool = TranslatorPool(), AsyncTranslatorPool()
+    pipeline = build_pipeline('both', cache=None, pool=pool, async_pool=async_pool, max_chunk_size=200)
+    with use_fake_provider(pool), use_fake_provider(async_pool):
+        expected = pipeline.run(LONG_TEXT, 'es', 'en')
+        result = asyncio.run(pipeline.run_async(LONG_TEXT, 'es', 'en'))
+    assert result['translated_text'] == expected['translated_text']
+
+
+def test_failed_segments_fall_back_and_are_not_cached():
+    pool, cache = TranslatorPool(), TranslationCache()
+    pipeline = build_pipeline('errors', cache=cache, pool=pool)
+    with use_fake_provider(pool, error_rate=1.0):
+        result = pipeline.run('Bring your ID.', 'es', 'en')
+        # Client-supplied language values don't become metric labels
+        pipeline.run('Bring your ID.', 'made-up-language', 'en')
+    assert result['translated_text'] == 'Bring your ID.'
+    metrics = render_metrics()
+    assert 'made-up-language' not in metrics and 'civiclink_characters_translated_total{target="other"}' in metrics
+    assert len(cache) == 0
+    assert pipeline.run('', 'es')['error'] == 'Empty text provided'
+
+
+def test_prepare_stops_before_stage():
+    job = build_pipeline('prep', cache=None).prepare(LONG_TEXT, 'es', 'en', until='provider')
+    assert job.segments and all(segment.translated is None for segment in job.segments)
+    assert 'provider' not in job.timings
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the polling place finder: CSV loading, exact KD-tree search and /api/polling-places
+"""
+
+import random
+
+import pytest
+from flask import Flask
+
+from backend.routes import polling_places as polling_routes
+from backend.services import sms
+from backend.services.polling_places import PollingPlaceDirectory, PollingPlaceIndex, read_csv
+from benchmarks.bench_polling_places import BOUNDS, brute_force, synthetic_places, write_csv
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / 'polling_places.csv'
+    write_csv(synthetic_places(3000, towns=50), path)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('x1,Bad Row,1 Main St,Nowhere,CA,90001,not-a-number,-120,,\n')
+        f.write('x2,Wrong Type,1 Main St,Nowhere,CA,90001,35,-120,mobile,\n')
+    return path
+
+
+def test_kd_tree_matches_brute_force(dataset):
+    places, skipped = read_csv(dataset)
+    assert len(places) == 3000 and skipped == 2
+    index = PollingPlaceIndex(places)
+    early = [place for place in places if place.kind in ('early', 'both')]
+
+    rng = random.Random(7)
+    (lat_lo, lat_hi), (lon_lo, lon_hi) = BOUNDS
+    for _ in range(50):
+        lat, lon = rng.uniform(lat_lo - 1, lat_hi + 1), rng.uniform(lon_lo - 1, lon_hi + 1)
+        nearest = index.nearest(lat, lon, k=7)
+        assert [place for place, _ in nearest] == brute_force(places, lat, lon, 7)
+        assert [d for _, d in nearest] == sorted(d for _, d in nearest)
+        assert [place for place, _ in index.nearest(lat, lon, k=3, kind='early')] == brute_force(early, lat, lon, 3)
+
+    place, distance = index.nearest(places[0].lat, places[0].lon, k=1)[0]
+    assert place == places[0] and distance < 1e-3
+    assert all(d <= 5 for _, d in index.nearest(35, -119, k=50, max_km=5))
+    assert index.near_zip('99999') is None and len(index.near_zip(places[0].zip, k=2)) == 2
+
+
+def test_endpoint_and_sms_replies(dataset, tmp_path, monkeypatch):
+    directory = PollingPlaceDirectory(str(dataset))
+    monkeypatch.setattr(polling_routes, 'polling_places', directory)
+    monkeypatch.setattr(sms, 'polling_places', directory)
+    app = Flask(__name__)
+    app.register_blueprint(polling_routes.polling_places_bp)
+    client = app.test_client()
+
+    zip_code = read_csv(dataset)[0][0].zip
+    by_zip = client.get(f'/api/polling-places?zip={zip_code}-1234&k=3')
+    assert by_zip.status_code == 200 and by_zip.json['count'] == 3
+    assert by_zip.json['origin']['zip'] == zip_code
+    distances = [place['distance_km'] for place in by_zip.json['places']]
+    assert distances == sorted(distances)
+
+    by_point = client.get('/api/polling-places?lat=34.05&lon=-118.25&type=early')
+    assert by_point.json['count'] == 5
+    assert {place['kind'] for place in by_point.json['places']} <= {'early', 'both'}
+
+    for query in ('', 'zip=123', 'lat=91&lon=0', 'lat=34', 'lat=nan&lon=1', 'zip=90001&k=0', 'zip=90001&type=x'):
+        assert client.get(f'/api/polling-places?{query}').status_code == 400, query
+    assert client.get('/api/polling-places?zip=10001').status_code == 404
+
+    # VOTE/EARLY name the nearest place when the dataset covers the ZIP
+    _, reply = sms.handle_message('+1', f'VOTE {zip_code}')
+    assert reply.startswith(f'CivicLink: polling place nearest ZIP {zip_code}: Polling Place ')
+    _, reply = sms.handle_message('+1', 'EARLY 10001')
+    assert reply.startswith('CivicLink: early voting locations near ZIP 10001')
+
+    # A broken replacement file keeps the previous index, and is not re-read on every request
+    index = directory.get()
+    dataset.write_text('not,a,polling,places,file\n', encoding='utf-8')
+    directory._checked_at = None
+    assert directory.get() is index and directory._checked_at is not None
+
+    missing = PollingPlaceDirectory(str(tmp_path / 'missing.csv'))
+    monkeypatch.setattr(polling_routes, 'polling_places', missing)
+    assert client.get('/api/polling-places?zip=90001').status_code == 503
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for opt-in request profiling and trace spans
+"""
+
+import json
+import time
+
+from flask import Flask
+
+from backend.services import profiling
+from backend.services.profiling import span, start_trace, instrument_profiling, token_authorizer
+
+
+def _make_app(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    app = Flask(__name__)
+
+    @app.route('/work')
+    def work():
+        with span('stage.one'):
+            sum(range(1000))
+        return {'ok': True}
+
+    instrument_profiling(app, token_authorizer('secret'))
+    return app.test_client()
+
+
+def test_span_is_noop_outside_trace():
+    with span('ignored'):
+        pass
+    with start_trace('script') as trace:
+        with span('stage', size=3):
+            pass
+    assert [s[0] for s in trace.spans] == ['stage']
+    assert profiling.current_trace() is None
+
+
+def test_profile_requires_admin_token(tmp_path, monkeypatch):
+    client = _make_app(tmp_path, monkeypatch)
+    response = client.get('/work', headers={profiling.PROFILE_HEADER: 'trace'})
+    assert response.status_code == 200
+    assert response.headers[profiling.PROFILE_STATUS_HEADER] == 'forbidden'
+    assert profiling.PROFILE_ID_HEADER not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sample_profile_writes_trace_and_collapsed_stacks(tmp_path, monkeypatch):
+    client = _make_app(tmp_path, monkeypatch)
+    auth = {'Authorization': 'Bearer secret'}
+    response = client.get('/work', headers={profiling.PROFILE_HEADER: 'sample', **auth})
+
+    assert 'stage.one;dur=' in response.headers['Server-Timing']
+    profile_id = response.headers[profiling.PROFILE_ID_HEADER]
+    trace = client.get(f'/api/profiles/{profile_id}/trace', headers=auth)
+    events = json.loads(trace.data)['traceEvents']
+    assert 'stage.one' in [event['name'] for event in events]
+    assert client.get(f'/api/profiles/{profile_id}/sample', headers=auth).status_code == 200
+    assert client.get(f'/api/profiles/{profile_id}/trace').status_code == 403
+    assert client.get('/api/profiles/../trace', headers=auth).status_code == 404
+
+
+def test_cprofile_and_tracemalloc_modes(tmp_path, monkeypatch):
+    client = _make_app(tmp_path, monkeypatch)
+    for mode, suffix in (('cprofile', '.prof'), ('tracemalloc', '.tracemalloc.txt')):
+        response = client.get('/work', headers={profiling.PROFILE_HEADER: mode, 'Authorization': 'Bearer secret'})
+        profile_id = response.headers[profiling.PROFILE_ID_HEADER]
+        assert (tmp_path / f'{profile_id}{suffix}').exists()
+
+
+def test_failed_finish_releases_profilers_and_old_profiles_are_pruned(tmp_path, monkeypatch):
+    import sys
+
+    client = _make_app(tmp_path, monkeypatch)
+    auth = {'Authorization': 'Bearer secret'}
+
+    def broken(self):
+        raise RuntimeError('header failed')
+    with monkeypatch.context() as patch:
+        patch.setattr(profiling.Trace, 'server_timing', broken)
+        assert client.get('/work', headers={profiling.PROFILE_HEADER: 'cprofile', **auth}).status_code == 500
+    # The teardown disabled cProfile and released the lock, so the next heavy profile runs
+    assert sys.getprofile() is None
+    response = client.get('/work', headers={profiling.PROFILE_HEADER: 'cprofile', **auth})
+    assert response.headers[profiling.PROFILE_STATUS_HEADER] == 'ok'
+
+    monkeypatch.setattr(profiling, 'PROFILE_KEEP', 2)
+    ids = []
+    for _ in range(3):
+        time.sleep(0.01)  # distinct mtimes
+        ids.append(client.get('/work', headers={profiling.PROFILE_HEADER: 'trace', **auth}).headers[profiling.PROFILE_ID_HEADER])
+    assert {path.name[:32] for path in tmp_path.iterdir()} == set(ids[1:])
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for related-term expansion (one IN query per page) and multi-hop traversal
+"""
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, insert
+
+from backend.models.Translation import Base, Translation
+from backend.services.database import database, engine_options
+from backend.services.related_terms import related_index
+
+
+def _app(tmp_path):
+    from backend.routes.translations import translations_bp
+
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=url, SQLALCHEMY_ENGINE_OPTIONS=engine_options(url))
+    db = SQLAlchemy(app)
+    database.init_app(app, db)
+    app.register_blueprint(translations_bp)
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        # Term i links to the next two terms (wrapping), plus a dangling ID
+        with db.engine.begin() as conn:
+            conn.execute(insert(Translation), [{
+                'english': f'term {i}', 'translated': f'término {i}', 'language': 'es', 'explanation': 'x',
+                'category': 'general', 'usage_count': 200 - i,
+                'related_terms': [i % 150 + 1, (i + 1) % 150 + 1, 999]} for i in range(1, 151)])
+    related_index.invalidate()
+    return app
+
+
+def test_expanded_page_uses_constant_queries(tmp_path):
+    app = _app(tmp_path)
+    statements = []
+    event.listen(database.read_engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    client = app.test_client()
+    response = client.get('/api/translations/?limit=100&expand=related_terms')
+    assert response.status_code == 200
+    first = response.json['translations'][0]
+    assert first['english'] == 'term 1'
+    assert [(term['id'], term['english']) for term in first['related_terms']] == [(2, 'term 2'), (3, 'term 3')]
+    # count + page + one IN for every related term on the page
+    assert len([s for s in statements if s.lstrip().upper().startswith('SELECT')]) == 3
+
+    assert client.get('/api/translations/?limit=5').json['translations'][0]['related_terms'] == [2, 3, 999]
+    assert client.get('/api/translations/?expand=feedback').status_code == 400
+    detail = client.get('/api/translations/150?expand=related_terms').json['translation']
+    assert [term['id'] for term in detail['related_terms']] == [1, 2]
+    for engine in database.engines:
+        engine.dispose()
+
+
+def test_related_traversal_by_hops(tmp_path):
+    app = _app(tmp_path)
+    client = app.test_client()
+    response = client.get('/api/translations/10/related?depth=2')
+    assert response.status_code == 200
+    assert [(term['id'], term['hops']) for term in response.json['related']] == [
+        (11, 1), (12, 1), (13, 2), (14, 2)]
+    # Served from the cached adjacency: usage counts are untouched
+    assert client.get('/api/translations/?limit=100').json['translations'][9]['usage_count'] == 190
+
+    assert client.get('/api/translations/10/related?depth=9').status_code == 400
+    assert client.get('/api/translations/999/related').status_code == 404
+    for engine in database.engines:
+        engine.dispose()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the SMS shortcode webhook: parsing, per-language reply tables and batched delivery
+"""
+
+import threading
+
+import pytest
+from flask import Flask
+
+from backend.routes import sms as sms_routes
+from backend.services.sms import OutboundBatcher, ReplyTable, http_sender, parse_message
+from benchmarks.bench_sms import GatewayStandIn
+
+
+class _Translations:
+    version = 'v1'
+
+    def get(self, text, language, source_language='en'):
+        if language == 'es':
+            return f'[es] {text}'
+        if language == 'vi':
+            return text.replace('{zip}', '{código}')  # a mangled placeholder falls back to English
+        return text
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(sms_routes, 'outbound', lambda: None)
+    app = Flask(__name__)
+    app.register_blueprint(sms_routes.sms_bp)
+    return app.test_client()
+
+
+def test_parsing_replies_and_inline_webhook(client, monkeypatch):
+    assert parse_message('+1', '  vote 94110-1234 ES ')[1:] == ('vote', 'vote', '94110', 'es')
+    assert parse_message('+1', 'VOTE')[1:] == ('vote', 'vote_usage', None, 'en')
+    assert parse_message('+1', 'early ko 10001', 'xx')[1:] == ('early', 'early', '10001', 'ko')
+    assert parse_message('+1', 'when do polls close?')[1:3] == ('unknown', 'help')
+    assert parse_message('+1', '')[1:3] == ('unknown', 'help')
+
+    table = ReplyTable(_Translations(), url='https://civic.test')
+    assert table.reply(parse_message('+1', 'VOTE 12345')) == \
+        'CivicLink: find your polling place for ZIP 12345 at https://civic.test/vote?zip=12345'
+    assert table.reply(parse_message('+1', 'VOTE 12345 ES')).startswith('[es] CivicLink: find your polling place')
+    assert table.reply(parse_message('+1', 'VOTE 12345 VI')) == table.reply(parse_message('+1', 'VOTE 12345'))
+    assert table.reply(parse_message('+1', 'ID')) == 'CivicLink: what ID to bring when you vote: https://civic.test/voter-id'
+
+    # Twilio-style form posts, single JSON messages and gateway batches get inline replies
+    form = client.post('/api/sms/inbound', data={'From': '+15550001', 'Body': 'deadline'})
+    assert form.json['to'] == '+15550001' and form.json['command'] == 'deadline'
+    batch = client.post('/api/sms/inbound', json={'messages': [
+        {'from': '+1', 'body': 'REGISTER'}, {'from': '+2', 'body': 'vote 12345', 'language': 'zh'}]})
+    assert [reply['command'] for reply in batch.json['replies']] == ['register', 'vote']
+    assert client.post('/api/sms/inbound', json={'messages': []}).status_code == 400
+    assert client.post('/api/sms/inbound', data='not json', content_type='text/plain').status_code == 400
+
+    monkeypatch.setattr(sms_routes, 'WEBHOOK_TOKEN', 'secret')
+    assert client.post('/api/sms/inbound', json={'from': '+1', 'body': 'ID'}).status_code == 401
+    assert client.post('/api/sms/inbound', json={'from': '+1', 'body': 'ID'},
+                       headers={'X-SMS-Token': 'secret'}).status_code == 200
+
+
+def test_replies_are_batched_to_the_gateway(client, monkeypatch):
+    with GatewayStandIn() as gateway:
+        batcher = OutboundBatcher(http_sender(gateway.url), max_batch=100, max_delay=0.05)
+        monkeypatch.setattr(sms_routes, 'outbound', lambda: batcher)
+        for start in range(0, 250, 50):
+            response = client.post('/api/sms/inbound', json={'messages': [
+                {'from': f'+1555{i:07d}', 'body': 'EARLY 60614'} for i in range(start, start + 50)]})
+            assert response.status_code == 202 and response.json == {'queued': 50}
+        batcher.flush()
+        assert gateway.messages == 250 and 3 <= gateway.calls <= 6
+        batcher.close()
+
+    # A full queue is pushed back to the gateway with 503 + Retry-After
+    release = threading.Event()
+    blocked = OutboundBatcher(lambda batch: release.wait(), max_batch=1, max_delay=0, max_queue=1)
+    monkeypatch.setattr(sms_routes, 'outbound', lambda: blocked)
+    statuses = [client.post('/api/sms/inbound', json={'from': '+1', 'body': 'ID'}).status_code for _ in range(4)]
+    release.set()
+    blocked.close()
+    assert statuses[0] == 202 and statuses[-1] == 503
+
+    # A gateway batch that doesn't fit is not queued at all, so its retry can't send duplicates
+    sent = []
+    small = OutboundBatcher(sent.extend, max_queue=2)
+    monkeypatch.setattr(sms_routes, 'outbound', lambda: small)
+    batch = {'messages': [{'from': f'+1555000000{i}', 'body': 'ID'} for i in range(3)]}
+    response = client.post('/api/sms/inbound', json=batch)
+    small.flush()
+    small.close()
+    assert (response.status_code, response.json['queued'], sent) == (503, 0, [])
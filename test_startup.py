@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for cold start: import-time budget, explicit schema creation, preload before fork
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# Cumulative `import app` time from `python -X importtime`; ~0.6 s on a laptop, mostly Flask and SQLAlchemy
+IMPORT_BUDGET_US = 1_500_000
+LAZY_MODULES = ('deep_translator', 'requests', 'bs4')
+
+
+def _run(tmp_path, *args):
+    env = {**os.environ, 'DATABASE_URL': f"sqlite:///{tmp_path / 'civiclink.db'}", 'FLASK_APP': 'app'}
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def test_import_is_lazy_and_within_budget(tmp_path):
+    result = _run(tmp_path, '-X', 'importtime', '-c', 'import app')
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('package'):
+            _, cumulative, name = line[len('import time:'):].split('|')
+            timings[name.strip()] = int(cumulative)
+    assert not [module for module in LAZY_MODULES if module in timings]
+    assert timings['app'] < IMPORT_BUDGET_US, f"import app took {timings['app'] / 1000:.0f} ms"
+    assert not (tmp_path / 'civiclink.db').exists()
+
+
+def test_init_db_then_preload_freezes_heap(tmp_path):
+    assert 'Schema ready' in _run(tmp_path, '-m', 'flask', 'init-db').stdout
+
+    script = ("import gc, json, sys; from app import app; from backend.services.preload import preload;"
+              "timings = preload(app); modules = [m for m in ('deep_translator', 'bs4') if m in sys.modules];"
+              "print(json.dumps({'timings': timings, 'frozen': gc.get_freeze_count(), 'gc': gc.isenabled(),"
+              " 'modules': modules}))")
+    report = json.loads(_run(tmp_path, '-c', script).stdout.splitlines()[-1])
+    assert set(report['timings']) == {'providers', 'templates', 'glossary snapshot', 'compiled glossary',
+                                      'related index', 'polling places'}
+    assert report['frozen'] > 10_000 and report['gc'] is False
+    assert report['modules'] == ['deep_translator', 'bs4']
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the precompiled static content artifact
+"""
+
+import json
+
+from flask import Flask
+
+from backend.services.static_translations import StaticTranslations, compile_static_translations
+from src.pages import HelpAndLanguage, TranslationAssistant
+
+SOURCES = [('Find your polling place', 'en'), ('¿Dónde puedo votar?', 'es')]
+
+
+class CountingTranslator:
+    def __init__(self, fail_language=None):
+        self.calls = []
+        self.fail_language = fail_language
+
+    def __call__(self, text, target, source):
+        self.calls.append((text, target))
+        return None if target == self.fail_language else f'[{target}] {text}'
+
+
+def test_compile_is_incremental(tmp_path):
+    path = str(tmp_path / 'static.json')
+    translator = CountingTranslator()
+    first = compile_static_translations(SOURCES, path, ['en', 'es', 'ko'], translator)
+    assert (first.translated, first.reused) == (4, 0)
+
+    # Unchanged content: no provider calls, same version
+    again = compile_static_translations(SOURCES, path, ['en', 'es', 'ko'], translator)
+    assert (again.translated, again.reused, again.version) == (0, 4, first.version)
+    assert len(translator.calls) == 4
+
+    # Edited string: only its translations are recompiled and the stale entry is dropped
+    edited = [('Find your polling location', 'en'), SOURCES[1]]
+    report = compile_static_translations(edited, path, ['en', 'es', 'ko'], translator)
+    assert (report.translated, report.reused, report.removed) == (2, 2, 1)
+    assert report.version != first.version
+
+    artifact = StaticTranslations.load(path)
+    assert artifact.get('Find your polling location', 'ko') == '[ko] Find your polling location'
+    assert artifact.get('¿Dónde puedo votar?', 'en', 'es') == '[en] ¿Dónde puedo votar?'
+    assert artifact.get('Find your polling place', 'ko') == 'Find your polling place'
+    assert artifact.stale(edited, ['en', 'es', 'ko']) == []
+
+
+def test_failed_translations_are_retried_next_run(tmp_path):
+    path = str(tmp_path / 'static.json')
+    report = compile_static_translations(SOURCES[:1], path, ['es', 'ko'], CountingTranslator(fail_language='ko'))
+    assert (report.translated, report.failed) == (1, 1)
+    assert StaticTranslations.load(path).stale(SOURCES[:1], ['es', 'ko']) == [SOURCES[0]]
+
+    report = compile_static_translations(SOURCES[:1], path, ['es', 'ko'], CountingTranslator())
+    assert (report.translated, report.reused) == (1, 1)
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['schema'] == 1
+
+
+def test_pages_serve_compiled_languages(tmp_path, monkeypatch):
+    path = str(tmp_path / 'static.json')
+    sources = list(HelpAndLanguage.static_texts()) + list(TranslationAssistant.static_texts())
+    compile_static_translations(sources, path, ['ko', 'es'], CountingTranslator())
+    monkeypatch.setattr(HelpAndLanguage, 'static_translations', StaticTranslations.load(path))
+    monkeypatch.setattr(TranslationAssistant, 'static_translations', StaticTranslations.load(path))
+    HelpAndLanguage.localized_content.cache_clear()
+    TranslationAssistant.localized_terms.cache_clear()
+    try:
+        faq_data, sms_shortcodes = HelpAndLanguage.localized_content('ko')
+        assert faq_data[0]['question'] == '[ko] How do I find my polling place?'
+        assert faq_data[3]['question'] == '[ko] ¿Dónde puedo votar?'
+        assert sms_shortcodes[0] == {'code': 'VOTE', 'description': '[ko] Find your polling place',
+                                     'example': 'Text VOTE 12345'}
+
+        korean = TranslationAssistant.localized_terms('Korean')
+        assert korean[0]['translated'] == '[ko] Voter Registration' and korean[0]['language'] == 'Korean'
+        # Curated translations win over compiled ones
+        assert TranslationAssistant.localized_terms('Spanish')[0]['translated'] == 'Registro de Votantes'
+        # Languages missing from the artifact stay English and say so
+        french = TranslationAssistant.localized_terms('French')[0]
+        assert french['language'] == 'English' and french['untranslated']
+        assert HelpAndLanguage.localized_content('fr')[0][0]['language'] == 'English'
+    finally:
+        HelpAndLanguage.localized_content.cache_clear()
+        TranslationAssistant.localized_terms.cache_clear()
+
+
+def test_search_filters_by_language():
+    app = Flask(__name__)
+    app.register_blueprint(TranslationAssistant.translation_assistant_bp)
+    client = app.test_client()
+    assert client.get('/api/search-translations?language=spanish').json['total'] == 5
+    assert client.get('/api/search-translations?language=Korean').json['total'] == 0
+    assert client.get('/api/search-translations?q=ballot').json['total'] == 3
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the contact-support outbox: batched delivery, retries, leases and the non-blocking handler
+"""
+
+import json
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from backend.services import support_outbox as outbox_module
+from backend.services.support_outbox import SupportOutbox, file_sink, smtp_sink
+from src.pages import HelpAndLanguage
+
+REQUEST = {'name': 'Ana', 'email': 'ana@example.org', 'subject': 'Ballot', 'message': 'Where is my ballot?'}
+
+
+@pytest.fixture
+def outbox_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'outbox.db'}"
+
+
+def test_batches_retries_and_leases(outbox_url, monkeypatch):
+    monkeypatch.setattr(outbox_module, 'RETRY_BASE_SECONDS', 0)  # failed rows are due again at once
+    monkeypatch.setattr(outbox_module, 'MAX_ATTEMPTS', 2)
+    delivered = []
+    outbox = SupportOutbox(outbox_url, delivered.extend, batch_size=3)
+    other_process = SupportOutbox(outbox_url, delivered.extend)
+    references = [outbox.submit({**REQUEST, 'subject': f'Ballot {i}'}) for i in range(5)]
+
+    assert outbox.dispatch_once() == 3 and outbox.dispatch_once() == 2 and outbox.dispatch_once() == 0
+    assert [request['id'] for request in delivered] == references
+    assert delivered[4]['subject'] == 'Ballot 4' and outbox.stats() == {'pending': 0, 'parked': 0}
+
+    # A batch in flight is leased: another process sharing the outbox does not claim it
+    def slow_sink(batch):
+        assert other_process.dispatch_once() == 0
+        raise ConnectionError('SMTP unavailable')
+    outbox.sink = slow_sink
+    outbox.submit(REQUEST)
+    assert outbox.dispatch_once() == 1 and outbox.stats() == {'pending': 1, 'parked': 0}
+    assert outbox.last_error == 'SMTP unavailable'
+    assert outbox.dispatch_once() == 1 and outbox.stats() == {'pending': 0, 'parked': 1}
+
+    outbox.sink = delivered.extend
+    assert outbox.dispatch_once() == 0 and outbox.requeue_parked() == 1
+    assert outbox.dispatch_once() == 1 and len(delivered) == 6 and outbox.last_error is None
+
+
+def test_handler_does_not_wait_for_the_sink(outbox_url, tmp_path, monkeypatch):
+    sink_path = tmp_path / 'support_requests.jsonl'
+    release = threading.Event()
+    write = file_sink(str(sink_path))
+    outbox = SupportOutbox(outbox_url, lambda batch: (release.wait(), write(batch))[-1], poll_seconds=0.01)
+    outbox.start()
+    monkeypatch.setattr(HelpAndLanguage, 'support_outbox', outbox)
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.register_blueprint(HelpAndLanguage.help_language_bp)
+    client = app.test_client()
+
+    start = time.perf_counter()
+    responses = [client.post('/api/contact-support', json=REQUEST) for _ in range(20)]
+    assert time.perf_counter() - start < 1.0  # the sink is blocked the whole time
+    assert all(response.status_code == 200 for response in responses)
+    assert [response.json['reference'] for response in responses] == list(range(1, 21))
+    assert client.post('/api/contact-support', json={**REQUEST, 'email': ''}).status_code == 400
+    assert client.post('/api/contact-support', json={**REQUEST, 'message': 'x' * 10_001}).status_code == 400
+    assert client.post('/api/contact-support', json={**REQUEST, 'subject': 'Hi\r\nBcc: x@example.org'}).status_code == 400
+    assert client.post('/api/contact-support', json={**REQUEST, 'email': ['a@example.org']}).status_code == 400
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while outbox.stats()['pending'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    outbox.close()
+    lines = [json.loads(line) for line in sink_path.read_text(encoding='utf-8').splitlines()]
+    assert [line['id'] for line in lines] == list(range(1, 21)) and lines[0]['language'] == 'en'
+
+
+def test_smtp_rows_fail_on_their_own(outbox_url, monkeypatch):
+    sent = []
+
+    class FakeSMTP:
+        def __init__(self, host, port, timeout=None):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def send_message(self, message):
+            sent.append(message['Subject'])
+
+    monkeypatch.setattr('smtplib.SMTP', FakeSMTP)
+    monkeypatch.setattr(outbox_module, 'RETRY_BASE_SECONDS', 0)
+    monkeypatch.setattr(outbox_module, 'MAX_ATTEMPTS', 2)
+    outbox = SupportOutbox(outbox_url, smtp_sink('localhost', 25, 'civiclink@localhost', 'support@localhost'))
+    # Queued before validation existed, or by another client: the header can't be set
+    outbox.submit(REQUEST)
+    outbox.submit({**REQUEST, 'subject': 'Bad\r\nBcc: x@example.org'})
+    outbox.submit(REQUEST)
+
+    assert outbox.dispatch_once() == 3 and sent == ['[Support #1] Ballot', '[Support #3] Ballot']
+    assert outbox.stats() == {'pending': 1, 'parked': 0} and outbox.last_error is None
+    assert outbox.dispatch_once() == 1 and len(sent) == 2
+    assert outbox.stats() == {'pending': 0, 'parked': 1}
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the translation_tags index: sync on create/import, AND/OR filters and /tags counts
+"""
+
+import io
+import json
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert, select
+
+from backend.middleware import auth
+from backend.models.Translation import Base, Translation, TranslationTag
+from backend.models.User import User
+from backend.services.database import database, engine_options
+from backend.services.glossary_import import import_stream
+from backend.services.tags import backfill_tags, tag_filter
+from benchmarks.synthetic_glossary import make_token
+
+ROWS = [
+    {'english': 'Ballot', 'translated': 'Boleta', 'language': 'es', 'explanation': 'x', 'category': 'voting',
+     'tags': ['mail', 'Paper']},
+    {'english': 'Drop box', 'translated': 'Buzón', 'language': 'es', 'explanation': 'x', 'category': 'locations',
+     'tags': ['mail']},
+    {'english': 'Ballot', 'translated': '选票', 'language': 'zh', 'explanation': 'x', 'category': 'voting',
+     'tags': ['paper']},
+]
+
+
+def _ndjson(rows):
+    return ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows).encode('utf-8')
+
+
+def test_tag_filters_and_counts(tmp_path):
+    from backend.routes.translations import translations_bp
+
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI=url, SQLALCHEMY_ENGINE_OPTIONS=engine_options(url))
+    db = SQLAlchemy(app)
+    database.init_app(app, db)
+    app.register_blueprint(translations_bp)
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        import_stream(db.engine, io.BytesIO(_ndjson(ROWS)), 'ndjson')
+        with db.engine.begin() as conn:
+            organizer_id = conn.execute(insert(User).values(
+                email='org@example.org', first_name='O', last_name='R', role='organizer')).inserted_primary_key[0]
+
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {make_token(organizer_id, auth.JWT_SECRET)}'}
+    response = client.post('/api/translations/', headers=headers, json={
+        'english': 'Drop box', 'translated': 'Hộp thả', 'language': 'vi', 'explanation': 'x',
+        'category': 'locations', 'tags': ['mail', 'local']})
+    assert response.status_code == 201
+
+    def english(url):
+        return sorted((t['english'], t['language']) for t in client.get(url).json['translations'])
+
+    assert english('/api/translations/?tag=mail,paper') == [('Ballot', 'es')]
+    assert english('/api/translations/?tag=mail&tag=paper&tag_match=any&language=es') == [
+        ('Ballot', 'es'), ('Drop box', 'es')]
+    assert english('/api/translations/?tag=LOCAL') == [('Drop box', 'vi')]
+    assert client.get('/api/translations/?tag=mail&tag_match=some').status_code == 400
+
+    tags = client.get('/api/translations/tags').json['tags']
+    assert tags[0] == {'tag': 'mail', 'total_count': 3, 'languages': [
+        {'language': 'es', 'count': 2}, {'language': 'vi', 'count': 1}]}
+    assert [t['tag'] for t in client.get('/api/translations/tags?language=zh').json['tags']] == ['paper']
+
+    # Re-importing replaces a row's tags instead of adding to them
+    import_stream(database.write_engine, io.BytesIO(_ndjson([{**ROWS[0], 'tags': ['id']}])), 'ndjson')
+    assert english('/api/translations/?tag=paper') == [('Ballot', 'zh')]
+    for engine in database.engines:
+        engine.dispose()
+
+
+def test_backfill_and_index_plan(tmp_path):
+    from backend.services.database import create_configured_engine
+
+    engine = create_configured_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Translation), ROWS)
+    assert backfill_tags(engine) == 3
+    assert backfill_tags(engine) == 0  # already populated
+
+    query = select(Translation.id).where(tag_filter(['mail', 'paper'], 'all'))
+    with engine.connect() as conn:
+        assert len(conn.execute(query).all()) == 1
+        sql = str(query.compile(engine, compile_kwargs={'literal_binds': True}))
+        plan = ' '.join(row[-1] for row in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}'))
+        assert len(conn.execute(select(TranslationTag.tag)).all()) == 4
+    assert 'USING COVERING INDEX' in plan and 'SCAN translation_tags' not in plan
+    engine.dispose()
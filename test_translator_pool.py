@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled translation provider clients
+"""
+
+import time
+
+from backend.services.translator_pool import TranslatorPool
+
+
+class FakeTranslator:
+    """Stand-in provider client that records the session it was given"""
+
+    def __init__(self, source='auto', target='en', session=None):
+        self.source = source
+        self.target = target
+        self.session = session
+
+    def translate(self, text):
+        return f'[{self.target}] {text}'
+
+
+def make_pool(**kwargs):
+    return TranslatorPool(providers={'google': FakeTranslator}, **kwargs)
+
+
+def test_translators_are_reused_per_key():
+    pool = make_pool()
+    with pool.translator('en', 'es') as first:
+        pass
+    with pool.translator('en', 'es') as second:
+        assert second is first
+    with pool.translator('en', 'ar') as other:
+        assert other is not first
+        # All language pairs share the provider's keep-alive session
+        assert other.session is first.session
+
+    stats = pool.stats()
+    assert stats['created'] == 2
+    assert stats['reused'] == 1
+
+
+def test_concurrent_checkouts_get_distinct_instances():
+    pool = make_pool()
+    first = pool.checkout('en', 'es')
+    second = pool.checkout('en', 'es')
+    assert first is not second
+    pool.checkin(first, 'en', 'es')
+    pool.checkin(second, 'en', 'es')
+    assert pool.stats()['idle'] == 2
+
+
+def test_idle_translators_are_evicted():
+    pool = make_pool(idle_timeout=0.01)
+    with pool.translator('en', 'es'):
+        pass
+    time.sleep(0.02)
+    pool.evict_idle()
+
+    stats = pool.stats()
+    assert stats['idle'] == 0
+    assert stats['evicted'] == 1
+
+
+def test_unknown_provider_is_rejected():
+    pool = make_pool()
+    try:
+        pool.checkout('en', 'es', provider='deepl')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected ValueError for unknown provider')
+
+
+class RecordingSession:
+    """requests.Session stand-in answering with a fixed translation page"""
+
+    def __init__(self, translated):
+        self.translated = translated
+        self.calls = []
+
+    def get(self, url, params=None, proxies=None):
+        self.calls.append((url, dict(params)))
+        return type('Response', (), {'status_code': 200, 'text': f'<div class="t0">{self.translated}</div>',
+                                     'close': lambda self: None})()
+
+
+def test_pooled_google_translator_runs_upstream_flow_over_the_session():
+    from backend.services.translator_pool import PooledGoogleTranslator
+
+    session = RecordingSession('Hola mundo')
+    translator = PooledGoogleTranslator('en', 'es', session=session, base_url='https://standin.test/m')
+    assert translator.translate('Hello world') == 'Hola mundo'
+    assert session.calls == [('https://standin.test/m', {'tl': 'es', 'sl': 'en', 'q': 'Hello world'})]
+
+    # Upstream's "provider echoed the input" branch is kept: it retries once without the UI language
+    session.translated = 'Vote'
+    translator._url_params['hl'] = 'en'
+    assert translator.translate('Vote') == 'Vote'
+    assert ['hl' in params for _, params in session.calls[1:]] == [True, False]
+
+
+class RecordingClient:
+    """AsyncHTTPClient stand-in answering with a fixed translation page"""
+
+    def __init__(self, translated):
+        self.translated = translated
+        self.calls = []
+
+    async def get(self, url, params=None):
+        from backend.services.async_http import HTTPResponse
+        self.calls.append((url, dict(params)))
+        return HTTPResponse(200, {}, f'<div class="t0">{self.translated}</div>'.encode('utf-8'))
+
+
+def test_async_google_translator_runs_upstream_flow_and_checks_out_sync_clients():
+    import asyncio
+    from backend.services.async_translator import AsyncGoogleTranslator, AsyncTranslatorPool
+
+    client = RecordingClient('Hola mundo')
+    translator = AsyncGoogleTranslator('en', 'es', client=client, base_url='https://standin.test/m')
+    assert asyncio.run(translator.translate_async('Hello world')) == 'Hola mundo'
+    assert client.calls == [('https://standin.test/m', {'tl': 'es', 'sl': 'en', 'q': 'Hello world'})]
+
+    # The echo retry without the UI language happens per call; the shared instance keeps its params
+    client.translated = 'Vote'
+    translator._url_params['hl'] = 'en'
+    assert asyncio.run(translator.translate_async('Vote')) == 'Vote'
+    assert ['hl' in params for _, params in client.calls[1:]] == [True, False]
+    assert translator._url_params == {'hl': 'en'}
+
+    # Providers without an async client run on a sync instance checked out for each call
+    sync_pool = make_pool()
+    async_pool = AsyncTranslatorPool(providers={'google': AsyncGoogleTranslator}, sync_pool=sync_pool)
+    async_pool.register_provider('google', None)
+
+    async def translate_concurrently():
+        return await asyncio.gather(*(async_pool.translate('Hello', 'en', 'es') for _ in range(4)))
+
+    assert asyncio.run(translate_concurrently()) == ['[es] Hello'] * 4
+    assert sync_pool.stats()['idle'] >= 1